@@ -0,0 +1,5 @@
+import time
+
+# when the backend was first imported, the app reports its startup time
+#   relative to it
+STARTED_AT = time.perf_counter()
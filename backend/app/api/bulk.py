@@ -0,0 +1,46 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.utils.bulk_utils import bulk_ingest, parse_bulk_body
+from backend.database import get_db
+
+bulk_router = APIRouter(prefix="/bulk", tags=["Bulk Ingestion"])
+
+
+@bulk_router.post("/")
+async def ingest_bulk(
+    request: Request, db: Annotated[AsyncSession, Depends(get_db)]
+):
+    """
+    Ingest many records of different types at once.
+
+    This endpoint upserts sites, VOCs, VOC subclasses, contacts,
+    publications, datasets and their links within a single transaction,
+    using batched multi-row inserts. The body is either a JSON array or
+    NDJSON (``Content-Type: application/x-ndjson``) of records shaped
+    ``{"type": "site", "data": {...}}``. Invalid records are skipped and
+    reported, all other records are written.
+
+    :param request: The request carrying the records.
+    :type request: Request
+    :param db: The database session.
+    :type db: AsyncSession
+    :return: The number of written records per type and the errors
+        of all rejected records.
+    :rtype: dict
+    :raise HTTPException: body is neither a JSON array nor NDJSON
+    """
+
+    try:
+        records = parse_bulk_body(
+            await request.body(), request.headers.get("content-type", "")
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+    # the ingestion runs on the synchronous session API,
+    #   its IO is still awaited on the event loop
+    report = await db.run_sync(bulk_ingest, records)
+    return report.to_dict()
@@ -1,10 +1,13 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from backend.app.models.associations import DatasetContactLink
 from backend.app.models.contact import Contact
-from backend.app.models.dataset import Dataset
+from backend.app.utils.pagination_utils import PaginationParams, paginate
+from backend.app.utils.serialization_utils import FastJSONResponse
 from backend.database import get_db
 
 contact_router = APIRouter(prefix="/contacts", tags=["Contacts for Datasets"])
@@ -12,7 +15,7 @@ contact_router = APIRouter(prefix="/contacts", tags=["Contacts for Datasets"])
 
 @contact_router.post("/")
 async def create_contact(
-    contact: Contact, db: Annotated[Session, Depends(get_db)]
+    contact: Contact, db: Annotated[AsyncSession, Depends(get_db)]
 ):
     """
     Create a new contact.
@@ -22,36 +25,42 @@ async def create_contact(
     :param contact: The contact information to be added.
     :type contact: Contact
     :param db: The database session.
-    :type db: Session
+    :type db: AsyncSession
     :return: The created contact.
     :rtype: Contact
     """
 
     db.add(contact)
-    db.commit()
-    db.refresh(contact)
+    await db.commit()
+    await db.refresh(contact)
     return contact
 
 
 @contact_router.get("/")
-async def get_all_contacts(db: Session = Depends(get_db)):
+async def get_all_contacts(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    pagination: Annotated[PaginationParams, Depends()],
+):
     """
     Retrieve all contacts.
 
-    This endpoint retrieves all contacts stored in the database.
+    This endpoint retrieves all contacts stored in the database,
+    paginated by cursor.
 
     :param db: The database session.
-    :type db: Session
-    :return: A list of all contacts.
-    :rtype: list[Contact]
+    :type db: AsyncSession
+    :param pagination: The cursor, page size and fields to return.
+    :type pagination: PaginationParams
+    :return: A page of contacts and the cursor of the next page.
+    :rtype: dict
     """
 
-    return db.exec(select(Contact)).all()
+    return FastJSONResponse(await paginate(db, Contact, pagination))
 
 
-@contact_router.get("/by-dataset/{dataset_id}")
+@contact_router.get("/by-dataset/{dataset_id}", response_model=list[Contact])
 async def get_contacts_by_dataset_id(
-    dataset_id: int, db: Session = Depends(get_db)
+    dataset_id: int, db: Annotated[AsyncSession, Depends(get_db)]
 ):
     """
     Retrieve contacts by dataset ID.
@@ -61,11 +70,18 @@ async def get_contacts_by_dataset_id(
     :param dataset_id: The ID of the dataset.
     :type dataset_id: int
     :param db: The database session.
-    :type db: Session
+    :type db: AsyncSession
     :return: A list of contacts associated with the specified dataset.
     :rtype: list[Contact]
     """
 
-    statement = select(Dataset).where(Dataset.id == dataset_id)
-    dataset = db.exec(statement).one()
-    return dataset.contacts
+    # read the contacts through the link table, without loading the dataset
+    statement = (
+        select(Contact)
+        .join(
+            DatasetContactLink, col(DatasetContactLink.contact_id) == Contact.id
+        )
+        .where(DatasetContactLink.dataset_id == dataset_id)
+        .order_by(Contact.id)
+    )
+    return FastJSONResponse((await db.exec(statement)).all())
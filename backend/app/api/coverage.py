@@ -0,0 +1,166 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import Select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.models.coverage_read import (
+    CountryCoverage,
+    GridCellCoverage,
+    VocSubclassCoverage,
+    YearCoverage,
+)
+from backend.app.utils.cache_utils import mark_tables_written
+from backend.app.utils.coverage_utils import (
+    COVERAGE_VIEWS,
+    DEFAULT_GRID_CELL_SIZE,
+    get_coverage_by_country_query,
+    get_coverage_by_grid_query,
+    get_coverage_by_voc_subclass_query,
+    get_coverage_by_year_query,
+    get_coverage_view,
+    refresh_coverage_views,
+)
+from backend.app.utils.serialization_utils import FastJSONResponse
+from backend.database import get_db
+from backend.settings import get_settings
+
+coverage_router = APIRouter(prefix="/coverage", tags=["Coverage Analytics"])
+
+
+async def fetch_coverage(
+    db: AsyncSession, view_name: str | None, live_query: Select
+) -> FastJSONResponse:
+    """
+    Run a coverage query, or read its materialized view if enabled.
+
+    :param db: The database session.
+    :type db: AsyncSession
+    :param view_name: The name of the materialized view of the query,
+        None if the query has no view.
+    :type view_name: str | None
+    :param live_query: The query to run if views are disabled.
+    :type live_query: Select
+    :return: The coverage rows.
+    :rtype: FastJSONResponse
+    """
+
+    if view_name is not None and get_settings().coverage_materialized:
+        statement = get_coverage_view(view_name)
+    else:
+        statement = live_query
+    rows = (await db.execute(statement)).mappings().all()
+    return FastJSONResponse(rows)
+
+
+@coverage_router.get("/by-country", response_model=list[CountryCoverage])
+async def get_coverage_by_country(
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """
+    Retrieve the number of sites and datasets per country.
+
+    :param db: The database session.
+    :type db: AsyncSession
+    :return: The coverage of every country holding a site.
+    :rtype: list[CountryCoverage]
+    """
+
+    return await fetch_coverage(
+        db, "coverage_by_country", get_coverage_by_country_query()
+    )
+
+
+@coverage_router.get("/by-grid", response_model=list[GridCellCoverage])
+async def get_coverage_by_grid(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    cell_size: Annotated[float, Query(gt=0, le=90)] = DEFAULT_GRID_CELL_SIZE,
+):
+    """
+    Retrieve the number of sites and datasets per grid cell.
+
+    This endpoint snaps all site locations to a regular grid, to find over
+    and under represented regions. Only the default cell size is served
+    from the materialized view, other sizes are always computed live.
+
+    :param db: The database session.
+    :type db: AsyncSession
+    :param cell_size: The edge length of the grid cells in degrees.
+    :type cell_size: float
+    :return: The coverage of every cell holding a site.
+    :rtype: list[GridCellCoverage]
+    """
+
+    # only the default cell size is materialized
+    view_name = (
+        "coverage_by_grid" if cell_size == DEFAULT_GRID_CELL_SIZE else None
+    )
+    return await fetch_coverage(
+        db, view_name, get_coverage_by_grid_query(cell_size)
+    )
+
+
+@coverage_router.get(
+    "/by-voc-subclass", response_model=list[VocSubclassCoverage]
+)
+async def get_coverage_by_voc_subclass(
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """
+    Retrieve the number of datasets per VOC subclass.
+
+    The counts are rolled up through the hierarchy, every subclass also
+    counts the datasets of its descendants.
+
+    :param db: The database session.
+    :type db: AsyncSession
+    :return: The coverage of every VOC subclass.
+    :rtype: list[VocSubclassCoverage]
+    """
+
+    return await fetch_coverage(
+        db, "coverage_by_voc_subclass", get_coverage_by_voc_subclass_query()
+    )
+
+
+@coverage_router.get("/by-year", response_model=list[YearCoverage])
+async def get_coverage_by_year(db: Annotated[AsyncSession, Depends(get_db)]):
+    """
+    Retrieve the number of datasets per sampling year.
+
+    :param db: The database session.
+    :type db: AsyncSession
+    :return: The coverage of every year overlapped by a sampling period.
+    :rtype: list[YearCoverage]
+    """
+
+    return await fetch_coverage(
+        db, "coverage_by_year", get_coverage_by_year_query()
+    )
+
+
+@coverage_router.post("/refresh")
+async def refresh_coverage(db: Annotated[AsyncSession, Depends(get_db)]):
+    """
+    Recompute the coverage materialized views.
+
+    :param db: The database session.
+    :type db: AsyncSession
+    :return: A confirmation message.
+    :rtype: dict
+    :raise HTTPException: materialized views are disabled
+    """
+
+    if not get_settings().coverage_materialized:
+        raise HTTPException(
+            status_code=409,
+            detail="Coverage is computed live, there is nothing to refresh",
+        )
+
+    def refresh(session):
+        refresh_coverage_views(session.connection())
+        mark_tables_written(session, COVERAGE_VIEWS)
+
+    await db.run_sync(refresh)
+    await db.commit()
+    return {"message": "Coverage refreshed"}
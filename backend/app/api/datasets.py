@@ -1,22 +1,35 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, col, func, select  # noqa: F401
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from backend.app.enums.export_format_enum import ExportFormatEnum
 from backend.app.models.dataset import Dataset
+from backend.app.models.dataset_read import DatasetRead
+from backend.app.models.dataset_search import DatasetSearch
+from backend.app.models.near_read import DatasetNear
 from backend.app.models.site import Site
-from backend.app.models.voc_subclass import VocSubclass
-from backend.app.utils.query_utils import (
-    get_all_voc_subclass_ancestor_ids_by_voc_subclass_id,
+from backend.app.utils.export_utils import EXPORT_MEDIA_TYPES, generate_export
+from backend.app.utils.include_utils import DatasetIncludeParams
+from backend.app.utils.pagination_utils import PaginationParams, paginate
+from backend.app.utils.proximity_utils import NearParams
+from backend.app.utils.search_utils import (
+    DatasetSearchParams,
+    has_voc_subclass,
+    in_country,
+    within_area,
 )
-from backend.database import get_db
+from backend.app.utils.serialization_utils import FastJSONResponse
+from backend.database import get_db, open_session
 
 dataset_router = APIRouter(prefix="/datasets", tags=["Datasets"])
 
 
 @dataset_router.post("/")
 async def create_dataset(
-    dataset: Dataset, db: Annotated[Session, Depends(get_db)]
+    dataset: Dataset, db: Annotated[AsyncSession, Depends(get_db)]
 ):
     """
     Create a new dataset.
@@ -26,36 +39,179 @@ async def create_dataset(
     :param dataset: The dataset information to be added.
     :type dataset: Dataset
     :param db: The database session.
-    :type db: Session
+    :type db: AsyncSession
     :return: The created dataset.
     :rtype: Dataset
     """
 
     db.add(dataset)
-    db.commit()
-    db.refresh(dataset)
+    await db.commit()
+    await db.refresh(dataset)
     return dataset
 
 
 @dataset_router.get("/")
-async def get_datasets(db: Annotated[Session, Depends(get_db)]):
+async def get_datasets(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    pagination: Annotated[PaginationParams, Depends()],
+    include: Annotated[DatasetIncludeParams, Depends()],
+):
     """
     Retrieve all datasets.
 
-    This endpoint retrieves all datasets stored in the database.
+    This endpoint retrieves all datasets stored in the database,
+    paginated by cursor.
+
+    :param db: The database session.
+    :type db: AsyncSession
+    :param pagination: The cursor, page size and fields to return.
+    :type pagination: PaginationParams
+    :param include: The related objects to embed in every dataset.
+    :type include: DatasetIncludeParams
+    :return: A page of datasets and the cursor of the next page.
+    :rtype: dict
+    :raise HTTPException: include combined with fields
+    """
+
+    if pagination.fields is not None:
+        if include.relationships:
+            raise HTTPException(
+                status_code=400,
+                detail="include can not be combined with fields",
+            )
+        return FastJSONResponse(await paginate(db, Dataset, pagination))
+
+    page = await paginate(db, Dataset, pagination, options=include.load_options)
+    page["items"] = [include.to_read(dataset) for dataset in page["items"]]
+    return FastJSONResponse(page)
+
+
+@dataset_router.get("/export")
+async def export_datasets(
+    export_format: Annotated[
+        ExportFormatEnum, Query(alias="format")
+    ] = ExportFormatEnum.NDJSON,
+):
+    """
+    Export the whole dataset catalogue.
+
+    This endpoint streams all datasets as NDJSON or CSV, with their site,
+    VOCs, VOC subclasses, contacts and publications embedded. Datasets are
+    read in batches through a server side cursor, so memory use does not
+    grow with the size of the catalogue.
 
+    :param export_format: The format of the export, ndjson or csv.
+    :type export_format: ExportFormatEnum
+    :return: The streamed export.
+    :rtype: StreamingResponse
+    """
+
+    # the request scoped session is closed before the response is streamed,
+    #   so the export opens its own
+    return StreamingResponse(
+        generate_export(open_session(), export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": "attachment;"
+            f' filename="datasets.{export_format.value}"'
+        },
+    )
+
+
+@dataset_router.get("/near", response_model=list[DatasetNear])
+async def get_datasets_near(
+    near: Annotated[NearParams, Depends()],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    include: Annotated[DatasetIncludeParams, Depends()],
+):
+    """
+    Retrieve the datasets closest to a point.
+
+    This endpoint retrieves datasets ordered by the distance of their site
+    to the given point, optionally limited to a radius and to datasets of
+    a VOC or VOC subclass.
+
+    :param near: The point, radius, limit and dataset filters.
+    :type near: NearParams
     :param db: The database session.
-    :type db: Session
-    :return: A list of all datasets.
-    :rtype: list[Dataset]
+    :type db: AsyncSession
+    :param include: The related objects to embed in every dataset.
+    :type include: DatasetIncludeParams
+    :return: The closest datasets with their distance in meters.
+    :rtype: list[DatasetNear]
     """
 
-    return db.query(Dataset).all()
+    statement = (
+        select(Dataset, near.distance)
+        .join(Site, col(Site.id) == Dataset.site_id)
+        .where(*near.site_filters(), *near.dataset_filters())
+        .options(*include.load_options)
+        .order_by(near.order, Dataset.id)
+        .limit(near.limit)
+    )
+
+    return FastJSONResponse(
+        [
+            DatasetNear(dataset=include.to_read(dataset), distance_m=distance)
+            for dataset, distance in (await db.exec(statement)).all()
+        ]
+    )
 
 
-@dataset_router.get("/by-site/{site_id}")
+@dataset_router.get("/search")
+async def search_datasets(
+    search: Annotated[DatasetSearchParams, Depends()],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    pagination: Annotated[PaginationParams, Depends()],
+    include: Annotated[DatasetIncludeParams, Depends()],
+):
+    """
+    Retrieve datasets matching a combination of filters.
+
+    This endpoint retrieves the datasets matching all given filters,
+    e.g. country, bounding box, VOC subclass, VOC and sampling period,
+    paginated by cursor. The filters are answered in a single statement
+    from the dataset search table.
+
+    :param search: The filters the datasets have to match.
+    :type search: DatasetSearchParams
+    :param db: The database session.
+    :type db: AsyncSession
+    :param pagination: The cursor, page size and fields to return.
+    :type pagination: PaginationParams
+    :param include: The related objects to embed in every dataset.
+    :type include: DatasetIncludeParams
+    :return: A page of matching datasets and the cursor of the next page.
+    :rtype: dict
+    :raise HTTPException: include combined with fields
+    """
+
+    if pagination.fields is not None:
+        if include.relationships:
+            raise HTTPException(
+                status_code=400,
+                detail="include can not be combined with fields",
+            )
+        return FastJSONResponse(
+            await paginate(db, Dataset, pagination, *search.dataset_filters())
+        )
+
+    page = await paginate(
+        db,
+        Dataset,
+        pagination,
+        *search.dataset_filters(),
+        options=include.load_options,
+    )
+    page["items"] = [include.to_read(dataset) for dataset in page["items"]]
+    return FastJSONResponse(page)
+
+
+@dataset_router.get("/by-site/{site_id}", response_model=list[DatasetRead])
 async def get_datasets_by_site_id(
-    site_id: int, db: Annotated[Session, Depends(get_db)]
+    site_id: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    include: Annotated[DatasetIncludeParams, Depends()],
 ):
     """
     Retrieve datasets by site ID.
@@ -65,18 +221,28 @@ async def get_datasets_by_site_id(
     :param site_id: The ID of the site.
     :type site_id: int
     :param db: The database session.
-    :type db: Session
+    :type db: AsyncSession
+    :param include: The related objects to embed in every dataset.
+    :type include: DatasetIncludeParams
     :return: A list of datasets associated with the specified site.
-    :rtype: list[Dataset]
+    :rtype: list[DatasetRead]
     """
 
-    statement = select(Dataset).where(Dataset.site_id == site_id)
-    return db.exec(statement).all()
+    statement = (
+        select(Dataset)
+        .where(Dataset.site_id == site_id)
+        .options(*include.load_options)
+        .order_by(Dataset.id)
+    )
+    datasets = (await db.exec(statement)).all()
+    return FastJSONResponse([include.to_read(dataset) for dataset in datasets])
 
 
-@dataset_router.get("/by-country/{country-name}")
+@dataset_router.get("/by-country/{country}", response_model=list[DatasetRead])
 async def get_datasets_by_country(
-    country: str, db: Annotated[Session, Depends(get_db)]
+    country: str,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    include: Annotated[DatasetIncludeParams, Depends()],
 ):
     """
     Retrieve datasets by country.
@@ -86,18 +252,31 @@ async def get_datasets_by_country(
     :param country: The name of the country.
     :type country: str
     :param db: The database session.
-    :type db: Session
+    :type db: AsyncSession
+    :param include: The related objects to embed in every dataset.
+    :type include: DatasetIncludeParams
     :return: A list of datasets associated with the specified country.
-    :rtype: list[Dataset]
+    :rtype: list[DatasetRead]
     """
 
-    statement = select(Dataset).where(Dataset.site.country == country)
-    return db.exec(statement).all()
+    statement = (
+        select(Dataset)
+        .join(DatasetSearch, col(DatasetSearch.dataset_id) == Dataset.id)
+        .where(in_country(country))
+        .options(*include.load_options)
+        .order_by(Dataset.id)
+    )
+    datasets = (await db.exec(statement)).all()
+    return FastJSONResponse([include.to_read(dataset) for dataset in datasets])
 
 
-@dataset_router.get("/by-subclass/{subclass_name}")
+@dataset_router.get(
+    "/by-subclass/{subclass_name}", response_model=list[DatasetRead]
+)
 async def get_datasets_by_subclass_name(
-    subclass_name: str, db: Annotated[Session, Depends(get_db)]
+    subclass_name: str,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    include: Annotated[DatasetIncludeParams, Depends()],
 ):
     """
     Retrieve datasets by VOC subclass name.
@@ -117,58 +296,26 @@ async def get_datasets_by_subclass_name(
     :param subclass_name: The name of the VOC subclass.
     :type subclass_name: str
     :param db: The database session.
-    :type db: Session
+    :type db: AsyncSession
+    :param include: The related objects to embed in every dataset.
+    :type include: DatasetIncludeParams
     :return: A list of datasets associated with the specified VOC subclass.
-    :rtype: list[Dataset]
+    :rtype: list[DatasetRead]
     :raise HTTPException: no datasets found for subclass
 
     """
 
-    # get subclass_id by name
-    given_subclass_id = (
-        db.exec(select(VocSubclass).where(VocSubclass.name == subclass_name))
-        .one()
-        .id
+    # a dataset is relevant if it is linked to the given subclass or any of
+    #   its descendants, either directly or through one of its VOCs, its
+    #   search row holds all of them
+    statement = (
+        select(Dataset)
+        .join(DatasetSearch, col(DatasetSearch.dataset_id) == Dataset.id)
+        .where(has_voc_subclass(subclass_name))
+        .options(*include.load_options)
+        .order_by(Dataset.id)
     )
-
-    # init array for relevant datasets
-    relevant_datasets = []
-
-    # get all datasets from db
-    datasets = db.exec(select(Dataset))
-
-    # TODO: There might be a more elegant solution for this function
-    #  by utilizing more sql functionality
-    for dataset in datasets:
-        contained_voc_subclasses = []
-        subclasses = dataset.voc_subclasses
-        for subclass in subclasses:
-            # for every dataset, collect the ancestors
-            #   for each associated voc_subclass
-            ancestor_ids = get_all_voc_subclass_ancestor_ids_by_voc_subclass_id(
-                subclass.id, db
-            )
-            for ancestor_id in ancestor_ids:
-                contained_voc_subclasses.append(ancestor_id)
-
-        for voc in dataset.vocs:
-            # do the same for all the VOCs and their voc_subclasses
-            if voc.voc_subclass:
-                ancestor_ids = (
-                    get_all_voc_subclass_ancestor_ids_by_voc_subclass_id(
-                        voc.voc_subclass.id, db
-                    )
-                )
-                for ancestor_id in ancestor_ids:
-                    contained_voc_subclasses.append(ancestor_id)
-
-        contained_voc_subclasses = list(set(contained_voc_subclasses))
-        # if any of the linked voc_subclasses or ancestors
-        #   are equal to the given_subclass_id
-        #   (i.e. the voc_subclass we are looking for),
-        #   add the dataset to the relevant datasets
-        if given_subclass_id in contained_voc_subclasses:
-            relevant_datasets.append(dataset)
+    relevant_datasets = (await db.exec(statement)).all()
 
     if not relevant_datasets:
         raise HTTPException(
@@ -177,18 +324,22 @@ async def get_datasets_by_subclass_name(
             " specified VOC subgroup",
         )
 
-    return relevant_datasets
+    return FastJSONResponse(
+        [include.to_read(dataset) for dataset in relevant_datasets]
+    )
 
 
 @dataset_router.get(
-    "/datasets/by-area/{min_lon}/{min_lat}/{max_lon}/{max_lat}/"
+    "/by-area/{min_lon}/{min_lat}/{max_lon}/{max_lat}/",
+    response_model=list[DatasetRead],
 )
 async def get_datasets_within_area(
     min_lon: float,
     min_lat: float,
     max_lon: float,
     max_lat: float,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    include: Annotated[DatasetIncludeParams, Depends()],
 ):
     """
     Retrieve datasets within a specified area.
@@ -205,30 +356,28 @@ async def get_datasets_within_area(
     :param max_lat: Maximum latitude of the bounding box.
     :type max_lat: float
     :param db: The database session.
-    :type db: Session
+    :type db: AsyncSession
+    :param include: The related objects to embed in every dataset.
+    :type include: DatasetIncludeParams
     :return: A list of datasets within the specified bounding box.
-    :rtype: list[Dataset]
+    :rtype: list[DatasetRead]
     :raise HTTPException: no datasets found in that area
     """
 
-    # Define the bounding box
-    bbox = (
-        f"POLYGON(({min_lon} {min_lat}, {min_lon} {max_lat}, {max_lon}"
-        f" {max_lat}, {max_lon} {min_lat}, {min_lon} {min_lat}))"
-    )
-
-    # Query to get datasets within the specified bounding box
-    statement = select(Dataset).where(
-        Dataset.site.func.ST_Within(
-            Site.geo_location, func.ST_GeomFromText(bbox, 4326)
-        )
+    # the search rows carry the site locations with a spatial index
+    statement = (
+        select(Dataset)
+        .join(DatasetSearch, col(DatasetSearch.dataset_id) == Dataset.id)
+        .where(within_area(min_lon, min_lat, max_lon, max_lat))
+        .options(*include.load_options)
+        .order_by(Dataset.id)
     )
 
-    results = db.exec(statement).all()
+    results = (await db.exec(statement)).all()
 
     if not results:
         raise HTTPException(
             status_code=404, detail="No datasets found in the specified area"
         )
 
-    return results
+    return FastJSONResponse([include.to_read(dataset) for dataset in results])
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+metrics_router = APIRouter(tags=["Monitoring"])
+
+
+@metrics_router.get("/metrics")
+async def get_metrics():
+    """
+    Retrieve the metrics of this worker.
+
+    This endpoint exposes the metrics in the Prometheus text format,
+    e.g. the state of the database connection pool.
+
+    :return: The current metrics.
+    :rtype: Response
+    """
+
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -1,7 +1,11 @@
+from typing import Annotated
+
 from fastapi import APIRouter, Depends
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.app.models.publication import Publication
+from backend.app.utils.pagination_utils import PaginationParams, paginate
+from backend.app.utils.serialization_utils import FastJSONResponse
 from backend.database import get_db
 
 publication_router = APIRouter(
@@ -10,23 +14,31 @@ publication_router = APIRouter(
 
 
 @publication_router.get("/")
-async def get_publications(db: Session = Depends(get_db)):
+async def get_publications(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    pagination: Annotated[PaginationParams, Depends()],
+):
     """
     Retrieve all publications.
 
-    This endpoint retrieves all publications stored in the database.
+    This endpoint retrieves all publications stored in the database,
+    paginated by cursor.
 
     :param db: The database session.
-    :type db: Session
-    :return: A list of all publications.
-    :rtype: list[Publication]
+    :type db: AsyncSession
+    :param pagination: The cursor, page size and fields to return.
+    :type pagination: PaginationParams
+    :return: A page of publications and the cursor of the next page.
+    :rtype: dict
     """
 
-    return db.query(Publication).all()
+    return FastJSONResponse(await paginate(db, Publication, pagination))
 
 
 @publication_router.post("/")
-async def create_publication(pub: Publication, db: Session = Depends(get_db)):
+async def create_publication(
+    pub: Publication, db: AsyncSession = Depends(get_db)
+):
     """
     Create a new publication.
 
@@ -35,12 +47,12 @@ async def create_publication(pub: Publication, db: Session = Depends(get_db)):
     :param pub: The publication information to be added.
     :type pub: Publication
     :param db: The database session.
-    :type db: Session
+    :type db: AsyncSession
     :return: The created publication.
     :rtype: Publication
     """
 
     db.add(pub)
-    db.commit()
-    db.refresh(pub)
+    await db.commit()
+    await db.refresh(pub)
     return pub
@@ -0,0 +1,49 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.models.search_read import SearchResult
+from backend.app.utils.name_search_utils import (
+    get_name_search_query,
+    parse_search_types,
+)
+from backend.app.utils.serialization_utils import FastJSONResponse
+from backend.database import get_db
+
+search_router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@search_router.get("/", response_model=list[SearchResult])
+async def search_by_name(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    q: Annotated[str, Query(min_length=3, max_length=100)],
+    types: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+):
+    """
+    Search VOCs, VOC subclasses, sites and contacts by name.
+
+    This endpoint matches the query against the names of VOCs and their
+    synonyms, the names of VOC subclasses and contacts, and the names,
+    regions and countries of sites. Matches tolerate typos and may start
+    with the query or contain a word similar to it. Results of all types
+    are ranked together, names starting with the query first.
+
+    :param db: The database session.
+    :type db: AsyncSession
+    :param q: The searched text, at least 3 characters.
+    :type q: str
+    :param types: Comma separated types to search, ``voc``,
+        ``voc_subclass``, ``site`` and ``contact``, all if omitted.
+    :type types: str | None
+    :param limit: The maximum number of results.
+    :type limit: int
+    :return: The best matching objects.
+    :rtype: list[SearchResult]
+    :raise HTTPException: unknown type requested
+    """
+
+    statement = get_name_search_query(q, parse_search_types(types), limit)
+    rows = (await db.execute(statement)).mappings().all()
+    return FastJSONResponse(rows)
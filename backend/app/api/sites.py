@@ -1,16 +1,32 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, func, select
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from backend.app.models.near_read import SiteNear
 from backend.app.models.site import Site
+from backend.app.models.version_counter import (  # noqa: E501
+    SITE_TILES_VERSION,
+    VersionCounter,
+)
+from backend.app.utils.geometry_utils import within_bounding_box
+from backend.app.utils.pagination_utils import PaginationParams, paginate
+from backend.app.utils.proximity_utils import NearParams
+from backend.app.utils.serialization_utils import FastJSONResponse
+from backend.app.utils.tile_utils import (
+    MAX_TILE_ZOOM,
+    TILE_MEDIA_TYPE,
+    get_site_tile_query,
+    site_tile_cache,
+)
 from backend.database import get_db
 
 site_router = APIRouter(prefix="/sites", tags=["Research Sites"])
 
 
 @site_router.post("/")
-async def create_site(site: Site, db: Annotated[Session, Depends(get_db)]):
+async def create_site(site: Site, db: Annotated[AsyncSession, Depends(get_db)]):
     """
     Create a new site.
 
@@ -19,36 +35,120 @@ async def create_site(site: Site, db: Annotated[Session, Depends(get_db)]):
     :param site: The site information to be added.
     :type site: Site
     :param db: The database session.
-    :type db: Session
+    :type db: AsyncSession
     :return: The created site.
     :rtype: Site
     """
 
     db.add(site)
-    db.commit()
-    db.refresh(site)
+    await db.commit()
+    await db.refresh(site)
     return site
 
 
 @site_router.get("/")
-async def get_sites(db: Annotated[Session, Depends(get_db)]):
+async def get_sites(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    pagination: Annotated[PaginationParams, Depends()],
+):
     """
     Retrieve all sites.
 
-    This endpoint retrieves all research sites stored in the database.
+    This endpoint retrieves all research sites stored in the database,
+    paginated by cursor.
 
     :param db: The database session.
-    :type db: Session
-    :return: A list of all sites.
-    :rtype: list[Site]
+    :type db: AsyncSession
+    :param pagination: The cursor, page size and fields to return.
+    :type pagination: PaginationParams
+    :return: A page of sites and the cursor of the next page.
+    :rtype: dict
+    """
+
+    return FastJSONResponse(await paginate(db, Site, pagination))
+
+
+@site_router.get("/near", response_model=list[SiteNear])
+async def get_sites_near(
+    near: Annotated[NearParams, Depends()],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """
+    Retrieve the sites closest to a point.
+
+    This endpoint retrieves research sites ordered by their distance to
+    the given point, optionally limited to a radius and to sites holding
+    datasets of a VOC or VOC subclass.
+
+    :param near: The point, radius, limit and dataset filters.
+    :type near: NearParams
+    :param db: The database session.
+    :type db: AsyncSession
+    :return: The closest sites with their distance in meters.
+    :rtype: list[SiteNear]
+    """
+
+    statement = select(Site, near.distance).where(*near.site_filters())
+    site_ids = near.site_ids_with_datasets()
+    if site_ids is not None:
+        statement = statement.where(col(Site.id).in_(site_ids))
+    statement = statement.order_by(near.order).limit(near.limit)
+
+    return FastJSONResponse(
+        [
+            SiteNear(site=site, distance_m=distance)
+            for site, distance in (await db.exec(statement)).all()
+        ]
+    )
+
+
+@site_router.get("/tiles/{z}/{x}/{y}.mvt")
+async def get_site_tile(
+    z: int, x: int, y: int, db: Annotated[AsyncSession, Depends(get_db)]
+):
+    """
+    Retrieve the sites of a map tile as Mapbox vector tile.
+
+    This endpoint renders the research sites within a web mercator tile.
+    At low zoom levels, nearby sites are merged into clusters. Every
+    feature carries the number of sites and datasets it represents.
+    Rendered tiles are cached until sites or datasets change.
+
+    :param z: The zoom level of the tile.
+    :type z: int
+    :param x: The column of the tile.
+    :type x: int
+    :param y: The row of the tile.
+    :type y: int
+    :param db: The database session.
+    :type db: AsyncSession
+    :return: The rendered tile.
+    :rtype: Response
+    :raise HTTPException: tile does not exist
     """
 
-    sites = db.query(Site).all()
-    return sites
+    if not 0 <= z <= MAX_TILE_ZOOM or not (0 <= x < 2**z and 0 <= y < 2**z):
+        raise HTTPException(status_code=404, detail="Tile not found")
+
+    version = (
+        await db.exec(
+            select(VersionCounter.version).where(
+                VersionCounter.name == SITE_TILES_VERSION
+            )
+        )
+    ).one()
+    tile = site_tile_cache.get((version, z, x, y))
+    if tile is None:
+        tile = (await db.exec(get_site_tile_query(z, x, y))).one() or b""
+        site_tile_cache.put((version, z, x, y), tile)
+
+    return Response(content=tile, media_type=TILE_MEDIA_TYPE)
 
 
 @site_router.get("/{site-id}")
-async def get_site_by_id(site_id: int, db: Annotated[Session, Depends(get_db)]):
+async def get_site_by_id(
+    site_id: int, db: Annotated[AsyncSession, Depends(get_db)]
+):
     """
     Retrieve a site by its ID.
 
@@ -57,13 +157,13 @@ async def get_site_by_id(site_id: int, db: Annotated[Session, Depends(get_db)]):
     :param site_id: The ID of the site.
     :type site_id: int
     :param db: The database session.
-    :type db: Session
+    :type db: AsyncSession
     :return: The site with the specified ID.
     :rtype: Site
     """
 
     statement = select(Site).where(Site.id == site_id)
-    return db.exec(statement).one()
+    return (await db.exec(statement)).one()
 
 
 @site_router.get("/by-area/{min_lon}/{min_lat}/{max_lon}/{max_lat}/")
@@ -72,7 +172,7 @@ async def get_sites_by_area(
     min_lat: float,
     max_lon: float,
     max_lat: float,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """
     Retrieve sites within a specified area.
@@ -89,26 +189,27 @@ async def get_sites_by_area(
     :param max_lat: Maximum latitude of the bounding box.
     :type max_lat: float
     :param db: The database session.
-    :type db: Session
+    :type db: AsyncSession
     :return: A list of sites within the specified bounding box.
     :rtype: list[Site]
     :raise HTTPException: no Site found in that area
     """
 
-    bbox = (
-        f"POLYGON(({min_lon} {min_lat}, {min_lon} {max_lat}, {max_lon}"
-        f" {max_lat}, {max_lon} {min_lat}, {min_lon} {min_lat}))"
-    )
-
-    statement = select(Site).where(
-        Site.func.ST_Within(Site.geo_location, func.ST_GeomFromText(bbox, 4326))
+    statement = (
+        select(Site)
+        .where(
+            within_bounding_box(
+                Site.geo_location, min_lon, min_lat, max_lon, max_lat
+            )
+        )
+        .order_by(Site.id)
     )
 
-    results = db.exec(statement).all()
+    results = (await db.exec(statement)).all()
 
     if not results:
         raise HTTPException(
             status_code=404, detail="No site found in the specified area"
         )
 
-    return results
+    return FastJSONResponse(results)
@@ -1,16 +1,19 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.exc import NoResultFound
-from sqlmodel import Session, select
+from sqlalchemy.exc import IntegrityError
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from backend.app.models.voc import Voc
 from backend.app.models.voc_subclass import VocSubclass
-from backend.app.utils.query_utils import (
-    get_all_voc_subclass_ancestor_ids_by_voc_subclass_id,
-)
+from backend.app.utils.pagination_utils import PaginationParams, paginate
+from backend.app.utils.serialization_utils import FastJSONResponse
+from backend.app.utils.taxonomy_cache import taxonomy_cache
 from backend.database import get_db
 
+# SQLSTATE codes of the constraint violations reported as client errors
+UNIQUE_VIOLATION = "23505"
+FOREIGN_KEY_VIOLATION = "23503"
+
 voc_subclass_router = APIRouter(
     prefix="/voc-subclasses",
     tags=["VOC Subclasses"],
@@ -19,7 +22,7 @@ voc_subclass_router = APIRouter(
 
 @voc_subclass_router.post("/")
 async def create_voc_subclass(
-    voc_subclass: VocSubclass, db: Annotated[Session, Depends(get_db)]
+    voc_subclass: VocSubclass, db: Annotated[AsyncSession, Depends(get_db)]
 ):
     """
     Create a new VOC subclass.
@@ -29,35 +32,64 @@ async def create_voc_subclass(
     :param voc_subclass: The VOC subclass information to be added.
     :type voc_subclass: VocSubclass
     :param db: The database session.
-    :type db: Session
+    :type db: AsyncSession
     :return: The created VOC subclass.
     :rtype: VocSubclass
+    :raise HTTPException: name already exists or parent does not exist
     """
 
     db.add(voc_subclass)
-    db.commit()
-    db.refresh(voc_subclass)
+    # the unique constraint also rejects concurrent requests for a name
+    try:
+        await db.commit()
+    except IntegrityError as error:
+        await db.rollback()
+        # the driver error wrapped by SQLAlchemy names the constraint
+        driver_error = error.orig.__cause__ or error.orig
+        sqlstate = getattr(error.orig, "sqlstate", None)
+        constraint_name = getattr(driver_error, "constraint_name", None)
+        if (
+            sqlstate == UNIQUE_VIOLATION
+            and constraint_name == "vocsubclass_name_key"
+        ):
+            raise HTTPException(
+                status_code=409,
+                detail="A VOC subclass with the given name already exists",
+            )
+        if sqlstate == FOREIGN_KEY_VIOLATION:
+            raise HTTPException(
+                status_code=400,
+                detail="No VOC subclass found for the given parent id",
+            )
+        raise HTTPException(status_code=400, detail=str(driver_error))
+    await db.refresh(voc_subclass)
 
 
 @voc_subclass_router.get("/")
-async def get_voc_subclasses(db: Session = Depends(get_db)):
+async def get_voc_subclasses(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    pagination: Annotated[PaginationParams, Depends()],
+):
     """
     Retrieve all VOC subclasses.
 
-    This endpoint retrieves all VOC subclasses stored in the database.
+    This endpoint retrieves all VOC subclasses stored in the database,
+    paginated by cursor.
 
     :param db: The database session.
-    :type db: Session
-    :return: A list of all VOC subclasses.
-    :rtype: list[VocSubclass]
+    :type db: AsyncSession
+    :param pagination: The cursor, page size and fields to return.
+    :type pagination: PaginationParams
+    :return: A page of VOC subclasses and the cursor of the next page.
+    :rtype: dict
     """
 
-    return db.query(VocSubclass).all()
+    return FastJSONResponse(await paginate(db, VocSubclass, pagination))
 
 
 @voc_subclass_router.get("/by-voc-id/{voc-id}")
 async def get_voc_subclasses_by_voc_id(
-    voc_id: int, db: Session = Depends(get_db)
+    voc_id: int, db: AsyncSession = Depends(get_db)
 ):
     """
     Retrieve VOC subclasses by VOC ID.
@@ -67,7 +99,7 @@ async def get_voc_subclasses_by_voc_id(
     :param voc_id: The ID of the VOC.
     :type voc_id: int
     :param db: The database session.
-    :type db: Session
+    :type db: AsyncSession
     :return: A list of VOC subclasses associated with the specified VOC.
     :rtype: list[VocSubclass]
 
@@ -76,31 +108,18 @@ async def get_voc_subclasses_by_voc_id(
 
     """
 
-    try:
-        voc = db.exec(select(Voc).where(Voc.id == voc_id)).one()
+    taxonomy = await taxonomy_cache.get(db)
 
-    except NoResultFound:
+    if voc_id not in taxonomy.vocs:
         raise HTTPException(
             status_code=404, detail="No VOC found for the given VOC id"
         )
 
-    associated_subclasses_ids = (
-        get_all_voc_subclass_ancestor_ids_by_voc_subclass_id(
-            voc.voc_subclass_id, db
-        )
-    )
-
-    associated_subclasses = []
-    for subclass_id in associated_subclasses_ids:
-        associated_subclasses.append(
-            db.exec(
-                select(VocSubclass).where(VocSubclass.id == subclass_id)
-            ).one()
-        )
+    associated_subclasses = taxonomy.get_voc_subclasses_by_voc_id(voc_id)
 
     if not associated_subclasses:
         raise HTTPException(
             status_code=404, detail="No VOC subclasses found for the given voc"
         )
 
-    return associated_subclasses
+    return FastJSONResponse(associated_subclasses)
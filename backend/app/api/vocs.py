@@ -1,13 +1,13 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.app.models.voc import Voc
-from backend.app.models.voc_subclass import VocSubclass
-from backend.app.utils.query_utils import (
-    get_all_voc_subclass_ancestor_ids_by_voc_subclass_id,
-)
+from backend.app.models.voc_synonym import VocSynonym
+from backend.app.utils.pagination_utils import PaginationParams, paginate
+from backend.app.utils.serialization_utils import FastJSONResponse
+from backend.app.utils.taxonomy_cache import taxonomy_cache
 from backend.database import get_db
 
 voc_router = APIRouter(
@@ -16,7 +16,7 @@ voc_router = APIRouter(
 
 
 @voc_router.post("/")
-async def create_voc(voc: Voc, db: Annotated[Session, Depends(get_db)]):
+async def create_voc(voc: Voc, db: Annotated[AsyncSession, Depends(get_db)]):
     """
     Create a new VOC.
 
@@ -25,36 +25,66 @@ async def create_voc(voc: Voc, db: Annotated[Session, Depends(get_db)]):
     :param voc: The VOC information to be added.
     :type voc: Voc
     :param db: The database session.
-    :type db: Session
+    :type db: AsyncSession
     :return: The created VOC.
     :rtype: Voc
     """
 
     db.add(voc)
-    db.commit()
-    db.refresh(voc)
+    await db.commit()
+    await db.refresh(voc)
     return voc
 
 
+@voc_router.post("/synonyms/")
+async def create_voc_synonym(
+    voc_synonym: VocSynonym, db: Annotated[AsyncSession, Depends(get_db)]
+):
+    """
+    Create a new synonym of a VOC.
+
+    Synonyms are matched by the name search, e.g. trivial names or
+    abbreviations of the VOC.
+
+    :param voc_synonym: The synonym information to be added.
+    :type voc_synonym: VocSynonym
+    :param db: The database session.
+    :type db: AsyncSession
+    :return: The created synonym.
+    :rtype: VocSynonym
+    """
+
+    db.add(voc_synonym)
+    await db.commit()
+    await db.refresh(voc_synonym)
+    return voc_synonym
+
+
 @voc_router.get("/")
-async def get_vocs(db: Annotated[Session, Depends(get_db)]):
+async def get_vocs(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    pagination: Annotated[PaginationParams, Depends()],
+):
     """
     Retrieve all VOCs.
 
-    This endpoint retrieves all VOCs stored in the database.
+    This endpoint retrieves all VOCs stored in the database,
+    paginated by cursor.
 
     :param db: The database session.
-    :type db: Session
-    :return: A list of all VOCs.
-    :rtype: list[Voc]
+    :type db: AsyncSession
+    :param pagination: The cursor, page size and fields to return.
+    :type pagination: PaginationParams
+    :return: A page of VOCs and the cursor of the next page.
+    :rtype: dict
     """
 
-    return db.query(Voc).all()
+    return FastJSONResponse(await paginate(db, Voc, pagination))
 
 
 @voc_router.get("/by-subclass/{subclass-name}")
 async def get_vocs_by_subclass_name(
-    subclass_name: str, db: Annotated[Session, Depends(get_db)]
+    subclass_name: str, db: Annotated[AsyncSession, Depends(get_db)]
 ):
     """
     Retrieve VOCs by subclass name.
@@ -64,27 +94,15 @@ async def get_vocs_by_subclass_name(
     :param subclass_name: The name of the VOC subclass.
     :type subclass_name: str
     :param db: The database session.
-    :type db: Session
+    :type db: AsyncSession
     :return: A list of VOCs associated with the specified subclass.
     :rtype: list[Voc]
 
     :raise HTTPException: no VOCs found
     """
 
-    # get subclass id from name
-    subclass_id = (
-        db.exec(select(VocSubclass).where(VocSubclass.name == subclass_name))
-        .one()
-        .id
-    )
-    vocs = db.exec(select(Voc)).all()
-    relevant_vocs = []
-    for voc in vocs:
-        ancestor_ids = get_all_voc_subclass_ancestor_ids_by_voc_subclass_id(
-            voc.voc_subclass.id, db
-        )
-        if subclass_id in ancestor_ids:
-            relevant_vocs.append(voc)
+    taxonomy = await taxonomy_cache.get(db)
+    relevant_vocs = taxonomy.get_vocs_by_voc_subclass_name(subclass_name)
 
     if not relevant_vocs:
         raise HTTPException(
@@ -92,4 +110,4 @@ async def get_vocs_by_subclass_name(
             detail="No vocs available for the specified VOC subclass",
         )
 
-    return relevant_vocs
+    return FastJSONResponse(relevant_vocs)
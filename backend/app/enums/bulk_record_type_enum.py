@@ -0,0 +1,15 @@
+from enum import Enum
+
+
+# Members are ordered by dependency, records are written in this order
+class BulkRecordTypeEnum(str, Enum):
+    VOC_SUBCLASS = "voc_subclass"
+    SITE = "site"
+    VOC = "voc"
+    CONTACT = "contact"
+    PUBLICATION = "publication"
+    DATASET = "dataset"
+    DATASET_VOC_LINK = "dataset_voc_link"
+    DATASET_VOC_SUBCLASS_LINK = "dataset_voc_subclass_link"
+    DATASET_CONTACT_LINK = "dataset_contact_link"
+    DATASET_PUBLICATION_LINK = "dataset_publication_link"
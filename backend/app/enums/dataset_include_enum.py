@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class DatasetIncludeEnum(str, Enum):
+    SITE = "site"
+    VOCS = "vocs"
+    VOC_SUBCLASSES = "voc_subclasses"
+    CONTACTS = "contacts"
+    PUBLICATIONS = "publications"
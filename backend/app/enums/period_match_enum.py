@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class PeriodMatchEnum(str, Enum):
+    OVERLAPS = "overlaps"
+    COVERS = "covers"
+    WITHIN = "within"
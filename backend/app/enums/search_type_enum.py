@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class SearchTypeEnum(str, Enum):
+    VOC = "voc"
+    VOC_SUBCLASS = "voc_subclass"
+    SITE = "site"
+    CONTACT = "contact"
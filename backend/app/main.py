@@ -1,21 +1,64 @@
+import time
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from backend import STARTED_AT
+from backend.app.api.bulk import bulk_router
 from backend.app.api.contacts import contact_router
+from backend.app.api.coverage import coverage_router
 from backend.app.api.datasets import dataset_router
+from backend.app.api.metrics import metrics_router
 from backend.app.api.publications import publication_router
+from backend.app.api.search import search_router
 from backend.app.api.sites import site_router
 from backend.app.api.voc_subclasses import voc_subclass_router
 from backend.app.api.vocs import voc_router
-from backend.database import init_db
+from backend.app.utils.cache_utils import (  # noqa: E501
+    ResponseCacheMiddleware,
+    create_cache_backend,
+)
+from backend.app.utils.metrics_utils import (  # noqa: E501
+    RequestMetricsMiddleware,
+    record_startup,
+)
+from backend.database import dispose_engine, init_engine
+from backend.settings import get_settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    lifespan_started_at = time.perf_counter()
+
+    # the schema is created by the migrations, workers only connect.
+    #   Open the first connection upfront, so the worker reports ready
+    #   once the database is reachable
+    engine = init_engine()
+    async with engine.connect():
+        pass
+
+    record_startup(STARTED_AT, lifespan_started_at)
+    yield
+    await dispose_engine()
+
 
 # include api routers
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.include_router(dataset_router)
 app.include_router(site_router)
 app.include_router(voc_router)
 app.include_router(voc_subclass_router)
 app.include_router(contact_router)
 app.include_router(publication_router)
+app.include_router(bulk_router)
+app.include_router(coverage_router)
+app.include_router(search_router)
+app.include_router(metrics_router)
+
+# cache responses of read endpoints
+cache_backend = create_cache_backend(get_settings())
+if cache_backend is not None:
+    app.add_middleware(ResponseCacheMiddleware, backend=cache_backend)
 
-# initialize database connection
-init_db()
+# measure every request, including those answered from the cache
+app.add_middleware(RequestMetricsMiddleware)
@@ -21,7 +21,7 @@ class DatasetVocLink(SQLModel, table=True):
         default=None, foreign_key="dataset.id", primary_key=True
     )
     voc_id: int | None = Field(
-        default=None, foreign_key="voc.id", primary_key=True
+        default=None, foreign_key="voc.id", primary_key=True, index=True
     )
     instrument: str | None = None
 
@@ -44,7 +44,10 @@ class DatasetPublicationLink(SQLModel, table=True):
         default=None, foreign_key="dataset.id", primary_key=True
     )
     publication_id: int | None = Field(
-        default=None, foreign_key="publication.id", primary_key=True
+        default=None,
+        foreign_key="publication.id",
+        primary_key=True,
+        index=True,
     )
 
 
@@ -66,7 +69,7 @@ class DatasetContactLink(SQLModel, table=True):
         default=None, foreign_key="dataset.id", primary_key=True
     )
     contact_id: int | None = Field(
-        default=None, foreign_key="contact.id", primary_key=True
+        default=None, foreign_key="contact.id", primary_key=True, index=True
     )
 
 
@@ -88,5 +91,8 @@ class DatasetVocSubclassLink(SQLModel, table=True):
         default=None, foreign_key="dataset.id", primary_key=True
     )
     voc_subclass_id: int | None = Field(
-        default=None, foreign_key="vocsubclass.id", primary_key=True
+        default=None,
+        foreign_key="vocsubclass.id",
+        primary_key=True,
+        index=True,
     )
@@ -1,6 +1,7 @@
 from sqlmodel import Field, Relationship, SQLModel
 
 from backend.app.models.associations import DatasetContactLink
+from backend.app.utils.trigram_utils import trigram_index
 
 
 class Contact(SQLModel, table=True):
@@ -21,6 +22,8 @@ class Contact(SQLModel, table=True):
     :type datasets: list[Dataset]
     """
 
+    __table_args__ = (trigram_index("idx_contact_name_trgm", "name"),)
+
     id: int = Field(default=None, primary_key=True)
     name: str
     email: str | None = None
@@ -0,0 +1,75 @@
+from sqlmodel import SQLModel
+
+
+class CountryCoverage(SQLModel):
+    """
+    Represents the number of sites and datasets of a country.
+
+    :param country: The name of the country.
+    :type country: str
+    :param site_count: The number of sites in the country.
+    :type site_count: int
+    :param dataset_count: The number of datasets at these sites.
+    :type dataset_count: int
+    """
+
+    country: str
+    site_count: int
+    dataset_count: int
+
+
+class GridCellCoverage(SQLModel):
+    """
+    Represents the number of sites and datasets within a grid cell.
+
+    :param lon: Longitude of the centre of the cell.
+    :type lon: float
+    :param lat: Latitude of the centre of the cell.
+    :type lat: float
+    :param site_count: The number of sites in the cell.
+    :type site_count: int
+    :param dataset_count: The number of datasets at these sites.
+    :type dataset_count: int
+    """
+
+    lon: float
+    lat: float
+    site_count: int
+    dataset_count: int
+
+
+class VocSubclassCoverage(SQLModel):
+    """
+    Represents the number of datasets of a VOC subclass.
+
+    :param voc_subclass_id: The ID of the VOC subclass.
+    :type voc_subclass_id: int
+    :param name: The name of the VOC subclass.
+    :type name: str
+    :param direct_dataset_count: The number of datasets linked to the
+        subclass itself, directly or through a VOC.
+    :type direct_dataset_count: int
+    :param dataset_count: The number of datasets linked to the subclass
+        or any of its descendants.
+    :type dataset_count: int
+    """
+
+    voc_subclass_id: int
+    name: str
+    direct_dataset_count: int
+    dataset_count: int
+
+
+class YearCoverage(SQLModel):
+    """
+    Represents the number of datasets sampled within a year.
+
+    :param year: The year.
+    :type year: int
+    :param dataset_count: The number of datasets whose sampling period
+        overlaps the year.
+    :type dataset_count: int
+    """
+
+    year: int
+    dataset_count: int
@@ -1,5 +1,6 @@
 from datetime import date
 
+from sqlalchemy import event
 from sqlmodel import CheckConstraint, Field, Relationship, SQLModel
 
 from backend.app.enums.time_resolution_unit_enum import TimeResolutionUnitEnum
@@ -12,6 +13,7 @@ from backend.app.models.associations import (
 from backend.app.models.contact import Contact
 from backend.app.models.publication import Publication
 from backend.app.models.site import Site
+from backend.app.models.version_counter import site_tiles_after_write
 from backend.app.models.voc import Voc
 from backend.app.models.voc_subclass import VocSubclass
 
@@ -51,7 +53,7 @@ class Dataset(SQLModel, table=True):
     """
 
     id: int | None = Field(primary_key=True, default=None)
-    site_id: int | None = Field(default=None, foreign_key="site.id")
+    site_id: int | None = Field(default=None, foreign_key="site.id", index=True)
     site: Site = Relationship(back_populates="datasets")
     sampling_period_begin: date | None = None
     sampling_period_end: date | None = None
@@ -85,3 +87,8 @@ class Dataset(SQLModel, table=True):
             name="check_end_date_after_start_date",
         ),
     )
+
+
+event.listen(Dataset, "after_insert", site_tiles_after_write)
+event.listen(Dataset, "after_update", site_tiles_after_write)
+event.listen(Dataset, "after_delete", site_tiles_after_write)
@@ -0,0 +1,62 @@
+from datetime import date
+
+from sqlmodel import SQLModel
+
+from backend.app.enums.time_resolution_unit_enum import TimeResolutionUnitEnum
+from backend.app.models.contact import Contact
+from backend.app.models.publication import Publication
+from backend.app.models.site import Site
+from backend.app.models.voc import Voc
+from backend.app.models.voc_subclass import VocSubclass
+
+
+class DatasetRead(SQLModel):
+    """
+    Represents a dataset as returned by the API.
+
+    Holds the columns of a :class:`Dataset` and, if requested with the
+    ``include`` query parameter, its related objects. Relationships that
+    were not requested are None.
+
+    :param id: The unique identifier of the dataset.
+    :type id: int
+    :param site_id: The ID of the associated site.
+    :type site_id: int
+    :param sampling_period_begin: The start date of the sampling period.
+    :type sampling_period_begin: date
+    :param sampling_period_end: The end date of the sampling period.
+    :type sampling_period_end: date
+    :param time_resolution_unit: The unit of time resolution.
+    :type time_resolution_unit: TimeResolutionUnitEnum
+    :param time_resolution_interval: The interval of time resolution.
+    :type time_resolution_interval: int
+    :param data_type: The type of data in the dataset.
+    :type data_type: str
+    :param link_to_dataset: The link to the dataset.
+    :type link_to_dataset: str
+    :param site: The site associated with the dataset.
+    :type site: Site
+    :param vocs: The VOCs associated with the dataset.
+    :type vocs: list[Voc]
+    :param voc_subclasses: The VOC subclasses associated with the dataset.
+    :type voc_subclasses: list[VocSubclass]
+    :param contacts: The contacts associated with the dataset.
+    :type contacts: list[Contact]
+    :param publications: The publications associated with the dataset.
+    :type publications: list[Publication]
+    """
+
+    id: int
+    site_id: int | None = None
+    sampling_period_begin: date | None = None
+    sampling_period_end: date | None = None
+    time_resolution_unit: TimeResolutionUnitEnum | None = None
+    time_resolution_interval: int | None = None
+    data_type: str | None = None
+    link_to_dataset: str | None = None
+
+    site: Site | None = None
+    vocs: list[Voc] | None = None
+    voc_subclasses: list[VocSubclass] | None = None
+    contacts: list[Contact] | None = None
+    publications: list[Publication] | None = None
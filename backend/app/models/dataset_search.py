@@ -0,0 +1,147 @@
+from datetime import date
+from typing import Iterable
+
+from geoalchemy2 import Geometry
+from geojson_pydantic import Point
+from sqlalchemy import (
+    Connection,
+    ForeignKey,
+    Index,
+    Integer,
+    bindparam,
+    event,
+    func,
+    literal_column,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, DATERANGE
+from sqlmodel import Column, Field, SQLModel
+
+from backend.app.enums.time_resolution_unit_enum import TimeResolutionUnitEnum
+from backend.app.utils.geometry_utils import geometry_to_geojson
+
+
+class DatasetSearch(SQLModel, table=True):
+    """
+    Denormalised search row of a dataset.
+
+    This table holds one row per dataset with the attributes datasets are
+    filtered by, including those of its site, VOCs and VOC subclasses.
+    Filters on any combination of them hit this single indexed table
+    instead of joining the link tables and walking the hierarchy. Rows are
+    maintained by database triggers, which are installed by the migrations,
+    do not write them manually.
+
+    :param dataset_id: The ID of the dataset.
+    :type dataset_id: int
+    :param site_id: The ID of the site of the dataset.
+    :type site_id: int
+    :param country: The country of the site.
+    :type country: str
+    :param geo_location: The geographical location of the site.
+    :type geo_location: Point
+    :param sampling_period_begin: The start date of the sampling period.
+    :type sampling_period_begin: date
+    :param sampling_period_end: The end date of the sampling period.
+    :type sampling_period_end: date
+    :param time_resolution_unit: The unit of time resolution.
+    :type time_resolution_unit: TimeResolutionUnitEnum
+    :param data_type: The type of data in the dataset.
+    :type data_type: str
+    :param voc_ids: The IDs of all VOCs linked to the dataset.
+    :type voc_ids: list[int]
+    :param voc_subclass_ids: The IDs of all VOC subclasses of the dataset,
+        linked directly or through a VOC, and of all their ancestors.
+    :type voc_subclass_ids: list[int]
+    """
+
+    __tablename__ = "dataset_search"
+    __table_args__ = (
+        Index(
+            "idx_dataset_search_geo_location",
+            "geo_location",
+            postgresql_using="gist",
+        ),
+        Index("idx_dataset_search_voc_ids", "voc_ids", postgresql_using="gin"),
+        Index(
+            "idx_dataset_search_voc_subclass_ids",
+            "voc_subclass_ids",
+            postgresql_using="gin",
+        ),
+    )
+
+    dataset_id: int = Field(
+        sa_column=Column(
+            Integer,
+            ForeignKey("dataset.id", ondelete="CASCADE"),
+            primary_key=True,
+        )
+    )
+    site_id: int | None = Field(default=None, index=True)
+    country: str | None = Field(default=None, index=True)
+    geo_location: Point | None = Field(
+        sa_column=Column(
+            Geometry(geometry_type="POINT", srid=4326, spatial_index=False)
+        ),
+        default=None,
+    )
+    sampling_period_begin: date | None = None
+    sampling_period_end: date | None = None
+    time_resolution_unit: TimeResolutionUnitEnum | None = None
+    data_type: str | None = None
+    voc_ids: list[int] = Field(
+        default_factory=list, sa_column=Column(ARRAY(Integer), nullable=False)
+    )
+    voc_subclass_ids: list[int] = Field(
+        default_factory=list, sa_column=Column(ARRAY(Integer), nullable=False)
+    )
+
+
+# the sampling period as inclusive range, missing bounds are unbounded.
+#   Filters have to use exactly this expression to be answered by its index,
+#   so the bounds type is rendered literally instead of as parameter
+SAMPLING_PERIOD = func.daterange(
+    DatasetSearch.__table__.c.sampling_period_begin,
+    DatasetSearch.__table__.c.sampling_period_end,
+    literal_column("'[]'"),
+    type_=DATERANGE,
+)
+Index(
+    "idx_dataset_search_sampling_period",
+    SAMPLING_PERIOD,
+    postgresql_using="gist",
+)
+
+
+def dataset_search_after_load(target, context):
+    target.geo_location = geometry_to_geojson(target.geo_location)
+
+
+event.listen(DatasetSearch, "load", dataset_search_after_load)
+
+
+def refresh_dataset_search(
+    connection: Connection, dataset_ids: Iterable[int] | None = None
+) -> None:
+    """
+    Recompute the search rows of the given datasets.
+
+    The triggers keep the rows up to date, call this only to repair them.
+
+    :param connection: The connection to execute the statement on.
+    :type connection: sqlalchemy.Connection
+    :param dataset_ids: IDs of the datasets to refresh,
+        or None to rebuild the whole table.
+    :type dataset_ids: Iterable[int] | None
+    """
+
+    if dataset_ids is not None:
+        dataset_ids = list(dataset_ids)
+        if not dataset_ids:
+            return
+
+    connection.execute(
+        text("SELECT dataset_search_refresh(:dataset_ids)").bindparams(
+            bindparam("dataset_ids", dataset_ids, type_=ARRAY(Integer))
+        )
+    )
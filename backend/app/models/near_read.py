@@ -0,0 +1,34 @@
+from sqlmodel import SQLModel
+
+from backend.app.models.dataset_read import DatasetRead
+from backend.app.models.site import Site
+
+
+class SiteNear(SQLModel):
+    """
+    Represents a site found by a proximity search.
+
+    :param site: The site.
+    :type site: Site
+    :param distance_m: The distance between the site and the searched
+        point in meters.
+    :type distance_m: float
+    """
+
+    site: Site
+    distance_m: float
+
+
+class DatasetNear(SQLModel):
+    """
+    Represents a dataset found by a proximity search.
+
+    :param dataset: The dataset.
+    :type dataset: DatasetRead
+    :param distance_m: The distance between the site of the dataset and
+        the searched point in meters.
+    :type distance_m: float
+    """
+
+    dataset: DatasetRead
+    distance_m: float
@@ -0,0 +1,28 @@
+from sqlmodel import SQLModel
+
+from backend.app.enums.search_type_enum import SearchTypeEnum
+
+
+class SearchResult(SQLModel):
+    """
+    Represents an object found by the name search.
+
+    :param type: The type of the object.
+    :type type: SearchTypeEnum
+    :param id: The ID of the object.
+    :type id: int
+    :param name: The name of the object.
+    :type name: str | None
+    :param matched: The text that matched the query, e.g. the name, a
+        synonym of a VOC or the region of a site.
+    :type matched: str
+    :param score: The similarity of the matched text to the query,
+        from 0 to 1.
+    :type score: float
+    """
+
+    type: SearchTypeEnum
+    id: int
+    name: str | None
+    matched: str
+    score: float
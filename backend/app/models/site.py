@@ -1,12 +1,15 @@
 from geoalchemy2 import Geometry
 from geojson_pydantic import Point
-from sqlalchemy import event
+from sqlalchemy import Index, event
 from sqlmodel import Column, Field, Relationship, SQLModel
 
+from backend.app.models.version_counter import site_tiles_after_write
 from backend.app.utils.geometry_utils import (  # noqa: E501
+    as_geography,
     geojson_to_geometry,
     geometry_to_geojson,
 )
+from backend.app.utils.trigram_utils import trigram_index
 
 
 class Site(SQLModel, table=True):
@@ -31,15 +34,27 @@ class Site(SQLModel, table=True):
     :type datasets: list[Dataset]
     """
 
+    # GiST index for bounding box and distance queries on the location,
+    #   declared explicitly instead of relying on GeoAlchemy2 to add it,
+    #   and trigram indexes for the name search
+    __table_args__ = (
+        Index("idx_site_geo_location", "geo_location", postgresql_using="gist"),
+        trigram_index("idx_site_name_trgm", "name"),
+        trigram_index("idx_site_region_trgm", "region"),
+        trigram_index("idx_site_country_trgm", "country"),
+    )
+
     id: int | None = Field(primary_key=True, default=None)
     name: str | None = None
     region: str | None = None
-    country: str
+    country: str = Field(index=True)
     typology: str | None = None
     # Use geojson_pydantic Scheme to adhere to GeoJSON standard
     # Use GeoAlchemy2 Column Type here to store values properly
     geo_location: Point | None = Field(
-        sa_column=Column(Geometry(geometry_type="POINT", srid=4326)),
+        sa_column=Column(
+            Geometry(geometry_type="POINT", srid=4326, spatial_index=False)
+        ),
         default=None,
     )
 
@@ -48,6 +63,15 @@ class Site(SQLModel, table=True):
     )
 
 
+# GiST index for distance queries in meters, built on the same
+#   geography cast the queries use
+Index(
+    "idx_site_geo_location_geography",
+    as_geography(Site.__table__.c.geo_location),
+    postgresql_using="gist",
+)
+
+
 def site_before_insert(mapper, connection, target):
     target.geo_location = geojson_to_geometry(target.geo_location)
 
@@ -58,3 +82,6 @@ def site_after_load(target, context):
 
 event.listen(Site, "before_insert", site_before_insert)
 event.listen(Site, "load", site_after_load)
+event.listen(Site, "after_insert", site_tiles_after_write)
+event.listen(Site, "after_update", site_tiles_after_write)
+event.listen(Site, "after_delete", site_tiles_after_write)
@@ -0,0 +1,52 @@
+from sqlalchemy import Connection, update
+from sqlmodel import Field, SQLModel
+
+# names of the counters, their rows are added by the migrations
+TAXONOMY_VERSION = "taxonomy"
+SITE_TILES_VERSION = "site_tiles"
+
+
+class VersionCounter(SQLModel, table=True):
+    """
+    Version counters of the data cached by the workers.
+
+    This table holds one row per cache, whose version is incremented on
+    every write to the data it caches. Workers key their in-process caches
+    on it, so writes on any worker invalidate the caches of all workers.
+    The taxonomy cache counts writes to VOCs and VOC subclasses, the site
+    tile cache writes to sites and datasets.
+
+    :param name: The name of the counter, e.g. :data:`TAXONOMY_VERSION`.
+    :type name: str
+    :param version: The current version of the cached data.
+    :type version: int
+    """
+
+    name: str = Field(primary_key=True)
+    version: int = 0
+
+
+def bump_version(connection: Connection, name: str) -> None:
+    """
+    Increment a version counter, invalidating the caches keyed on it.
+
+    :param connection: The connection to execute the statement on.
+    :type connection: sqlalchemy.Connection
+    :param name: The name of the counter.
+    :type name: str
+    """
+
+    table = VersionCounter.__table__
+    connection.execute(
+        update(table)
+        .where(table.c.name == name)
+        .values(version=table.c.version + 1)
+    )
+
+
+def taxonomy_after_write(mapper, connection, target):
+    bump_version(connection, TAXONOMY_VERSION)
+
+
+def site_tiles_after_write(mapper, connection, target):
+    bump_version(connection, SITE_TILES_VERSION)
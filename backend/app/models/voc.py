@@ -1,7 +1,10 @@
+from sqlalchemy import event
 from sqlmodel import Field, Relationship, SQLModel
 
 from backend.app.models.associations import DatasetVocLink
+from backend.app.models.version_counter import taxonomy_after_write
 from backend.app.models.voc_subclass import VocSubclass
+from backend.app.utils.trigram_utils import trigram_index
 
 
 class Voc(SQLModel, table=True):
@@ -21,9 +24,11 @@ class Voc(SQLModel, table=True):
     :type datasets: list[Dataset]
     """
 
+    __table_args__ = (trigram_index("idx_voc_name_trgm", "name"),)
+
     id: int | None = Field(default=None, primary_key=True)
     voc_subclass_id: int | None = Field(
-        default=None, foreign_key="vocsubclass.id"
+        default=None, foreign_key="vocsubclass.id", index=True
     )
     voc_subclass: VocSubclass | None = Relationship(back_populates="vocs")
     name: str | None = None
@@ -32,3 +37,8 @@ class Voc(SQLModel, table=True):
     datasets: list["Dataset"] = Relationship(  # noqa: F821
         back_populates="vocs", link_model=DatasetVocLink
     )
+
+
+event.listen(Voc, "after_insert", taxonomy_after_write)
+event.listen(Voc, "after_update", taxonomy_after_write)
+event.listen(Voc, "after_delete", taxonomy_after_write)
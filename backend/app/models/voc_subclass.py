@@ -1,8 +1,12 @@
 from typing import Optional
 
+from sqlalchemy import event, inspect
 from sqlmodel import Field, Relationship, SQLModel
 
 from backend.app.models.associations import DatasetVocSubclassLink
+from backend.app.models.version_counter import TAXONOMY_VERSION, bump_version
+from backend.app.models.voc_subclass_closure import refresh_voc_subclass_closure
+from backend.app.utils.trigram_utils import trigram_index
 
 
 class VocSubclass(SQLModel, table=True):
@@ -25,9 +29,11 @@ class VocSubclass(SQLModel, table=True):
     :type datasets: list["Dataset"]
     """
 
+    __table_args__ = (trigram_index("idx_vocsubclass_name_trgm", "name"),)
+
     id: int = Field(default=None, primary_key=True)
     parent_voc_category_id: int | None = Field(
-        default=None, foreign_key="vocsubclass.id"
+        default=None, foreign_key="vocsubclass.id", index=True
     )
     parent_voc_category: Optional["VocSubclass"] | None = Relationship(
         back_populates="child_voc_categories",
@@ -39,8 +45,28 @@ class VocSubclass(SQLModel, table=True):
     vocs: list["Voc"] | None = Relationship(  # noqa: F821
         back_populates="voc_subclass"
     )
-    name: str
+    # unique, as subclasses are looked up by name
+    name: str = Field(unique=True)
 
     datasets: list["Dataset"] = Relationship(  # noqa: F821
         back_populates="voc_subclasses", link_model=DatasetVocSubclassLink
     )
+
+
+def voc_subclass_after_insert(mapper, connection, target):
+    refresh_voc_subclass_closure(connection, [target.id])
+    bump_version(connection, TAXONOMY_VERSION)
+
+
+def voc_subclass_after_update(mapper, connection, target):
+    bump_version(connection, TAXONOMY_VERSION)
+    state = inspect(target)
+    if (
+        state.attrs.parent_voc_category_id.history.has_changes()
+        or state.attrs.parent_voc_category.history.has_changes()
+    ):
+        refresh_voc_subclass_closure(connection, [target.id])
+
+
+event.listen(VocSubclass, "after_insert", voc_subclass_after_insert)
+event.listen(VocSubclass, "after_update", voc_subclass_after_update)
@@ -0,0 +1,107 @@
+from typing import Iterable
+
+from sqlalchemy import (
+    Connection,
+    Integer,
+    column,
+    delete,
+    literal_column,
+    select,
+    table,
+)
+from sqlmodel import Field, SQLModel
+
+# lightweight table construct, so the hierarchy can be walked without
+# importing the VocSubclass model (which imports this module)
+voc_subclass_table = table(
+    "vocsubclass", column("id"), column("parent_voc_category_id")
+)
+
+
+class VocSubclassClosure(SQLModel, table=True):
+    """
+    Closure table of the VOC Subclass hierarchy.
+
+    This table holds one row for every pair of a VOC subclass and one of its
+    ancestors, including the subclass itself at depth 0. It turns ancestor
+    and descendant lookups into indexed equality joins instead of recursive
+    queries. Rows are maintained by the VocSubclass mapper events, do not
+    write them manually.
+
+    :param ancestor_id: The ID of the ancestor VOC subclass.
+    :type ancestor_id: int
+    :param descendant_id: The ID of the descendant VOC subclass.
+    :type descendant_id: int
+    :param depth: The number of levels between ancestor and descendant.
+    :type depth: int
+    """
+
+    ancestor_id: int = Field(foreign_key="vocsubclass.id", primary_key=True)
+    descendant_id: int = Field(
+        foreign_key="vocsubclass.id", primary_key=True, index=True
+    )
+    depth: int
+
+
+def refresh_voc_subclass_closure(
+    connection: Connection, voc_subclass_ids: Iterable[int] | None = None
+) -> None:
+    """
+    Recompute the closure rows of the given VOC subclasses and their subtrees.
+
+    Call this after VOC subclasses were inserted or reparented. Previously
+    stored descendants of the given subclasses are refreshed as well, since
+    their ancestors change with a reparented subclass.
+
+    :param connection: The connection to execute the statements on.
+    :type connection: sqlalchemy.Connection
+    :param voc_subclass_ids: IDs of the inserted or reparented subclasses,
+        or None to rebuild the whole closure table.
+    :type voc_subclass_ids: Iterable[int] | None
+    """
+
+    closure = VocSubclassClosure.__table__
+
+    if voc_subclass_ids is None:
+        connection.execute(delete(closure))
+        affected_ids = select(voc_subclass_table.c.id)
+    else:
+        voc_subclass_ids = list(voc_subclass_ids)
+        # collect the stored subtrees before deleting their rows
+        affected_ids = set(voc_subclass_ids) | set(
+            connection.execute(
+                select(closure.c.descendant_id).where(
+                    closure.c.ancestor_id.in_(voc_subclass_ids)
+                )
+            ).scalars()
+        )
+        connection.execute(
+            delete(closure).where(closure.c.descendant_id.in_(affected_ids))
+        )
+
+    # walk up from every affected subclass, collecting (ancestor, depth)
+    walk = (
+        select(
+            voc_subclass_table.c.id.label("ancestor_id"),
+            voc_subclass_table.c.id.label("descendant_id"),
+            voc_subclass_table.c.parent_voc_category_id.label("parent_id"),
+            literal_column("0", Integer).label("depth"),
+        )
+        .where(voc_subclass_table.c.id.in_(affected_ids))
+        .cte(name="closure_walk", recursive=True)
+    )
+    walk = walk.union_all(
+        select(
+            voc_subclass_table.c.id,
+            walk.c.descendant_id,
+            voc_subclass_table.c.parent_voc_category_id,
+            walk.c.depth + 1,
+        ).join(walk, voc_subclass_table.c.id == walk.c.parent_id)
+    )
+
+    connection.execute(
+        closure.insert().from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(walk.c.ancestor_id, walk.c.descendant_id, walk.c.depth),
+        )
+    )
@@ -0,0 +1,33 @@
+from sqlalchemy import ForeignKey, Integer
+from sqlmodel import Column, Field, SQLModel
+
+from backend.app.utils.trigram_utils import trigram_index
+
+
+class VocSynonym(SQLModel, table=True):
+    """
+    Represents an alternative name of a VOC.
+
+    Synonyms, e.g. trivial names, abbreviations or other spellings, are
+    matched by the name search in addition to the name of the VOC.
+
+    :param id: The unique identifier of the synonym.
+    :type id: int
+    :param voc_id: The ID of the VOC.
+    :type voc_id: int
+    :param name: The alternative name.
+    :type name: str
+    """
+
+    __table_args__ = (trigram_index("idx_vocsynonym_name_trgm", "name"),)
+
+    id: int | None = Field(default=None, primary_key=True)
+    voc_id: int = Field(
+        sa_column=Column(
+            Integer,
+            ForeignKey("voc.id", ondelete="CASCADE"),
+            nullable=False,
+            index=True,
+        )
+    )
+    name: str
@@ -0,0 +1,333 @@
+import json
+
+from geoalchemy2 import Geometry
+from pydantic import ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError
+from sqlmodel import Session, SQLModel
+
+from backend.app.enums.bulk_record_type_enum import BulkRecordTypeEnum
+from backend.app.models.associations import (
+    DatasetContactLink,
+    DatasetPublicationLink,
+    DatasetVocLink,
+    DatasetVocSubclassLink,
+)
+from backend.app.models.contact import Contact
+from backend.app.models.dataset import Dataset
+from backend.app.models.publication import Publication
+from backend.app.models.site import Site
+from backend.app.models.version_counter import (
+    SITE_TILES_VERSION,
+    TAXONOMY_VERSION,
+    bump_version,
+)
+from backend.app.models.voc import Voc
+from backend.app.models.voc_subclass import VocSubclass
+from backend.app.models.voc_subclass_closure import refresh_voc_subclass_closure
+from backend.app.utils.geometry_utils import geojson_to_geometry
+
+# maximum number of rows written by a single multi-row insert
+BULK_BATCH_SIZE = 1000
+
+BULK_MODELS: dict[BulkRecordTypeEnum, type[SQLModel]] = {
+    BulkRecordTypeEnum.VOC_SUBCLASS: VocSubclass,
+    BulkRecordTypeEnum.SITE: Site,
+    BulkRecordTypeEnum.VOC: Voc,
+    BulkRecordTypeEnum.CONTACT: Contact,
+    BulkRecordTypeEnum.PUBLICATION: Publication,
+    BulkRecordTypeEnum.DATASET: Dataset,
+    BulkRecordTypeEnum.DATASET_VOC_LINK: DatasetVocLink,
+    BulkRecordTypeEnum.DATASET_VOC_SUBCLASS_LINK: DatasetVocSubclassLink,
+    BulkRecordTypeEnum.DATASET_CONTACT_LINK: DatasetContactLink,
+    BulkRecordTypeEnum.DATASET_PUBLICATION_LINK: DatasetPublicationLink,
+}
+
+TAXONOMY_RECORD_TYPES = {
+    BulkRecordTypeEnum.VOC_SUBCLASS,
+    BulkRecordTypeEnum.VOC,
+}
+
+# record types shown on the site map tiles
+SITE_RECORD_TYPES = {
+    BulkRecordTypeEnum.SITE,
+    BulkRecordTypeEnum.DATASET,
+}
+
+
+class BulkIngestReport:
+    """
+    Outcome of a bulk ingestion.
+
+    :param written: Number of written records per record type.
+    :type written: dict[str, int]
+    :param errors: One entry per rejected record, holding its index
+        in the upload, its type and the reason it was rejected.
+    :type errors: list[dict]
+    """
+
+    def __init__(self):
+        self.written = {record_type.value: 0 for record_type in BULK_MODELS}
+        self.errors = []
+
+    def add_error(self, index: int, record_type, detail) -> None:
+        self.errors.append(
+            {"index": index, "type": record_type, "detail": detail}
+        )
+
+    def to_dict(self) -> dict:
+        return {"written": self.written, "errors": self.errors}
+
+
+def parse_bulk_body(body: bytes, content_type: str) -> list:
+    """
+    Parse an upload given as JSON array or as NDJSON.
+
+    :param body: The raw request body.
+    :type body: bytes
+    :param content_type: The content type of the request.
+    :type content_type: str
+    :return: The uploaded records, one entry per array item or line.
+        Lines that are not valid JSON are returned as
+        :class:`json.JSONDecodeError`, to be reported per record.
+    :rtype: list
+    :raise ValueError: body is neither a JSON array nor NDJSON
+    """
+
+    if "ndjson" in content_type:
+        records = []
+        for line in body.decode().splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as error:
+                records.append(error)
+        return records
+
+    records = json.loads(body)
+    if not isinstance(records, list):
+        raise ValueError("Expected a JSON array of records")
+    return records
+
+
+def bulk_ingest(session: Session, records: list) -> BulkIngestReport:
+    """
+    Validate and upsert records of all types within one transaction.
+
+    Every record is an object ``{"type": <BulkRecordTypeEnum>, "data":
+    {...}}``, where data holds the fields of the respective model. Records
+    with an ``id`` replace an existing row with that id, records without
+    one are inserted as new rows. Link records reference other records by
+    id and replace an existing link between the same objects.
+
+    Records are written per type in dependency order with batched multi-row
+    inserts. If a batch fails, its records are retried one by one so that
+    only the offending records are rejected. The transaction is committed
+    once all records were processed.
+
+    :param session: The database session.
+    :type session: Session
+    :param records: The uploaded records, as returned by
+        :func:`parse_bulk_body`.
+    :type records: list
+    :return: The number of written records and the per record errors.
+    :rtype: BulkIngestReport
+    """
+
+    report = BulkIngestReport()
+    rows_by_type = {record_type: [] for record_type in BULK_MODELS}
+
+    for index, record in enumerate(records):
+        if isinstance(record, json.JSONDecodeError):
+            report.add_error(index, None, f"Invalid JSON: {record.msg}")
+            continue
+        if not isinstance(record, dict):
+            report.add_error(index, None, "Record must be an object")
+            continue
+        try:
+            record_type = BulkRecordTypeEnum(record.get("type"))
+        except ValueError:
+            report.add_error(index, record.get("type"), "Unknown record type")
+            continue
+
+        model = BULK_MODELS[record_type]
+        try:
+            instance = model.model_validate(record.get("data") or {})
+        except ValidationError as error:
+            report.add_error(
+                index,
+                record_type,
+                error.errors(include_url=False, include_context=False),
+            )
+            continue
+
+        row = model_to_row(instance)
+        missing_keys = [
+            column.name
+            for column in model.__table__.primary_key
+            if column.name != "id" and row[column.name] is None
+        ]
+        if missing_keys:
+            report.add_error(
+                index, record_type, f"Missing fields: {', '.join(missing_keys)}"
+            )
+            continue
+
+        rows_by_type[record_type].append((index, row))
+
+    for record_type, rows in rows_by_type.items():
+        if rows:
+            write_rows(session, record_type, rows, report)
+
+    if any(rows_by_type[record_type] for record_type in TAXONOMY_RECORD_TYPES):
+        bump_version(session.connection(), TAXONOMY_VERSION)
+    if any(rows_by_type[record_type] for record_type in SITE_RECORD_TYPES):
+        bump_version(session.connection(), SITE_TILES_VERSION)
+
+    session.commit()
+    return report
+
+
+def model_to_row(instance: SQLModel) -> dict:
+    """
+    Convert a model instance into a row for a core insert.
+
+    Core inserts bypass the model hooks, so geometries are converted here.
+
+    :param instance: The model instance.
+    :type instance: SQLModel
+    :return: The column values of the instance.
+    :rtype: dict
+    """
+
+    row = {}
+    for column in instance.__table__.columns:
+        value = getattr(instance, column.name)
+        if isinstance(column.type, Geometry):
+            value = geojson_to_geometry(value)
+        row[column.name] = value
+    return row
+
+
+def write_rows(
+    session: Session,
+    record_type: BulkRecordTypeEnum,
+    rows: list[tuple[int, dict]],
+    report: BulkIngestReport,
+) -> None:
+    """
+    Upsert the rows of one record type in batches.
+
+    :param session: The database session.
+    :type session: Session
+    :param record_type: The type of the records.
+    :type record_type: BulkRecordTypeEnum
+    :param rows: The rows to write with the index of their record.
+    :type rows: list[tuple[int, dict]]
+    :param report: The report to add written records and errors to.
+    :type report: BulkIngestReport
+    """
+
+    model = BULK_MODELS[record_type]
+    written_ids = []
+
+    for start in range(0, len(rows), BULK_BATCH_SIZE):
+        end = start + BULK_BATCH_SIZE
+        batch = rows[start:end]
+        try:
+            with session.begin_nested():
+                written_ids += upsert_rows(
+                    session, model, [row for _, row in batch]
+                )
+            report.written[record_type.value] += len(batch)
+        except DBAPIError:
+            # retry the failed batch one by one to find the offending rows
+            for index, row in batch:
+                try:
+                    with session.begin_nested():
+                        written_ids += upsert_rows(session, model, [row])
+                    report.written[record_type.value] += 1
+                except DBAPIError as error:
+                    report.add_error(
+                        index, record_type, str(error.orig).strip()
+                    )
+
+    if record_type == BulkRecordTypeEnum.VOC_SUBCLASS and written_ids:
+        refresh_voc_subclass_closure(session.connection(), written_ids)
+
+
+def upsert_rows(
+    session: Session, model: type[SQLModel], rows: list[dict]
+) -> list[int]:
+    """
+    Upsert rows of a model with multi-row inserts.
+
+    :param session: The database session.
+    :type session: Session
+    :param model: The model of the rows.
+    :type model: type[SQLModel]
+    :param rows: The rows to write.
+    :type rows: list[dict]
+    :return: The ids of the written rows, empty for link tables.
+    :rtype: list[int]
+    """
+
+    table = model.__table__
+
+    if "id" not in table.columns:
+        # link tables: replace the attributes of an existing link
+        statement = insert(table).values(rows)
+        key_columns = [column.name for column in table.primary_key]
+        other_columns = [
+            column.name
+            for column in table.columns
+            if column.name not in key_columns
+        ]
+        if other_columns:
+            statement = statement.on_conflict_do_update(
+                index_elements=key_columns,
+                set_={name: statement.excluded[name] for name in other_columns},
+            )
+        else:
+            statement = statement.on_conflict_do_nothing()
+        session.execute(statement)
+        return []
+
+    written_ids = []
+
+    rows_with_id = [row for row in rows if row["id"] is not None]
+    if rows_with_id:
+        statement = insert(table).values(rows_with_id)
+        statement = statement.on_conflict_do_update(
+            index_elements=["id"],
+            set_={
+                column.name: statement.excluded[column.name]
+                for column in table.columns
+                if column.name != "id"
+            },
+        ).returning(table.c.id)
+        written_ids += session.execute(statement).scalars().all()
+
+        # explicit ids do not advance the id sequence, move it past them
+        session.execute(
+            select(
+                func.setval(
+                    func.pg_get_serial_sequence(table.name, "id"),
+                    select(func.max(table.c.id) + 1).scalar_subquery(),
+                    False,
+                )
+            )
+        )
+
+    rows_without_id = [
+        {name: value for name, value in row.items() if name != "id"}
+        for row in rows
+        if row["id"] is None
+    ]
+    if rows_without_id:
+        statement = insert(table).values(rows_without_id).returning(table.c.id)
+        written_ids += session.execute(statement).scalars().all()
+
+    return written_ids
@@ -0,0 +1,465 @@
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from itertools import chain
+from typing import Iterable
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from backend.app.models.associations import (
+    DatasetContactLink,
+    DatasetPublicationLink,
+    DatasetVocLink,
+    DatasetVocSubclassLink,
+)
+from backend.app.models.contact import Contact
+from backend.app.models.dataset import Dataset
+from backend.app.models.publication import Publication
+from backend.app.models.site import Site
+from backend.app.models.voc import Voc
+from backend.app.models.voc_subclass import VocSubclass
+from backend.app.models.voc_subclass_closure import VocSubclassClosure
+from backend.app.models.voc_synonym import VocSynonym
+from backend.app.utils.coverage_utils import COVERAGE_VIEWS
+from backend.settings import Settings
+
+RESPONSE_CACHE_SIZE = 4096
+CACHEABLE_MEDIA_TYPE = "application/json"
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+TAXONOMY_TABLES = frozenset(
+    model.__tablename__ for model in (Voc, VocSubclass, VocSubclassClosure)
+)
+CATALOGUE_TABLES = TAXONOMY_TABLES | frozenset(
+    model.__tablename__
+    for model in (
+        Dataset,
+        Site,
+        Contact,
+        Publication,
+        DatasetVocLink,
+        DatasetVocSubclassLink,
+        DatasetContactLink,
+        DatasetPublicationLink,
+    )
+)
+
+# tables the responses below each path prefix are read from, responses are
+#   invalidated whenever one of them is written. Paths without prefix here
+#   are not cached
+CACHE_DEPENDENCIES: dict[str, frozenset[str]] = {
+    "/datasets": CATALOGUE_TABLES,
+    "/sites": CATALOGUE_TABLES,
+    "/vocs": TAXONOMY_TABLES,
+    "/voc-subclasses": TAXONOMY_TABLES,
+    "/contacts": frozenset(
+        model.__tablename__ for model in (Contact, Dataset, DatasetContactLink)
+    ),
+    "/publications": frozenset(
+        model.__tablename__
+        for model in (Publication, Dataset, DatasetPublicationLink)
+    ),
+    "/coverage": CATALOGUE_TABLES | frozenset(COVERAGE_VIEWS),
+    "/search": frozenset(
+        model.__tablename__
+        for model in (Voc, VocSynonym, VocSubclass, Site, Contact)
+    ),
+}
+
+# tables written by the current request, collected on commit
+_written_tables: ContextVar[set[str] | None] = ContextVar(
+    "written_tables", default=None
+)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """
+    A response body stored in the response cache.
+
+    :param etag: The entity tag of the body.
+    :type etag: str
+    :param media_type: The media type of the body.
+    :type media_type: str
+    :param body: The serialised body.
+    :type body: bytes
+    """
+
+    etag: str
+    media_type: str
+    body: bytes
+
+
+class CacheBackend(ABC):
+    """
+    Storage of cached responses and per-table version counters.
+
+    Cache keys contain the versions of all tables a response is read from,
+    so bumping the version of a table invalidates all responses read from
+    it. Outdated entries are never looked up again and expire on their own.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> CachedResponse | None:
+        """
+        Get a cached response.
+
+        :param key: The cache key.
+        :type key: str
+        :return: The response, or None if it is not cached.
+        :rtype: CachedResponse | None
+        """
+
+    @abstractmethod
+    async def put(self, key: str, response: CachedResponse) -> None:
+        """
+        Cache a response.
+
+        :param key: The cache key.
+        :type key: str
+        :param response: The response to cache.
+        :type response: CachedResponse
+        """
+
+    @abstractmethod
+    async def get_versions(self, tables: list[str]) -> list[int]:
+        """
+        Get the current versions of tables.
+
+        :param tables: The names of the tables.
+        :type tables: list[str]
+        :return: The version of every table, in the same order.
+        :rtype: list[int]
+        """
+
+    @abstractmethod
+    async def bump_versions(self, tables: set[str]) -> None:
+        """
+        Increment the versions of tables, invalidating their responses.
+
+        :param tables: The names of the written tables.
+        :type tables: set[str]
+        """
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Per-process LRU cache with expiring entries.
+
+    Writes only invalidate the cache of the process handling them, other
+    worker processes serve their entries until they expire. Use the Redis
+    backend to share the cache between workers.
+
+    :param max_size: The maximum number of cached responses.
+    :type max_size: int
+    :param ttl: Seconds after which cached responses expire.
+    :type ttl: float
+    """
+
+    def __init__(self, max_size: int = RESPONSE_CACHE_SIZE, ttl: float = 60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, CachedResponse]] = (
+            OrderedDict()
+        )
+        self._versions: dict[str, int] = {}
+
+    async def get(self, key: str) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    async def put(self, key: str, response: CachedResponse) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get_versions(self, tables: list[str]) -> list[int]:
+        return [self._versions.get(table, 0) for table in tables]
+
+    async def bump_versions(self, tables: set[str]) -> None:
+        for table in tables:
+            self._versions[table] = self._versions.get(table, 0) + 1
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache shared by all worker processes through Redis.
+
+    Works with every server speaking the Redis protocol. Entries expire
+    through Redis, whose eviction policy bounds the memory they take.
+
+    :param url: The URL of the Redis server.
+    :type url: str
+    :param ttl: Seconds after which cached responses expire.
+    :type ttl: int
+    :param prefix: Prefix of all keys written by the cache.
+    :type prefix: str
+    """
+
+    def __init__(self, url: str, ttl: int = 60, prefix: str = "vocdata:"):
+        # only needed with this backend, import it on demand
+        from redis import asyncio as redis
+
+        self.client = redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def get(self, key: str) -> CachedResponse | None:
+        value = await self.client.get(f"{self.prefix}response:{key}")
+        if value is None:
+            return None
+        etag, media_type, body = value.split(b"\n", 2)
+        return CachedResponse(etag.decode(), media_type.decode(), body)
+
+    async def put(self, key: str, response: CachedResponse) -> None:
+        value = b"\n".join(
+            (
+                response.etag.encode(),
+                response.media_type.encode(),
+                response.body,
+            )
+        )
+        await self.client.set(
+            f"{self.prefix}response:{key}", value, ex=self.ttl
+        )
+
+    async def get_versions(self, tables: list[str]) -> list[int]:
+        versions = await self.client.mget(
+            [f"{self.prefix}version:{table}" for table in tables]
+        )
+        return [int(version or 0) for version in versions]
+
+    async def bump_versions(self, tables: set[str]) -> None:
+        async with self.client.pipeline(transaction=False) as pipeline:
+            for table in tables:
+                pipeline.incr(f"{self.prefix}version:{table}")
+            await pipeline.execute()
+
+
+def create_cache_backend(settings: Settings) -> CacheBackend | None:
+    """
+    Create the response cache backend configured in the settings.
+
+    :param settings: The runtime settings.
+    :type settings: Settings
+    :return: The backend, or None if response caching is disabled.
+    :rtype: CacheBackend | None
+    :raise ValueError: unknown backend configured
+    """
+
+    if settings.response_cache == "none":
+        return None
+    if settings.response_cache == "memory":
+        return MemoryCacheBackend(ttl=settings.response_cache_ttl)
+    if settings.response_cache == "redis":
+        return RedisCacheBackend(
+            settings.redis_url, ttl=settings.response_cache_ttl
+        )
+    raise ValueError(f"Unknown response cache: {settings.response_cache}")
+
+
+def get_cache_dependencies(path: str) -> frozenset[str] | None:
+    """
+    Get the tables the responses of a path are read from.
+
+    :param path: The request path.
+    :type path: str
+    :return: The table names, or None if the path is not cached.
+    :rtype: frozenset[str] | None
+    """
+
+    prefix = "/" + path.split("/", 2)[1]
+    return CACHE_DEPENDENCIES.get(prefix)
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Build the entity tag of a response body.
+
+    :param body: The serialised body.
+    :type body: bytes
+    :return: The quoted, strong entity tag.
+    :rtype: str
+    """
+
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(etag: str, if_none_match: str | None) -> bool:
+    """
+    Check an entity tag against an ``If-None-Match`` header.
+
+    :param etag: The entity tag of the current response.
+    :type etag: str
+    :param if_none_match: The header value, a list of entity tags or ``*``.
+    :type if_none_match: str | None
+    :return: True if the client already holds the current response.
+    :rtype: bool
+    """
+
+    if if_none_match is None:
+        return False
+    candidates = {
+        candidate.strip().removeprefix("W/")
+        for candidate in if_none_match.split(",")
+    }
+    return "*" in candidates or etag in candidates
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """
+    Cache JSON responses of GET requests and answer conditional requests.
+
+    Responses are cached by path and query parameters. Every cached
+    response carries an ETag, requests whose ``If-None-Match`` header
+    holds it are answered with 304 and an empty body. Write requests
+    invalidate the responses read from the tables they wrote to.
+
+    :param app: The wrapped application.
+    :type app: ASGIApp
+    :param backend: The cache backend.
+    :type backend: CacheBackend
+    """
+
+    def __init__(self, app, backend: CacheBackend):
+        super().__init__(app)
+        self.backend = backend
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        if request.method in WRITE_METHODS:
+            return await self._dispatch_write(request, call_next)
+
+        tables = get_cache_dependencies(request.url.path)
+        if request.method != "GET" or tables is None:
+            return await call_next(request)
+
+        # read the versions before the response, a write in between then
+        #   leaves the entry behind under outdated versions
+        tables = sorted(tables)
+        versions = await self.backend.get_versions(tables)
+        key = hashlib.blake2b(
+            repr(
+                (
+                    request.url.path,
+                    sorted(request.query_params.multi_items()),
+                    versions,
+                )
+            ).encode(),
+            digest_size=16,
+        ).hexdigest()
+        if_none_match = request.headers.get("if-none-match")
+
+        if "no-cache" not in request.headers.get("cache-control", ""):
+            cached = await self.backend.get(key)
+            if cached is not None:
+                return self._respond(cached, if_none_match, "HIT")
+
+        response = await call_next(request)
+        if (
+            response.status_code != 200
+            or response.headers.get("content-type") != CACHEABLE_MEDIA_TYPE
+        ):
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        cached = CachedResponse(make_etag(body), CACHEABLE_MEDIA_TYPE, body)
+        await self.backend.put(key, cached)
+        return self._respond(cached, if_none_match, "MISS")
+
+    async def _dispatch_write(self, request: Request, call_next) -> Response:
+        written_tables = set()
+        token = _written_tables.set(written_tables)
+        try:
+            response = await call_next(request)
+        finally:
+            _written_tables.reset(token)
+
+        # invalidate before responding, so the client reads its own writes
+        if written_tables:
+            await self.backend.bump_versions(written_tables)
+        return response
+
+    @staticmethod
+    def _respond(
+        cached: CachedResponse, if_none_match: str | None, cache_status: str
+    ) -> Response:
+        # clients may keep the response, but have to revalidate it
+        headers = {
+            "ETag": cached.etag,
+            "Cache-Control": "no-cache",
+            "X-Cache": cache_status,
+        }
+        if etag_matches(cached.etag, if_none_match):
+            return Response(status_code=304, headers=headers)
+        return Response(
+            content=cached.body, media_type=cached.media_type, headers=headers
+        )
+
+
+def mark_tables_written(session: Session, tables: Iterable[str]) -> None:
+    """
+    Invalidate the responses read from tables once the session commits.
+
+    Writes through the session are detected automatically, use this after
+    writing through its connection, e.g. refreshing materialized views.
+
+    :param session: The session writing the changes.
+    :type session: Session
+    :param tables: The names of the written tables or views.
+    :type tables: Iterable[str]
+    """
+
+    session.info.setdefault("written_tables", set()).update(tables)
+
+
+def cache_after_flush(session, flush_context):
+    mark_tables_written(
+        session,
+        (
+            instance.__table__.name
+            for instance in chain(session.new, session.dirty, session.deleted)
+        ),
+    )
+
+
+def cache_do_orm_execute(orm_execute_state):
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        mark_tables_written(
+            orm_execute_state.session,
+            [orm_execute_state.statement.table.name],
+        )
+
+
+def cache_after_commit(session):
+    tables = session.info.pop("written_tables", None)
+    request_tables = _written_tables.get()
+    if tables and request_tables is not None:
+        request_tables.update(tables)
+
+
+def cache_after_rollback(session):
+    session.info.pop("written_tables", None)
+
+
+event.listen(Session, "after_flush", cache_after_flush)
+event.listen(Session, "do_orm_execute", cache_do_orm_execute)
+event.listen(Session, "after_commit", cache_after_commit)
+event.listen(Session, "after_rollback", cache_after_rollback)
@@ -0,0 +1,220 @@
+from sqlalchemy import (
+    Connection,
+    Integer,
+    Select,
+    cast,
+    column,
+    distinct,
+    extract,
+    func,
+    select,
+    table,
+    text,
+    true,
+    union,
+)
+from sqlmodel import col
+
+from backend.app.models.associations import (  # noqa: E501
+    DatasetVocLink,
+    DatasetVocSubclassLink,
+)
+from backend.app.models.dataset import Dataset
+from backend.app.models.site import Site
+from backend.app.models.voc import Voc
+from backend.app.models.voc_subclass import VocSubclass
+from backend.app.models.voc_subclass_closure import VocSubclassClosure
+
+# edge length of the grid cells in degrees if none is requested,
+#   the grid coverage is materialized with this size only
+DEFAULT_GRID_CELL_SIZE = 1.0
+
+
+def get_coverage_by_country_query() -> Select:
+    """
+    Build a query counting the sites and datasets per country.
+
+    :return: A select statement yielding ``country``, ``site_count`` and
+        ``dataset_count``, ordered by country.
+    :rtype: sqlalchemy.Select
+    """
+
+    return (
+        select(
+            col(Site.country).label("country"),
+            func.count(distinct(Site.id)).label("site_count"),
+            func.count(Dataset.id).label("dataset_count"),
+        )
+        .select_from(Site)
+        .outerjoin(Dataset, col(Dataset.site_id) == Site.id)
+        .group_by(Site.country)
+        .order_by(Site.country)
+    )
+
+
+def get_coverage_by_grid_query(cell_size: float) -> Select:
+    """
+    Build a query counting the sites and datasets per grid cell.
+
+    Site locations are snapped to a regular grid in degrees, every cell is
+    centred at the returned longitude and latitude.
+
+    :param cell_size: The edge length of the grid cells in degrees.
+    :type cell_size: float
+    :return: A select statement yielding ``lon``, ``lat``, ``site_count``
+        and ``dataset_count``, for cells holding at least one site.
+    :rtype: sqlalchemy.Select
+    """
+
+    # snap in a subquery, so the cell is grouped by a single expression
+    sites = (
+        select(
+            func.ST_SnapToGrid(Site.geo_location, cell_size).label("cell"),
+            col(Site.id).label("site_id"),
+            col(Dataset.id).label("dataset_id"),
+        )
+        .select_from(Site)
+        .outerjoin(Dataset, col(Dataset.site_id) == Site.id)
+        .where(col(Site.geo_location).is_not(None))
+        .subquery()
+    )
+
+    return (
+        select(
+            func.ST_X(sites.c.cell).label("lon"),
+            func.ST_Y(sites.c.cell).label("lat"),
+            func.count(distinct(sites.c.site_id)).label("site_count"),
+            func.count(sites.c.dataset_id).label("dataset_count"),
+        )
+        .group_by(sites.c.cell)
+        .order_by("lon", "lat")
+    )
+
+
+def get_coverage_by_voc_subclass_query() -> Select:
+    """
+    Build a query counting the datasets per VOC subclass.
+
+    Datasets belong to a subclass if they are linked to it directly or
+    through one of their VOCs. Counts are rolled up through the hierarchy,
+    so every subclass also counts the datasets of all its descendants.
+
+    :return: A select statement yielding ``voc_subclass_id``, ``name``,
+        ``direct_dataset_count`` and ``dataset_count``, ordered by ID.
+    :rtype: sqlalchemy.Select
+    """
+
+    dataset_voc_subclasses = union(
+        select(
+            DatasetVocSubclassLink.dataset_id,
+            DatasetVocSubclassLink.voc_subclass_id,
+        ),
+        select(DatasetVocLink.dataset_id, Voc.voc_subclass_id).join(
+            Voc, col(Voc.id) == DatasetVocLink.voc_id
+        ),
+    ).subquery()
+
+    dataset_id = dataset_voc_subclasses.c.dataset_id
+    return (
+        select(
+            col(VocSubclass.id).label("voc_subclass_id"),
+            col(VocSubclass.name).label("name"),
+            func.count(distinct(dataset_id))
+            .filter(VocSubclassClosure.depth == 0)
+            .label("direct_dataset_count"),
+            func.count(distinct(dataset_id)).label("dataset_count"),
+        )
+        .select_from(VocSubclass)
+        .join(
+            VocSubclassClosure,
+            col(VocSubclassClosure.ancestor_id) == VocSubclass.id,
+        )
+        .outerjoin(
+            dataset_voc_subclasses,
+            dataset_voc_subclasses.c.voc_subclass_id
+            == VocSubclassClosure.descendant_id,
+        )
+        .group_by(VocSubclass.id, VocSubclass.name)
+        .order_by(VocSubclass.id)
+    )
+
+
+def get_coverage_by_year_query() -> Select:
+    """
+    Build a query counting the datasets per sampling year.
+
+    A dataset counts for every year its sampling period overlaps. Datasets
+    without a sampling period end count for their first year only,
+    datasets without a sampling period are left out.
+
+    :return: A select statement yielding ``year`` and ``dataset_count``,
+        ordered by year.
+    :rtype: sqlalchemy.Select
+    """
+
+    begin_year = cast(extract("year", Dataset.sampling_period_begin), Integer)
+    end_year = cast(extract("year", Dataset.sampling_period_end), Integer)
+    years = (
+        func.generate_series(begin_year, func.coalesce(end_year, begin_year))
+        .table_valued("year")
+        .render_derived()
+    )
+
+    return (
+        select(years.c.year, func.count().label("dataset_count"))
+        .select_from(Dataset)
+        .join(years, true())
+        .where(col(Dataset.sampling_period_begin).is_not(None))
+        .group_by(years.c.year)
+        .order_by(years.c.year)
+    )
+
+
+# materialized views of the coverage queries, with the columns identifying
+#   a row, which are required to refresh them concurrently
+COVERAGE_VIEWS = {
+    "coverage_by_country": (get_coverage_by_country_query, ("country",)),
+    "coverage_by_grid": (
+        lambda: get_coverage_by_grid_query(DEFAULT_GRID_CELL_SIZE),
+        ("lon", "lat"),
+    ),
+    "coverage_by_voc_subclass": (
+        get_coverage_by_voc_subclass_query,
+        ("voc_subclass_id",),
+    ),
+    "coverage_by_year": (get_coverage_by_year_query, ("year",)),
+}
+
+
+def get_coverage_view(name: str) -> Select:
+    """
+    Build a query reading a coverage materialized view.
+
+    :param name: The name of the view, a key of :data:`COVERAGE_VIEWS`.
+    :type name: str
+    :return: A select statement yielding the same columns as the query
+        the view was created from.
+    :rtype: sqlalchemy.Select
+    """
+
+    build_query, key_columns = COVERAGE_VIEWS[name]
+    view = table(
+        name, *(column(name) for name in build_query().selected_columns.keys())
+    )
+    return select(view).order_by(*(view.c[name] for name in key_columns))
+
+
+def refresh_coverage_views(connection: Connection) -> None:
+    """
+    Recompute the coverage materialized views.
+
+    Views are refreshed concurrently, so they stay readable meanwhile.
+
+    :param connection: The connection to execute the statements on.
+    :type connection: sqlalchemy.Connection
+    """
+
+    for name in COVERAGE_VIEWS:
+        connection.execute(
+            text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {name}")
+        )
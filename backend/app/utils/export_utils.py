@@ -0,0 +1,183 @@
+import csv
+import io
+import json
+from typing import AsyncIterator
+
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.enums.export_format_enum import ExportFormatEnum
+from backend.app.models.dataset import Dataset
+
+# number of datasets fetched from the server side cursor at once,
+# relationships are loaded with one query per batch
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormatEnum.NDJSON: "application/x-ndjson",
+    ExportFormatEnum.CSV: "text/csv",
+}
+
+CSV_COLUMNS = [
+    "id",
+    "sampling_period_begin",
+    "sampling_period_end",
+    "time_resolution_unit",
+    "time_resolution_interval",
+    "data_type",
+    "link_to_dataset",
+    "site_id",
+    "site_name",
+    "site_region",
+    "site_country",
+    "site_typology",
+    "site_longitude",
+    "site_latitude",
+    "voc_ids",
+    "voc_names",
+    "voc_subclass_ids",
+    "voc_subclass_names",
+    "contact_names",
+    "contact_emails",
+    "publication_links",
+]
+
+# separator for multiple values within a single CSV cell
+CSV_LIST_SEPARATOR = ";"
+
+
+def dataset_to_export_record(dataset: Dataset) -> dict:
+    """
+    Convert a dataset and its related objects into a nested export record.
+
+    :param dataset: The dataset with its relationships loaded.
+    :type dataset: Dataset
+    :return: The dataset columns with its site, VOCs, VOC subclasses,
+        contacts and publications embedded.
+    :rtype: dict
+    """
+
+    site = dataset.site
+    return {
+        **dataset.model_dump(mode="json"),
+        "site": site.model_dump(mode="json") if site else None,
+        "vocs": [voc.model_dump(mode="json") for voc in dataset.vocs],
+        "voc_subclasses": [
+            voc_subclass.model_dump(mode="json")
+            for voc_subclass in dataset.voc_subclasses
+        ],
+        "contacts": [
+            contact.model_dump(mode="json") for contact in dataset.contacts
+        ],
+        "publications": [
+            publication.model_dump(mode="json")
+            for publication in dataset.publications
+        ],
+    }
+
+
+def flatten_export_record(record: dict) -> dict:
+    """
+    Flatten a nested export record into a single CSV row.
+
+    :param record: The record created by :func:`dataset_to_export_record`.
+    :type record: dict
+    :return: The record with one value per column of ``CSV_COLUMNS``.
+    :rtype: dict
+    """
+
+    def join(items: list, key: str) -> str:
+        return CSV_LIST_SEPARATOR.join(
+            str(item[key]) for item in items if item[key] is not None
+        )
+
+    site = record["site"] or {}
+    coordinates = (site.get("geo_location") or {}).get("coordinates")
+
+    return {
+        **{column: record[column] for column in CSV_COLUMNS[:7]},
+        "site_id": site.get("id"),
+        "site_name": site.get("name"),
+        "site_region": site.get("region"),
+        "site_country": site.get("country"),
+        "site_typology": site.get("typology"),
+        "site_longitude": coordinates[0] if coordinates else None,
+        "site_latitude": coordinates[1] if coordinates else None,
+        "voc_ids": join(record["vocs"], "id"),
+        "voc_names": join(record["vocs"], "name"),
+        "voc_subclass_ids": join(record["voc_subclasses"], "id"),
+        "voc_subclass_names": join(record["voc_subclasses"], "name"),
+        "contact_names": join(record["contacts"], "name"),
+        "contact_emails": join(record["contacts"], "email"),
+        "publication_links": join(record["publications"], "link"),
+    }
+
+
+async def iter_export_records(
+    session: AsyncSession,
+) -> AsyncIterator[list[dict]]:
+    """
+    Stream all datasets as export records, one batch at a time.
+
+    Datasets are read through a server side cursor, so only a single batch
+    is held in memory. The relationships of every batch are loaded with one
+    query per relationship.
+
+    :param session: The database session.
+    :type session: AsyncSession
+    :return: Batches of export records, ordered by dataset ID.
+    :rtype: AsyncIterator[list[dict]]
+    """
+
+    statement = (
+        select(Dataset)
+        .options(
+            selectinload(Dataset.site),
+            selectinload(Dataset.vocs),
+            selectinload(Dataset.voc_subclasses),
+            selectinload(Dataset.contacts),
+            selectinload(Dataset.publications),
+        )
+        .order_by(Dataset.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+    result = await session.stream_scalars(statement)
+    async for datasets in result.partitions():
+        yield [dataset_to_export_record(dataset) for dataset in datasets]
+        # drop the exported batch from the identity map
+        session.expunge_all()
+
+
+async def generate_export(
+    session: AsyncSession, export_format: ExportFormatEnum
+) -> AsyncIterator[str]:
+    """
+    Render all datasets in the given format, one chunk per batch.
+
+    :param session: The database session, closed once the export finished.
+    :type session: AsyncSession
+    :param export_format: The format to render the datasets in.
+    :type export_format: ExportFormatEnum
+    :return: Chunks of the rendered export.
+    :rtype: AsyncIterator[str]
+    """
+
+    async with session:
+        if export_format == ExportFormatEnum.CSV:
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS)
+            writer.writeheader()
+            async for records in iter_export_records(session):
+                writer.writerows(
+                    flatten_export_record(record) for record in records
+                )
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            # header only export of an empty catalogue
+            yield buffer.getvalue()
+        else:
+            async for records in iter_export_records(session):
+                yield "".join(json.dumps(record) + "\n" for record in records)
@@ -1,8 +1,13 @@
-from geoalchemy2 import WKBElement, WKTElement
-from geoalchemy2.shape import to_shape
+import struct
+
+import shapely
+from geoalchemy2 import Geography, WKBElement, WKTElement
 from geojson_pydantic import Point
-from shapely import wkt
-from shapely.geometry import shape
+from sqlalchemy import ColumnElement, and_, cast, func
+
+WKB_POINT_TYPE = 1
+# flag of the geometry type in PostGIS extended WKB if an SRID follows
+EWKB_SRID_FLAG = 0x20000000
 
 
 def geojson_to_geometry(geo_location: Point | None) -> WKTElement | None:
@@ -12,15 +17,24 @@ def geojson_to_geometry(geo_location: Point | None) -> WKTElement | None:
     WKTElement objects, to store them in the database.
     Use before writing data from api into postgis db.
 
-    :param geo_location: Single GeoJSON object or list of GeoJSON objects.
+    The WKT is formatted from the coordinates directly, without building
+    an intermediate shapely geometry.
+
+    :param geo_location: A GeoJSON Point, as object or dict.
     :type geo_location: Point
-    :return: PostGIS Geometry (WKTElement) or list of WKTElement objects.
+    :return: PostGIS Geometry as WKT.
     :rtype: WKTElement
     """
-    if geo_location is not None:
-        return wkt.dumps(shape(geo_location))
+    if geo_location is None:
+        return None
 
-    return None
+    coordinates = (
+        geo_location["coordinates"]
+        if isinstance(geo_location, dict)
+        else geo_location.coordinates
+    )
+    # repr keeps the shortest text that round trips to the same float
+    return f"POINT({' '.join(repr(float(value)) for value in coordinates)})"
 
 
 def geometry_to_geojson(geometry: WKBElement | None) -> Point | None:
@@ -30,14 +44,175 @@ def geometry_to_geojson(geometry: WKBElement | None) -> Point | None:
     pydantic GEOJson Objects, to read them from the database.
     Use after retrieving data from db to return to api.
 
+    Two dimensional points, which is how site locations are stored, are
+    decoded from the WKB directly. Other geometries are parsed by shapely.
+
     :param geometry: A PostGIS Geometry (WKBElement) object.
     :type geometry: WKBElement
     :return: if location is given: A GeoJSON Point object. Else None.
     :rtype: Point
     """
 
-    if geometry is not None:
-        geom_shape = to_shape(geometry)
-        return Point(**geom_shape.__geo_interface__)
+    if geometry is None:
+        return None
+
+    wkb = _get_wkb(geometry)
+    coordinates = _decode_wkb_point(wkb)
+    if coordinates is None:
+        shape = shapely.from_wkb(wkb)
+        coordinates = shapely.get_coordinates(
+            shape, include_z=shapely.has_z(shape)
+        )[0].tolist()
+    return Point(type="Point", coordinates=coordinates)
+
+
+def _get_wkb(geometry: WKBElement) -> bytes:
+    data = geometry.data
+    if isinstance(data, str):
+        return bytes.fromhex(data)
+    return bytes(data)
+
+
+def _decode_wkb_point(wkb: bytes) -> tuple[float, float] | None:
+    # byte order, geometry type and the optional SRID precede the values
+    byte_order = "<" if wkb[0] == 1 else ">"
+    (geometry_type,) = struct.unpack_from(f"{byte_order}I", wkb, 1)
+    offset = 5
+    if geometry_type & EWKB_SRID_FLAG:
+        geometry_type &= ~EWKB_SRID_FLAG
+        offset += 4
+    if geometry_type != WKB_POINT_TYPE or len(wkb) != offset + 16:
+        return None
+    return struct.unpack_from(f"{byte_order}2d", wkb, offset)
+
+
+def within_bounding_box(
+    geometry_column,
+    min_lon: float,
+    min_lat: float,
+    max_lon: float,
+    max_lat: float,
+) -> ColumnElement[bool]:
+    """
+    Build a filter for geometries intersecting a bounding box.
+
+    The box is built with ``ST_MakeEnvelope`` and compared with the ``&&``
+    operator first, which the planner answers from a GiST index on the
+    column. ``ST_Intersects`` then checks the exact geometries.
+
+    :param geometry_column: The geometry column to filter on.
+    :type geometry_column: Column
+    :param min_lon: Minimum longitude of the bounding box.
+    :type min_lon: float
+    :param min_lat: Minimum latitude of the bounding box.
+    :type min_lat: float
+    :param max_lon: Maximum longitude of the bounding box.
+    :type max_lon: float
+    :param max_lat: Maximum latitude of the bounding box.
+    :type max_lat: float
+    :return: The filter clause.
+    :rtype: ColumnElement[bool]
+    """
+
+    envelope = func.ST_MakeEnvelope(min_lon, min_lat, max_lon, max_lat, 4326)
+    return and_(
+        geometry_column.op("&&")(envelope),
+        func.ST_Intersects(geometry_column, envelope),
+    )
+
+
+def as_geography(geometry) -> ColumnElement:
+    """
+    Cast a geometry in WGS 84 to geography, to measure in meters.
+
+    Site locations are indexed with exactly this expression, so queries
+    built with it can use the index.
+
+    :param geometry: The geometry expression to cast.
+    :type geometry: ColumnElement
+    :return: The geography expression.
+    :rtype: ColumnElement
+    """
+
+    return cast(geometry, Geography(geometry_type=None, spatial_index=False))
+
+
+def make_point(lon: float, lat: float) -> ColumnElement:
+    """
+    Build a point geometry in WGS 84.
+
+    :param lon: Longitude of the point.
+    :type lon: float
+    :param lat: Latitude of the point.
+    :type lat: float
+    :return: The point expression.
+    :rtype: ColumnElement
+    """
+
+    return func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4326)
+
+
+def within_distance(
+    geometry_column, lon: float, lat: float, distance_m: float
+) -> ColumnElement[bool]:
+    """
+    Build a filter for geometries within a distance of a point.
+
+    :param geometry_column: The geometry column to filter on.
+    :type geometry_column: Column
+    :param lon: Longitude of the point.
+    :type lon: float
+    :param lat: Latitude of the point.
+    :type lat: float
+    :param distance_m: The maximum distance in meters.
+    :type distance_m: float
+    :return: The filter clause.
+    :rtype: ColumnElement[bool]
+    """
+
+    return func.ST_DWithin(
+        as_geography(geometry_column),
+        as_geography(make_point(lon, lat)),
+        distance_m,
+    )
+
+
+def distance_to(geometry_column, lon: float, lat: float) -> ColumnElement:
+    """
+    Build the distance in meters between geometries and a point.
+
+    :param geometry_column: The geometry column to measure from.
+    :type geometry_column: Column
+    :param lon: Longitude of the point.
+    :type lon: float
+    :param lat: Latitude of the point.
+    :type lat: float
+    :return: The distance expression.
+    :rtype: ColumnElement
+    """
+
+    return func.ST_Distance(
+        as_geography(geometry_column), as_geography(make_point(lon, lat))
+    )
+
+
+def nearest_first(geometry_column, lon: float, lat: float) -> ColumnElement:
+    """
+    Build an ordering by distance to a point, closest first.
+
+    Uses the KNN operator ``<->``, which the planner answers by walking
+    a GiST index on the geography of the column.
+
+    :param geometry_column: The geometry column to order by.
+    :type geometry_column: Column
+    :param lon: Longitude of the point.
+    :type lon: float
+    :param lat: Latitude of the point.
+    :type lat: float
+    :return: The expression to order by.
+    :rtype: ColumnElement
+    """
 
-    return None
+    return as_geography(geometry_column).op("<->")(
+        as_geography(make_point(lon, lat))
+    )
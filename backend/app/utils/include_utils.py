@@ -0,0 +1,92 @@
+from typing import Annotated
+
+from fastapi import HTTPException, Query
+from sqlalchemy.orm import joinedload, selectinload
+
+from backend.app.enums.dataset_include_enum import DatasetIncludeEnum
+from backend.app.models.dataset import Dataset
+from backend.app.models.dataset_read import DatasetRead
+
+# eager loading strategy per relationship: the many-to-one site is joined
+#   into the dataset query, every collection is loaded with one extra query
+DATASET_LOAD_OPTIONS = {
+    DatasetIncludeEnum.SITE: joinedload(Dataset.site),
+    DatasetIncludeEnum.VOCS: selectinload(Dataset.vocs),
+    DatasetIncludeEnum.VOC_SUBCLASSES: selectinload(Dataset.voc_subclasses),
+    DatasetIncludeEnum.CONTACTS: selectinload(Dataset.contacts),
+    DatasetIncludeEnum.PUBLICATIONS: selectinload(Dataset.publications),
+}
+
+
+class DatasetIncludeParams:
+    """
+    Query parameter selecting the related objects to embed in datasets.
+
+    Every requested relationship is loaded eagerly, so a list of datasets
+    is returned with a fixed number of queries regardless of its length.
+
+    :param include: Comma separated relationships to embed, any of
+        ``site``, ``vocs``, ``voc_subclasses``, ``contacts`` and
+        ``publications``. Omit it to return the datasets only.
+    :type include: str | None
+    """
+
+    def __init__(self, include: Annotated[str | None, Query()] = None):
+        self.relationships = parse_include(include)
+
+    @property
+    def load_options(self) -> list:
+        """
+        The loader options for the requested relationships.
+
+        :return: Options to pass to ``select(Dataset).options()``.
+        :rtype: list
+        """
+
+        return [
+            DATASET_LOAD_OPTIONS[relationship]
+            for relationship in self.relationships
+        ]
+
+    def to_read(self, dataset: Dataset) -> DatasetRead:
+        """
+        Convert a dataset into its response model.
+
+        :param dataset: The dataset, loaded with :attr:`load_options`.
+        :type dataset: Dataset
+        :return: The dataset with the requested relationships embedded.
+        :rtype: DatasetRead
+        """
+
+        return DatasetRead(
+            **dataset.model_dump(),
+            **{
+                relationship.value: getattr(dataset, relationship.value)
+                for relationship in self.relationships
+            },
+        )
+
+
+def parse_include(include: str | None) -> list[DatasetIncludeEnum]:
+    """
+    Parse the comma separated ``include`` query parameter.
+
+    :param include: The raw parameter value.
+    :type include: str | None
+    :return: The requested relationships without duplicates.
+    :rtype: list[DatasetIncludeEnum]
+    :raise HTTPException: unknown relationship requested
+    """
+
+    if not include:
+        return []
+
+    names = [name.strip() for name in include.split(",") if name.strip()]
+    unknown_names = set(names) - {member.value for member in DatasetIncludeEnum}
+    if unknown_names:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown relationships: {', '.join(sorted(unknown_names))}",
+        )
+
+    return list(dict.fromkeys(DatasetIncludeEnum(name) for name in names))
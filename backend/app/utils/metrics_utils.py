@@ -0,0 +1,340 @@
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from fastapi import Request, Response
+from prometheus_client import Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.routing import Match
+
+logger = logging.getLogger(__name__)
+
+# statements worth a plan when they are slow
+EXPLAINABLE_STATEMENTS = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+POOL_CHECKOUT_WAIT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a database connection from the pool.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1, 5, 30),
+)
+
+POOL_CONNECTIONS_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "Database connections currently checked out of the pool.",
+)
+
+POOL_CONNECTIONS_IDLE = Gauge(
+    "db_pool_connections_idle",
+    "Open database connections currently idle in the pool.",
+)
+
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections opened beyond the pool size, negative if the pool "
+    "is not filled yet.",
+)
+
+POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured number of persistent connections in the pool.",
+)
+
+STARTUP_SECONDS = Gauge(
+    "app_startup_seconds",
+    "Seconds the worker took to become ready to serve, per phase",
+    ["phase"],
+)
+
+REQUEST_LABELS = ("method", "route")
+
+REQUEST_DURATION_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling a request.",
+    REQUEST_LABELS,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+REQUEST_DB_STATEMENTS = Histogram(
+    "http_request_db_statements",
+    "Number of SQL statements executed per request.",
+    REQUEST_LABELS,
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 500),
+)
+
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL statements per request.",
+    REQUEST_LABELS,
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5, 30),
+)
+
+REQUEST_DB_ROWS = Histogram(
+    "http_request_db_rows",
+    "Number of rows returned or written by SQL statements per request.",
+    REQUEST_LABELS,
+    buckets=(0, 1, 10, 100, 1_000, 10_000, 100_000, 1_000_000),
+)
+
+REQUEST_SERIALIZATION_SECONDS = Histogram(
+    "http_request_serialization_seconds",
+    "Time spent serialising the response body per request.",
+    REQUEST_LABELS,
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1, 5),
+)
+
+
+@dataclass
+class RequestStats:
+    """
+    Database and serialisation work done while handling a request.
+
+    :param statements: Number of executed SQL statements.
+    :type statements: int
+    :param db_seconds: Time spent executing SQL statements.
+    :type db_seconds: float
+    :param rows: Number of rows returned or written by the statements.
+    :type rows: int
+    :param serialization_seconds: Time spent serialising the response body.
+    :type serialization_seconds: float
+    """
+
+    statements: int = 0
+    db_seconds: float = 0
+    rows: int = 0
+    serialization_seconds: float = 0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def record_serialization(seconds: float) -> None:
+    """
+    Add serialisation time to the stats of the current request.
+
+    :param seconds: The time spent serialising.
+    :type seconds: float
+    """
+
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.serialization_seconds += seconds
+
+
+def record_startup(started_at: float, lifespan_started_at: float) -> None:
+    """
+    Report how long this worker took to become ready to serve.
+
+    The startup is split into importing the app and running its lifespan
+    handler up to the first request.
+
+    :param started_at: ``time.perf_counter`` when the backend was imported.
+    :type started_at: float
+    :param lifespan_started_at: ``time.perf_counter`` when the lifespan
+        handler started.
+    :type lifespan_started_at: float
+    """
+
+    ready_at = time.perf_counter()
+    STARTUP_SECONDS.labels("import").set(lifespan_started_at - started_at)
+    STARTUP_SECONDS.labels("lifespan").set(ready_at - lifespan_started_at)
+    STARTUP_SECONDS.labels("total").set(ready_at - started_at)
+    logger.info(
+        "Ready to serve after %.2fs (import %.2fs, lifespan %.2fs)",
+        ready_at - started_at,
+        lifespan_started_at - started_at,
+        ready_at - lifespan_started_at,
+    )
+
+
+def register_pool_metrics(engine: AsyncEngine) -> None:
+    """
+    Report the connection pool state of the engine on every scrape.
+
+    :param engine: The engine whose pool to report.
+    :type engine: AsyncEngine
+    """
+
+    pool = engine.sync_engine.pool
+    POOL_CONNECTIONS_IN_USE.set_function(pool.checkedout)
+    POOL_CONNECTIONS_IDLE.set_function(pool.checkedin)
+    POOL_OVERFLOW.set_function(pool.overflow)
+    POOL_SIZE.set_function(pool.size)
+
+
+def register_statement_metrics(
+    engine: AsyncEngine, slow_statement_ms: int = 0
+) -> None:
+    """
+    Count the statements of the engine towards the current request.
+
+    Statements running longer than the threshold are logged as warning,
+    together with the plan Postgres chose for them.
+
+    :param engine: The engine whose statements to measure.
+    :type engine: AsyncEngine
+    :param slow_statement_ms: Milliseconds after which a statement is
+        logged as slow, 0 to disable the log.
+    :type slow_statement_ms: int
+    """
+
+    def before_cursor_execute(
+        connection, cursor, statement, parameters, context, executemany
+    ):
+        connection.info.setdefault("statement_starts", []).append(
+            time.perf_counter()
+        )
+
+    def after_cursor_execute(
+        connection, cursor, statement, parameters, context, executemany
+    ):
+        elapsed = (
+            time.perf_counter() - connection.info["statement_starts"].pop()
+        )
+        if connection.info.get("explaining"):
+            return
+
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += elapsed
+            stats.rows += max(cursor.rowcount, 0)
+
+        if slow_statement_ms and elapsed * 1000 > slow_statement_ms:
+            _log_slow_statement(
+                connection, statement, parameters, executemany, elapsed
+            )
+
+    event.listen(
+        engine.sync_engine, "before_cursor_execute", before_cursor_execute
+    )
+    event.listen(
+        engine.sync_engine, "after_cursor_execute", after_cursor_execute
+    )
+
+
+def _log_slow_statement(
+    connection, statement, parameters, executemany, elapsed
+) -> None:
+    plan = None
+    if not executemany and statement.lstrip().upper().startswith(
+        EXPLAINABLE_STATEMENTS
+    ):
+        # plan only, the statement is not executed again. A failing plan
+        #   must not abort the transaction of the request, so it runs in a
+        #   savepoint
+        connection.info["explaining"] = True
+        savepoint = (
+            connection.begin_nested() if connection.in_transaction() else None
+        )
+        try:
+            plan = "\n".join(
+                row[0]
+                for row in connection.exec_driver_sql(
+                    f"EXPLAIN {statement}", parameters
+                )
+            )
+        except Exception as error:
+            if savepoint is not None:
+                savepoint.rollback()
+            plan = f"(no plan: {error})"
+        else:
+            if savepoint is not None:
+                savepoint.commit()
+        finally:
+            connection.info["explaining"] = False
+
+    logger.warning(
+        "Slow statement took %.1f ms: %s\nParameters: %r\nPlan:\n%s",
+        elapsed * 1000,
+        statement,
+        parameters,
+        plan,
+    )
+
+
+def get_route_path(request: Request) -> str:
+    """
+    Find the template of the route a request is meant for.
+
+    Responses answered by a middleware, e.g. from the response cache, never
+    reach the router, so their route is matched here.
+
+    :param request: The request.
+    :type request: Request
+    :return: The path template of the route, ``unmatched`` if there is none.
+    :rtype: str
+    """
+
+    route = request.scope.get("route")
+    if route is None:
+        route = next(
+            (
+                candidate
+                for candidate in request.app.router.routes
+                if candidate.matches(request.scope)[0] == Match.FULL
+            ),
+            None,
+        )
+    # label by route template, unmatched paths would explode the labels
+    return route.path if route else "unmatched"
+
+
+class RequestMetricsMiddleware(BaseHTTPMiddleware):
+    """
+    Measure the database and serialisation work of every request.
+
+    The statement count, database time, row count and serialisation time
+    are recorded as histograms per route once the response body is sent,
+    and returned to the client in a ``Server-Timing`` header. Streamed
+    responses, which have no ``Content-Length``, send their headers before
+    their statements run, so they report the total time only.
+    """
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            _request_stats.reset(token)
+        elapsed = time.perf_counter() - start
+
+        labels = (request.method, get_route_path(request))
+        response.body_iterator = _observe_when_sent(
+            response.body_iterator, labels, stats, start
+        )
+
+        timings = [f"total;dur={elapsed * 1000:.1f}"]
+        if "content-length" in response.headers:
+            timings[:0] = [
+                f"db;dur={stats.db_seconds * 1000:.1f};"
+                f'desc="{stats.statements} statements, {stats.rows} rows"',
+                f"serialize;dur={stats.serialization_seconds * 1000:.1f}",
+            ]
+        response.headers["Server-Timing"] = ", ".join(timings)
+        return response
+
+
+async def _observe_when_sent(
+    body_iterator, labels: tuple[str, str], stats: RequestStats, start: float
+):
+    # the statements of streamed responses run while the body is sent
+    try:
+        async for chunk in body_iterator:
+            yield chunk
+    finally:
+        REQUEST_DURATION_SECONDS.labels(*labels).observe(
+            time.perf_counter() - start
+        )
+        REQUEST_DB_STATEMENTS.labels(*labels).observe(stats.statements)
+        REQUEST_DB_SECONDS.labels(*labels).observe(stats.db_seconds)
+        REQUEST_DB_ROWS.labels(*labels).observe(stats.rows)
+        REQUEST_SERIALIZATION_SECONDS.labels(*labels).observe(
+            stats.serialization_seconds
+        )
@@ -0,0 +1,152 @@
+from typing import Iterable
+
+from fastapi import HTTPException
+from sqlalchemy import Select, String, literal, union_all
+from sqlmodel import col, select
+
+from backend.app.enums.search_type_enum import SearchTypeEnum
+from backend.app.models.contact import Contact
+from backend.app.models.site import Site
+from backend.app.models.voc import Voc
+from backend.app.models.voc_subclass import VocSubclass
+from backend.app.models.voc_synonym import VocSynonym
+from backend.app.utils.trigram_utils import (  # noqa: E501
+    matches_text,
+    starts_with_text,
+    text_score,
+)
+
+# per result type: the ID and name of the results and the searched texts,
+#   each with the joins needed to reach it
+SEARCHED_TEXTS = {
+    SearchTypeEnum.VOC: (
+        col(Voc.id),
+        col(Voc.name),
+        (
+            (col(Voc.name), ()),
+            (
+                col(VocSynonym.name),
+                ((VocSynonym, col(VocSynonym.voc_id) == Voc.id),),
+            ),
+        ),
+    ),
+    SearchTypeEnum.VOC_SUBCLASS: (
+        col(VocSubclass.id),
+        col(VocSubclass.name),
+        ((col(VocSubclass.name), ()),),
+    ),
+    SearchTypeEnum.SITE: (
+        col(Site.id),
+        col(Site.name),
+        (
+            (col(Site.name), ()),
+            (col(Site.region), ()),
+            (col(Site.country), ()),
+        ),
+    ),
+    SearchTypeEnum.CONTACT: (
+        col(Contact.id),
+        col(Contact.name),
+        ((col(Contact.name), ()),),
+    ),
+}
+
+
+def parse_search_types(types: str | None) -> list[SearchTypeEnum]:
+    """
+    Parse the comma separated ``types`` query parameter.
+
+    :param types: The raw parameter value, None to search all types.
+    :type types: str | None
+    :return: The requested types without duplicates.
+    :rtype: list[SearchTypeEnum]
+    :raise HTTPException: unknown type requested
+    """
+
+    if not types:
+        return list(SearchTypeEnum)
+
+    names = [name.strip() for name in types.split(",") if name.strip()]
+    unknown_names = set(names) - {member.value for member in SearchTypeEnum}
+    if unknown_names:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown types: {', '.join(sorted(unknown_names))}",
+        )
+
+    return list(dict.fromkeys(SearchTypeEnum(name) for name in names))
+
+
+def get_name_search_query(
+    query: str, types: Iterable[SearchTypeEnum], limit: int
+) -> Select:
+    """
+    Build the query searching objects of the given types by name.
+
+    Every searched text is matched separately through its trigram index,
+    keeping only its best matches, see
+    :func:`backend.app.utils.trigram_utils.matches_text`. Objects matching
+    several texts, e.g. a VOC by its name and a synonym, are returned once
+    with their best match. Texts starting with the query rank first, the
+    rest by their similarity to the query.
+
+    :param query: The searched text.
+    :type query: str
+    :param types: The types of objects to search.
+    :type types: Iterable[SearchTypeEnum]
+    :param limit: The maximum number of results.
+    :type limit: int
+    :return: The query selecting type, ID, name, matched text and score.
+    :rtype: Select
+    """
+
+    candidates = []
+    for search_type in types:
+        id_column, name_column, texts = SEARCHED_TEXTS[search_type]
+        for text_column, joins in texts:
+            prefix = starts_with_text(text_column, query)
+            score = text_score(text_column, query)
+            statement = select(
+                literal(search_type.value, String).label("type"),
+                id_column.label("id"),
+                name_column.label("name"),
+                text_column.label("matched"),
+                score.label("score"),
+                prefix.label("prefix"),
+            )
+            for target, on_clause in joins:
+                statement = statement.join(target, on_clause)
+            candidates.append(
+                statement.where(matches_text(text_column, query))
+                .order_by(prefix.desc(), score.desc())
+                .limit(limit)
+            )
+
+    candidate = union_all(*candidates).subquery("candidate")
+    best_match = (
+        select(candidate)
+        .distinct(candidate.c.type, candidate.c.id)
+        .order_by(
+            candidate.c.type,
+            candidate.c.id,
+            candidate.c.prefix.desc(),
+            candidate.c.score.desc(),
+        )
+        .subquery("best_match")
+    )
+    return (
+        select(
+            best_match.c.type,
+            best_match.c.id,
+            best_match.c.name,
+            best_match.c.matched,
+            best_match.c.score,
+        )
+        .order_by(
+            best_match.c.prefix.desc(),
+            best_match.c.score.desc(),
+            best_match.c.name,
+            best_match.c.id,
+        )
+        .limit(limit)
+    )
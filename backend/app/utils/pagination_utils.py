@@ -0,0 +1,154 @@
+import base64
+import binascii
+from typing import Annotated, Sequence
+
+from fastapi import HTTPException, Query
+from geoalchemy2 import Geometry
+from sqlmodel import SQLModel, col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.utils.geometry_utils import geometry_to_geojson
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+
+
+class PaginationParams:
+    """
+    Query parameters shared by all list endpoints.
+
+    Lists are paginated by keyset on the ``id`` column: every page carries
+    an opaque cursor pointing behind its last row, which is passed back to
+    retrieve the next page.
+
+    :param cursor: The cursor returned with the previous page,
+        omit it to start with the first page.
+    :type cursor: str | None
+    :param limit: The maximum number of items per page.
+    :type limit: int
+    :param fields: Comma separated column names to return,
+        omit it to return complete objects.
+    :type fields: str | None
+    """
+
+    def __init__(
+        self,
+        cursor: Annotated[str | None, Query()] = None,
+        limit: Annotated[
+            int, Query(ge=1, le=MAX_PAGE_LIMIT)
+        ] = DEFAULT_PAGE_LIMIT,
+        fields: Annotated[str | None, Query()] = None,
+    ):
+        self.after_id = decode_cursor(cursor) if cursor else None
+        self.limit = limit
+        self.fields = (
+            [field.strip() for field in fields.split(",") if field.strip()]
+            if fields
+            else None
+        )
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Encode the ID of the last row of a page into an opaque cursor.
+
+    :param last_id: The ID of the last row on the page.
+    :type last_id: int
+    :return: The cursor pointing behind that row.
+    :rtype: str
+    """
+
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode a cursor created by :func:`encode_cursor`.
+
+    :param cursor: The cursor to decode.
+    :type cursor: str
+    :return: The ID of the last row of the previous page.
+    :rtype: int
+    :raise HTTPException: the cursor is malformed
+    """
+
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def paginate(
+    session: AsyncSession,
+    model: type[SQLModel],
+    pagination: PaginationParams,
+    *where_clauses,
+    options: Sequence = (),
+) -> dict:
+    """
+    Retrieve one page of a table, optionally projected to some columns.
+
+    Only the requested columns are selected from the database. The ``id``
+    column is always included, since it is needed to build the cursor.
+
+    :param session: The database session.
+    :type session: AsyncSession
+    :param model: The table model to page through.
+    :type model: type[SQLModel]
+    :param pagination: The pagination query parameters.
+    :type pagination: PaginationParams
+    :param where_clauses: Additional filters for the rows to page through.
+    :param options: Loader options for complete objects, e.g. to load
+        relationships eagerly. Ignored when projecting to fields.
+    :type options: Sequence
+    :return: The page as dict with the ``items`` and the ``next_cursor``,
+        which is None on the last page.
+    :rtype: dict
+    :raise HTTPException: unknown field requested
+    """
+
+    table_columns = model.__table__.columns
+
+    if pagination.fields is None:
+        statement = select(model).options(*options)
+    else:
+        unknown_fields = set(pagination.fields) - set(table_columns.keys())
+        if unknown_fields:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(sorted(unknown_fields))}",
+            )
+        field_names = ["id"] + [
+            field for field in pagination.fields if field != "id"
+        ]
+        statement = select(*(table_columns[name] for name in field_names))
+
+    statement = statement.where(*where_clauses)
+    if pagination.after_id is not None:
+        statement = statement.where(col(model.id) > pagination.after_id)
+
+    # fetch one extra row to find out if there is a next page
+    statement = statement.order_by(col(model.id)).limit(pagination.limit + 1)
+    result = await session.execute(statement)
+    rows = (result.scalars() if pagination.fields is None else result).all()
+
+    has_next_page = len(rows) > pagination.limit
+    rows = rows[: pagination.limit]
+
+    if pagination.fields is None:
+        items = rows
+    else:
+        items = [dict(zip(field_names, row)) for row in rows]
+        # projected geometries bypass the model load hooks, convert them here
+        for name in field_names:
+            if isinstance(table_columns[name].type, Geometry):
+                for item in items:
+                    item[name] = geometry_to_geojson(item[name])
+
+    next_cursor = None
+    if has_next_page:
+        last_row = items[-1]
+        last_id = last_row["id"] if isinstance(last_row, dict) else last_row.id
+        next_cursor = encode_cursor(last_id)
+
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,78 @@
+"""
+Helpers to inspect Postgres query plans of SQLAlchemy statements.
+"""
+
+from sqlalchemy import Executable, text
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Session
+
+
+def explain(session: Session, statement: Executable) -> dict:
+    """
+    Retrieve the plan Postgres chooses for a statement.
+
+    :param session: The database session.
+    :type session: Session
+    :param statement: The statement to plan, it is not executed.
+    :type statement: Executable
+    :return: The root node of the JSON plan.
+    :rtype: dict
+    """
+
+    # render percent signs (e.g. of LIKE patterns or trigram operators)
+    #   once, the text clause below escapes them for the driver again
+    compiled = statement.compile(
+        dialect=postgresql.dialect(paramstyle="named"),
+        compile_kwargs={"literal_binds": True},
+    )
+    result = session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+    return result.scalar_one()[0]["Plan"]
+
+
+def iter_plan_nodes(plan: dict):
+    """
+    Iterate over a plan node and all of its child nodes.
+
+    :param plan: The plan node to start with.
+    :type plan: dict
+    :return: A generator over the nodes of the plan.
+    :rtype: Generator[dict]
+    """
+
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from iter_plan_nodes(child)
+
+
+def uses_index(plan: dict, index_name: str) -> bool:
+    """
+    Check whether a plan reads from the given index.
+
+    :param plan: The root node of the plan.
+    :type plan: dict
+    :param index_name: The name of the index.
+    :type index_name: str
+    :return: True if any node of the plan scans the index.
+    :rtype: bool
+    """
+
+    return any(
+        node.get("Index Name") == index_name for node in iter_plan_nodes(plan)
+    )
+
+
+def get_seq_scans(plan: dict) -> list[str]:
+    """
+    Find the tables a plan reads sequentially.
+
+    :param plan: The root node of the plan.
+    :type plan: dict
+    :return: The names of the tables read by sequential scans.
+    :rtype: list[str]
+    """
+
+    return [
+        node["Relation Name"]
+        for node in iter_plan_nodes(plan)
+        if node["Node Type"] == "Seq Scan"
+    ]
@@ -0,0 +1,130 @@
+from typing import Annotated
+
+from fastapi import Query
+from sqlalchemy import ColumnElement
+from sqlmodel import col, select
+
+from backend.app.models.dataset import Dataset
+from backend.app.models.dataset_search import DatasetSearch
+from backend.app.models.site import Site
+from backend.app.utils.geometry_utils import (  # noqa: E501
+    distance_to,
+    nearest_first,
+    within_distance,
+)
+from backend.app.utils.search_utils import has_voc, has_voc_subclass
+
+DEFAULT_NEAR_LIMIT = 10
+MAX_NEAR_LIMIT = 1000
+
+
+class NearParams:
+    """
+    Query parameters shared by the proximity search endpoints.
+
+    Results are ordered by distance to the given point, closest first.
+
+    :param lon: Longitude of the point to search around.
+    :type lon: float
+    :param lat: Latitude of the point to search around.
+    :type lat: float
+    :param radius_km: Maximum distance to the point in kilometers,
+        omit it to find the nearest results regardless of distance.
+    :type radius_km: float | None
+    :param limit: The maximum number of results.
+    :type limit: int
+    :param voc_name: Only consider datasets measuring this VOC.
+    :type voc_name: str | None
+    :param voc_subclass_name: Only consider datasets of this VOC subclass
+        or one of its descendants.
+    :type voc_subclass_name: str | None
+    """
+
+    def __init__(
+        self,
+        lon: Annotated[float, Query(ge=-180, le=180)],
+        lat: Annotated[float, Query(ge=-90, le=90)],
+        radius_km: Annotated[float | None, Query(gt=0)] = None,
+        limit: Annotated[
+            int, Query(ge=1, le=MAX_NEAR_LIMIT)
+        ] = DEFAULT_NEAR_LIMIT,
+        voc_name: Annotated[str | None, Query()] = None,
+        voc_subclass_name: Annotated[str | None, Query()] = None,
+    ):
+        self.lon = lon
+        self.lat = lat
+        self.radius_km = radius_km
+        self.limit = limit
+        self.voc_name = voc_name
+        self.voc_subclass_name = voc_subclass_name
+
+    @property
+    def distance(self) -> ColumnElement:
+        """
+        The distance of a site to the searched point in meters.
+        """
+
+        return distance_to(Site.geo_location, self.lon, self.lat).label(
+            "distance_m"
+        )
+
+    @property
+    def order(self) -> ColumnElement:
+        """
+        The ordering of sites by distance, answered from the spatial index.
+        """
+
+        return nearest_first(Site.geo_location, self.lon, self.lat)
+
+    def site_filters(self) -> list[ColumnElement[bool]]:
+        """
+        Build the filters on sites, the radius if one is given.
+
+        :return: The filter clauses.
+        :rtype: list[ColumnElement[bool]]
+        """
+
+        filters = [col(Site.geo_location).is_not(None)]
+        if self.radius_km is not None:
+            filters.append(
+                within_distance(
+                    Site.geo_location, self.lon, self.lat, self.radius_km * 1000
+                )
+            )
+        return filters
+
+    def dataset_filters(self) -> list[ColumnElement[bool]]:
+        """
+        Build the filters on datasets, the VOC and VOC subclass if given.
+
+        :return: The filter clauses.
+        :rtype: list[ColumnElement[bool]]
+        """
+
+        search_filters = []
+        if self.voc_name is not None:
+            search_filters.append(has_voc(self.voc_name))
+        if self.voc_subclass_name is not None:
+            search_filters.append(has_voc_subclass(self.voc_subclass_name))
+
+        if not search_filters:
+            return []
+        return [
+            col(Dataset.id).in_(
+                select(DatasetSearch.dataset_id).where(*search_filters)
+            )
+        ]
+
+    def site_ids_with_datasets(self):
+        """
+        Build a query for sites holding a dataset that passes the filters.
+
+        :return: A select statement yielding the site IDs,
+            or None if no dataset filter was given.
+        :rtype: sqlalchemy.Select | None
+        """
+
+        dataset_filters = self.dataset_filters()
+        if not dataset_filters:
+            return None
+        return select(Dataset.site_id).where(*dataset_filters)
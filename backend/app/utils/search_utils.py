@@ -0,0 +1,262 @@
+from datetime import date
+from typing import Annotated
+
+from fastapi import HTTPException, Query
+from sqlalchemy import ColumnElement, func, literal_column
+from sqlalchemy.dialects.postgresql import DATERANGE
+from sqlmodel import col, select
+
+from backend.app.enums.period_match_enum import PeriodMatchEnum
+from backend.app.enums.time_resolution_unit_enum import TimeResolutionUnitEnum
+from backend.app.models.dataset import Dataset
+from backend.app.models.dataset_search import SAMPLING_PERIOD, DatasetSearch
+from backend.app.models.voc import Voc
+from backend.app.models.voc_subclass import VocSubclass
+from backend.app.utils.geometry_utils import within_bounding_box
+
+
+class DatasetSearchParams:
+    """
+    Query parameters of the combined dataset search.
+
+    All given filters have to match, omitted ones are ignored. The bounding
+    box is only applied if all four of its coordinates are given.
+
+    :param site_id: Only datasets of this site.
+    :type site_id: int | None
+    :param country: Only datasets of sites in this country.
+    :type country: str | None
+    :param min_lon: Minimum longitude of the bounding box.
+    :type min_lon: float | None
+    :param min_lat: Minimum latitude of the bounding box.
+    :type min_lat: float | None
+    :param max_lon: Maximum longitude of the bounding box.
+    :type max_lon: float | None
+    :param max_lat: Maximum latitude of the bounding box.
+    :type max_lat: float | None
+    :param voc_subclass_name: Only datasets of this VOC subclass
+        or one of its descendants.
+    :type voc_subclass_name: str | None
+    :param voc_name: Only datasets measuring this VOC.
+    :type voc_name: str | None
+    :param time_resolution_unit: Only datasets with this time resolution.
+    :type time_resolution_unit: TimeResolutionUnitEnum | None
+    :param sampled_from: Only datasets sampled on or after this date.
+    :type sampled_from: date | None
+    :param sampled_to: Only datasets sampled on or before this date.
+    :type sampled_to: date | None
+    :param period_match: How the sampling periods have to match the period
+        between sampled_from and sampled_to, overlap it, cover all of it
+        or lie within it.
+    :type period_match: PeriodMatchEnum
+    :param data_type: Only datasets of this data type.
+    :type data_type: str | None
+    :raise HTTPException: incomplete bounding box or empty sampling period
+    """
+
+    def __init__(
+        self,
+        site_id: Annotated[int | None, Query()] = None,
+        country: Annotated[str | None, Query()] = None,
+        min_lon: Annotated[float | None, Query(ge=-180, le=180)] = None,
+        min_lat: Annotated[float | None, Query(ge=-90, le=90)] = None,
+        max_lon: Annotated[float | None, Query(ge=-180, le=180)] = None,
+        max_lat: Annotated[float | None, Query(ge=-90, le=90)] = None,
+        voc_subclass_name: Annotated[str | None, Query()] = None,
+        voc_name: Annotated[str | None, Query()] = None,
+        time_resolution_unit: Annotated[
+            TimeResolutionUnitEnum | None, Query()
+        ] = None,
+        sampled_from: Annotated[date | None, Query()] = None,
+        sampled_to: Annotated[date | None, Query()] = None,
+        period_match: Annotated[
+            PeriodMatchEnum, Query()
+        ] = PeriodMatchEnum.OVERLAPS,
+        data_type: Annotated[str | None, Query()] = None,
+    ):
+        bounding_box = (min_lon, min_lat, max_lon, max_lat)
+        if all(value is None for value in bounding_box):
+            bounding_box = None
+        elif any(value is None for value in bounding_box):
+            raise HTTPException(
+                status_code=400,
+                detail="min_lon, min_lat, max_lon and max_lat"
+                " have to be given together",
+            )
+        if (
+            sampled_from is not None
+            and sampled_to is not None
+            and sampled_from > sampled_to
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail="sampled_from has to be before sampled_to",
+            )
+
+        self.site_id = site_id
+        self.country = country
+        self.bounding_box = bounding_box
+        self.voc_subclass_name = voc_subclass_name
+        self.voc_name = voc_name
+        self.time_resolution_unit = time_resolution_unit
+        self.sampled_from = sampled_from
+        self.sampled_to = sampled_to
+        self.period_match = period_match
+        self.data_type = data_type
+
+    def filters(self) -> list[ColumnElement[bool]]:
+        """
+        Build the filters on the dataset search rows.
+
+        :return: The filter clauses.
+        :rtype: list[ColumnElement[bool]]
+        """
+
+        filters = []
+        if self.site_id is not None:
+            filters.append(col(DatasetSearch.site_id) == self.site_id)
+        if self.country is not None:
+            filters.append(in_country(self.country))
+        if self.bounding_box is not None:
+            filters.append(within_area(*self.bounding_box))
+        if self.voc_subclass_name is not None:
+            filters.append(has_voc_subclass(self.voc_subclass_name))
+        if self.voc_name is not None:
+            filters.append(has_voc(self.voc_name))
+        if self.time_resolution_unit is not None:
+            filters.append(
+                col(DatasetSearch.time_resolution_unit)
+                == self.time_resolution_unit
+            )
+        if self.sampled_from is not None or self.sampled_to is not None:
+            filters.append(
+                sampled_within(
+                    self.sampled_from, self.sampled_to, self.period_match
+                )
+            )
+        if self.data_type is not None:
+            filters.append(col(DatasetSearch.data_type) == self.data_type)
+        return filters
+
+    def dataset_filters(self) -> list[ColumnElement[bool]]:
+        """
+        Build the filters on datasets, matching their search rows.
+
+        :return: The filter clauses, empty if no filter was given.
+        :rtype: list[ColumnElement[bool]]
+        """
+
+        filters = self.filters()
+        if not filters:
+            return []
+        return [
+            col(Dataset.id).in_(
+                select(DatasetSearch.dataset_id).where(*filters)
+            )
+        ]
+
+
+def in_country(country: str) -> ColumnElement[bool]:
+    """
+    Build a filter for search rows of datasets located in a country.
+
+    :param country: The name of the country.
+    :type country: str
+    :return: The filter clause.
+    :rtype: ColumnElement[bool]
+    """
+
+    return col(DatasetSearch.country) == country
+
+
+def within_area(
+    min_lon: float, min_lat: float, max_lon: float, max_lat: float
+) -> ColumnElement[bool]:
+    """
+    Build a filter for search rows of datasets located in a bounding box.
+
+    :param min_lon: Minimum longitude of the bounding box.
+    :type min_lon: float
+    :param min_lat: Minimum latitude of the bounding box.
+    :type min_lat: float
+    :param max_lon: Maximum longitude of the bounding box.
+    :type max_lon: float
+    :param max_lat: Maximum latitude of the bounding box.
+    :type max_lat: float
+    :return: The filter clause.
+    :rtype: ColumnElement[bool]
+    """
+
+    return within_bounding_box(
+        DatasetSearch.geo_location, min_lon, min_lat, max_lon, max_lat
+    )
+
+
+def has_voc(voc_name: str) -> ColumnElement[bool]:
+    """
+    Build a filter for search rows of datasets measuring a VOC.
+
+    :param voc_name: The name of the VOC.
+    :type voc_name: str
+    :return: The filter clause.
+    :rtype: ColumnElement[bool]
+    """
+
+    voc_ids = select(Voc.id).where(Voc.name == voc_name)
+    return col(DatasetSearch.voc_ids).overlap(
+        func.array(voc_ids.scalar_subquery())
+    )
+
+
+def has_voc_subclass(voc_subclass_name: str) -> ColumnElement[bool]:
+    """
+    Build a filter for search rows of datasets of a VOC subclass.
+
+    Search rows hold the ancestors of all subclasses of their dataset, so
+    this matches datasets linked to the subclass or any of its descendants,
+    directly or through one of their VOCs.
+
+    :param voc_subclass_name: The name of the VOC subclass.
+    :type voc_subclass_name: str
+    :return: The filter clause.
+    :rtype: ColumnElement[bool]
+    """
+
+    voc_subclass_ids = select(VocSubclass.id).where(
+        VocSubclass.name == voc_subclass_name
+    )
+    return col(DatasetSearch.voc_subclass_ids).overlap(
+        func.array(voc_subclass_ids.scalar_subquery())
+    )
+
+
+def sampled_within(
+    sampled_from: date | None,
+    sampled_to: date | None,
+    period_match: PeriodMatchEnum = PeriodMatchEnum.OVERLAPS,
+) -> ColumnElement[bool]:
+    """
+    Build a filter for search rows of datasets by their sampling period.
+
+    Missing bounds are unbounded, on both the period and the datasets.
+    The filter is answered from the range index on the sampling periods.
+
+    :param sampled_from: The first day of the period.
+    :type sampled_from: date | None
+    :param sampled_to: The last day of the period.
+    :type sampled_to: date | None
+    :param period_match: How the sampling periods have to match the period,
+        overlap it, cover all of it or lie within it.
+    :type period_match: PeriodMatchEnum
+    :return: The filter clause.
+    :rtype: ColumnElement[bool]
+    """
+
+    period = func.daterange(
+        sampled_from, sampled_to, literal_column("'[]'"), type_=DATERANGE
+    )
+    if period_match == PeriodMatchEnum.COVERS:
+        return SAMPLING_PERIOD.contains(period)
+    if period_match == PeriodMatchEnum.WITHIN:
+        return SAMPLING_PERIOD.contained_by(period)
+    return SAMPLING_PERIOD.overlaps(period)
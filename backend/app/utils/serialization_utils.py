@@ -0,0 +1,75 @@
+import time
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Callable
+
+import orjson
+from fastapi.responses import JSONResponse
+from geojson_pydantic import Point
+from pydantic import BaseModel
+
+from backend.app.utils.metrics_utils import record_serialization
+
+
+def _encode_point(point: Point) -> dict:
+    # mirrors the serialiser of geojson-pydantic, which omits a missing bbox,
+    #   positions are named tuples, which orjson does not encode as arrays
+    coordinates = tuple(point.coordinates)
+    if point.bbox is None:
+        return {"type": point.type, "coordinates": coordinates}
+    return {"bbox": point.bbox, "type": point.type, "coordinates": coordinates}
+
+
+@lru_cache(maxsize=None)
+def get_encoder(model_class: type[BaseModel]) -> Callable[[Any], dict]:
+    """
+    Get the encoder turning instances of a model into plain dicts.
+
+    Encoders read the model fields directly, without validating or copying
+    them. Nested models are left to the response serialiser, which encodes
+    them with their own encoder. Models with a custom serialiser are
+    dumped through pydantic instead.
+
+    :param model_class: The model to encode, e.g. a table model.
+    :type model_class: type[BaseModel]
+    :return: The encoder of the model.
+    :rtype: Callable[[Any], dict]
+    """
+
+    if issubclass(model_class, Point):
+        return _encode_point
+    if model_class.__pydantic_decorators__.model_serializers:
+        return lambda instance: instance.model_dump(mode="json")
+
+    field_names = tuple(model_class.model_fields)
+    return lambda instance: {
+        name: getattr(instance, name) for name in field_names
+    }
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return get_encoder(type(value))(value)
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response serialised with orjson, for large responses.
+
+    Endpoints opt in by returning this response directly, which skips the
+    validation against their response model and the ``jsonable_encoder``
+    of FastAPI. Models are encoded by their precompiled encoders, see
+    :func:`get_encoder`. The response model should still be declared on
+    the endpoint, to document the response.
+    """
+
+    def render(self, content: Any) -> bytes:
+        start = time.perf_counter()
+        body = orjson.dumps(
+            content, default=_default, option=orjson.OPT_NON_STR_KEYS
+        )
+        record_serialization(time.perf_counter() - start)
+        return body
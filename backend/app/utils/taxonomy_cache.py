@@ -0,0 +1,177 @@
+from asyncio import Lock
+from dataclasses import dataclass, field
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.models.version_counter import TAXONOMY_VERSION, VersionCounter
+from backend.app.models.voc import Voc
+from backend.app.models.voc_subclass import VocSubclass
+
+
+@dataclass
+class Taxonomy:
+    """
+    In-memory snapshot of the VOC taxonomy.
+
+    Holds all VOC subclasses and VOCs together with precomputed ancestor
+    and descendant sets, so hierarchy questions can be answered without
+    querying the database.
+
+    :param version: The taxonomy version this snapshot was built from.
+    :type version: int
+    :param voc_subclasses: All VOC subclasses by ID.
+    :type voc_subclasses: dict[int, VocSubclass]
+    :param vocs: All VOCs by ID.
+    :type vocs: dict[int, Voc]
+    :param voc_subclass_ids_by_name: VOC subclass IDs by subclass name.
+    :type voc_subclass_ids_by_name: dict[str, list[int]]
+    :param ancestor_ids: Ancestor IDs of every VOC subclass, starting with
+        the subclass itself and ending with the root of its hierarchy.
+    :type ancestor_ids: dict[int, list[int]]
+    :param descendant_ids: Descendant IDs of every VOC subclass,
+        including the subclass itself.
+    :type descendant_ids: dict[int, set[int]]
+    :param voc_ids_by_voc_subclass_id: IDs of the VOCs directly
+        assigned to every VOC subclass.
+    :type voc_ids_by_voc_subclass_id: dict[int, list[int]]
+    """
+
+    version: int
+    voc_subclasses: dict[int, VocSubclass] = field(default_factory=dict)
+    vocs: dict[int, Voc] = field(default_factory=dict)
+    voc_subclass_ids_by_name: dict[str, list[int]] = field(default_factory=dict)
+    ancestor_ids: dict[int, list[int]] = field(default_factory=dict)
+    descendant_ids: dict[int, set[int]] = field(default_factory=dict)
+    voc_ids_by_voc_subclass_id: dict[int, list[int]] = field(
+        default_factory=dict
+    )
+
+    def get_vocs_by_voc_subclass_name(self, voc_subclass_name: str) -> list:
+        """
+        Get all VOCs assigned to the named VOC subclass or its descendants.
+
+        :param voc_subclass_name: The name of the VOC subclass.
+        :type voc_subclass_name: str
+        :return: The matching VOCs, ordered by ID.
+        :rtype: list[Voc]
+        """
+
+        voc_ids = set()
+        for voc_subclass_id in self.voc_subclass_ids_by_name.get(
+            voc_subclass_name, []
+        ):
+            for descendant_id in self.descendant_ids[voc_subclass_id]:
+                voc_ids.update(
+                    self.voc_ids_by_voc_subclass_id.get(descendant_id, [])
+                )
+
+        return [self.vocs[voc_id] for voc_id in sorted(voc_ids)]
+
+    def get_voc_subclasses_by_voc_id(self, voc_id: int) -> list:
+        """
+        Get the VOC subclass of a VOC and all of its ancestors.
+
+        :param voc_id: The ID of the VOC.
+        :type voc_id: int
+        :return: The VOCs subclass followed by its ancestors, closest first.
+        :rtype: list[VocSubclass]
+        """
+
+        voc_subclass_id = self.vocs[voc_id].voc_subclass_id
+        return [
+            self.voc_subclasses[ancestor_id]
+            for ancestor_id in self.ancestor_ids.get(voc_subclass_id, [])
+        ]
+
+
+class TaxonomyCache:
+    """
+    Per-process cache of the VOC taxonomy.
+
+    The cached snapshot is rebuilt lazily whenever the version counter in
+    the database differs from the version it was built from, so writes on
+    any worker invalidate the caches of all other workers.
+    """
+
+    def __init__(self):
+        self._taxonomy: Taxonomy | None = None
+        self._lock = Lock()
+
+    async def get(self, session: AsyncSession) -> Taxonomy:
+        """
+        Get the current taxonomy, rebuilding it if it is outdated.
+
+        :param session: The database session.
+        :type session: AsyncSession
+        :return: The up to date taxonomy.
+        :rtype: Taxonomy
+        """
+
+        version = (
+            await session.exec(
+                select(VersionCounter.version).where(
+                    VersionCounter.name == TAXONOMY_VERSION
+                )
+            )
+        ).one()
+        taxonomy = self._taxonomy
+        if taxonomy is not None and taxonomy.version == version:
+            return taxonomy
+
+        async with self._lock:
+            if self._taxonomy is None or self._taxonomy.version != version:
+                self._taxonomy = await self._load(session, version)
+            return self._taxonomy
+
+    def clear(self) -> None:
+        """
+        Drop the cached taxonomy, forcing a rebuild on next access.
+        """
+
+        self._taxonomy = None
+
+    @staticmethod
+    async def _load(session: AsyncSession, version: int) -> Taxonomy:
+        taxonomy = Taxonomy(version=version)
+
+        for voc_subclass in (await session.exec(select(VocSubclass))).all():
+            taxonomy.voc_subclasses[voc_subclass.id] = voc_subclass
+            taxonomy.voc_subclass_ids_by_name.setdefault(
+                voc_subclass.name, []
+            ).append(voc_subclass.id)
+            taxonomy.descendant_ids[voc_subclass.id] = set()
+
+        for voc in (await session.exec(select(Voc))).all():
+            taxonomy.vocs[voc.id] = voc
+            taxonomy.voc_ids_by_voc_subclass_id.setdefault(
+                voc.voc_subclass_id, []
+            ).append(voc.id)
+
+        # walk up from every subclass, registering it with its ancestors
+        for voc_subclass_id in taxonomy.voc_subclasses:
+            ancestor_ids = []
+            current_id = voc_subclass_id
+            while (
+                current_id is not None
+                and current_id not in ancestor_ids
+                and current_id in taxonomy.voc_subclasses
+            ):
+                ancestor_ids.append(current_id)
+                taxonomy.descendant_ids[current_id].add(voc_subclass_id)
+                current_id = taxonomy.voc_subclasses[
+                    current_id
+                ].parent_voc_category_id
+            taxonomy.ancestor_ids[voc_subclass_id] = ancestor_ids
+
+        # cached objects outlive the session, detach them
+        for instance in [
+            *taxonomy.voc_subclasses.values(),
+            *taxonomy.vocs.values(),
+        ]:
+            session.expunge(instance)
+
+        return taxonomy
+
+
+taxonomy_cache = TaxonomyCache()
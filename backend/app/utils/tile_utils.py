@@ -0,0 +1,141 @@
+from collections import OrderedDict
+
+from sqlalchemy import BigInteger, Select, cast, func, literal_column
+from sqlmodel import col, select
+
+from backend.app.models.dataset import Dataset
+from backend.app.models.site import Site
+
+TILE_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+TILE_LAYER_NAME = "sites"
+MAX_TILE_ZOOM = 22
+# below this zoom level, nearby sites are merged into clusters
+CLUSTER_MAX_ZOOM = 10
+# number of clustering grid cells along the edge of a tile
+CLUSTER_GRID_SIZE = 64
+# edge length of the web mercator world in meters
+WEB_MERCATOR_EXTENT = 2 * 20037508.342789244
+TILE_CACHE_SIZE = 1024
+
+
+def get_site_tile_query(z: int, x: int, y: int) -> Select:
+    """
+    Build a query rendering the sites of a tile as Mapbox vector tile.
+
+    Every feature carries the number of sites it represents and the number
+    of their datasets. Below :data:`CLUSTER_MAX_ZOOM`, sites are clustered
+    on a grid of :data:`CLUSTER_GRID_SIZE` cells per tile edge and every
+    cluster is placed at the centroid of its sites. From that zoom level
+    on, every site is a feature of its own, carrying its ID and name.
+
+    :param z: The zoom level of the tile.
+    :type z: int
+    :param x: The column of the tile.
+    :type x: int
+    :param y: The row of the tile.
+    :type y: int
+    :return: A select statement yielding the tile as bytes.
+    :rtype: sqlalchemy.Select
+    """
+
+    envelope = func.ST_TileEnvelope(z, x, y)
+    location = func.ST_Transform(Site.geo_location, 3857)
+
+    # counted per site of the tile only, not for the whole catalogue
+    dataset_count = (
+        select(func.count())
+        .where(Dataset.site_id == Site.id)
+        .correlate(Site)
+        .scalar_subquery()
+    )
+
+    # compare in WGS 84, so the spatial index of the sites is used
+    sites = select(Site).where(
+        col(Site.geo_location).op("&&")(func.ST_Transform(envelope, 4326))
+    )
+
+    if z < CLUSTER_MAX_ZOOM:
+        cell_size = WEB_MERCATOR_EXTENT / 2**z / CLUSTER_GRID_SIZE
+        cell = func.ST_SnapToGrid(location, cell_size)
+        features = sites.with_only_columns(
+            func.ST_AsMVTGeom(
+                func.ST_Centroid(func.ST_Collect(location)), envelope
+            ).label("geom"),
+            func.count().label("site_count"),
+            # sums are numeric, which vector tiles can not hold
+            cast(func.sum(dataset_count), BigInteger).label("dataset_count"),
+        ).group_by(cell)
+    else:
+        features = sites.with_only_columns(
+            func.ST_AsMVTGeom(location, envelope).label("geom"),
+            col(Site.id).label("id"),
+            col(Site.name).label("name"),
+            literal_column("1").label("site_count"),
+            dataset_count.label("dataset_count"),
+        )
+
+    features = features.subquery("features")
+    return select(
+        func.ST_AsMVT(features.table_valued(), TILE_LAYER_NAME)
+    ).select_from(features)
+
+
+class TileCache:
+    """
+    Per-process LRU cache of rendered site tiles.
+
+    Tiles are cached per version of the site tiles, see
+    :class:`~backend.app.models.version_counter.VersionCounter`. Writes
+    on any worker bump the version, so no worker serves outdated tiles,
+    and the tiles of earlier versions are evicted as the least recently
+    used ones.
+
+    :param max_size: The maximum number of cached tiles.
+    :type max_size: int
+    """
+
+    def __init__(self, max_size: int = TILE_CACHE_SIZE):
+        self.max_size = max_size
+        self._tiles: OrderedDict[tuple[int, int, int, int], bytes] = (
+            OrderedDict()
+        )
+
+    def get(self, key: tuple[int, int, int, int]) -> bytes | None:
+        """
+        Get a cached tile, marking it as recently used.
+
+        :param key: The version, zoom level, column and row of the tile.
+        :type key: tuple[int, int, int, int]
+        :return: The tile, or None if it is not cached.
+        :rtype: bytes | None
+        """
+
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._tiles.move_to_end(key)
+        return tile
+
+    def put(self, key: tuple[int, int, int, int], tile: bytes) -> None:
+        """
+        Cache a tile, evicting the least recently used one if full.
+
+        :param key: The version, zoom level, column and row of the tile.
+        :type key: tuple[int, int, int, int]
+        :param tile: The rendered tile.
+        :type tile: bytes
+        """
+
+        self._tiles[key] = tile
+        self._tiles.move_to_end(key)
+        while len(self._tiles) > self.max_size:
+            self._tiles.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Drop all cached tiles.
+        """
+
+        self._tiles.clear()
+
+
+site_tile_cache = TileCache()
@@ -0,0 +1,91 @@
+from sqlalchemy import ColumnElement, Float, Index, func, or_
+
+
+def trigram_index(name: str, column_name: str) -> Index:
+    """
+    Build a trigram index on a text column.
+
+    The index answers fuzzy matches as well as prefix and infix patterns,
+    see :func:`matches_text`.
+
+    :param name: The name of the index.
+    :type name: str
+    :param column_name: The name of the indexed column.
+    :type column_name: str
+    :return: The index, to be added to the table arguments of a model.
+    :rtype: Index
+    """
+
+    return Index(
+        name,
+        column_name,
+        postgresql_using="gin",
+        postgresql_ops={column_name: "gin_trgm_ops"},
+    )
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def starts_with_text(column, query: str) -> ColumnElement[bool]:
+    """
+    Build a case insensitive prefix match on a text column.
+
+    :param column: The text column to match.
+    :type column: ColumnElement
+    :param query: The searched text.
+    :type query: str
+    :return: The filter clause.
+    :rtype: ColumnElement[bool]
+    """
+
+    return column.ilike(f"{_escape_like(query)}%")
+
+
+def matches_text(column, query: str) -> ColumnElement[bool]:
+    """
+    Build a fuzzy match on a text column.
+
+    A value matches if it is similar to the query as a whole, contains a
+    word similar to the query or starts with the query, ignoring case.
+    All three operators are answered by a trigram index on the column,
+    see :func:`trigram_index`.
+
+    :param column: The text column to match.
+    :type column: ColumnElement
+    :param query: The searched text.
+    :type query: str
+    :return: The filter clause.
+    :rtype: ColumnElement[bool]
+    """
+
+    return or_(
+        column.op("%")(query),
+        # the commutator of the <% operator, which keeps the indexed
+        #   column on the left
+        column.op("%>")(query),
+        starts_with_text(column, query),
+    )
+
+
+def text_score(column, query: str) -> ColumnElement[float]:
+    """
+    Build the similarity of a text column to the query, from 0 to 1.
+
+    Values containing a word similar to the query score as high as values
+    similar to the query as a whole.
+
+    :param column: The text column to score.
+    :type column: ColumnElement
+    :param query: The searched text.
+    :type query: str
+    :return: The score expression.
+    :rtype: ColumnElement[float]
+    """
+
+    return func.greatest(
+        func.similarity(column, query, type_=Float),
+        func.word_similarity(query, column, type_=Float),
+        type_=Float,
+    )
@@ -0,0 +1,364 @@
+"""
+Fill the configured database with a synthetic dataset catalogue.
+
+Generates sites spread around the globe, a VOC subclass tree of the given
+depth and fan-out, VOCs per subclass with their synonyms, contacts,
+publications and datasets
+linked to them at the given density. The same seed and volumes always
+produce the same catalogue, so benchmark results of different commits
+can be compared. The migrations are applied to the database first. Run
+it against a scratch database only, ``--reset`` removes all existing rows
+first. Start the backend afterwards, its caches
+do not see rows written here::
+
+    $ python -m backend.benchmarks.catalogue_generator --reset --datasets 100000
+"""
+
+import argparse
+import math
+import random
+import time
+from datetime import date, timedelta
+from itertools import islice
+
+from sqlalchemy import Connection, func, insert, select, text
+from sqlmodel import create_engine
+
+from backend.app.enums.time_resolution_unit_enum import TimeResolutionUnitEnum
+from backend.app.models.associations import (
+    DatasetContactLink,
+    DatasetPublicationLink,
+    DatasetVocLink,
+    DatasetVocSubclassLink,
+)
+from backend.app.models.contact import Contact
+from backend.app.models.dataset import Dataset
+from backend.app.models.publication import Publication
+from backend.app.models.site import Site
+from backend.app.models.version_counter import (
+    SITE_TILES_VERSION,
+    TAXONOMY_VERSION,
+    bump_version,
+)
+from backend.app.models.voc import Voc
+from backend.app.models.voc_subclass import VocSubclass
+from backend.app.models.voc_subclass_closure import refresh_voc_subclass_closure
+from backend.app.models.voc_synonym import VocSynonym
+from backend.app.utils.coverage_utils import refresh_coverage_views
+from backend.benchmarks.migration_utils import upgrade_database
+from backend.database import DATABASE_URL
+from backend.settings import get_settings
+
+# tables holding the catalogue, emptied by --reset
+CATALOGUE_TABLES = (
+    "datasetcontactlink",
+    "datasetpublicationlink",
+    "datasetvoclink",
+    "datasetvocsubclasslink",
+    "dataset_search",
+    "dataset",
+    "contact",
+    "publication",
+    "site",
+    "vocsynonym",
+    "voc",
+    "vocsubclassclosure",
+    "vocsubclass",
+)
+COUNTRIES = (
+    "Argentina",
+    "Australia",
+    "Brazil",
+    "Canada",
+    "Chile",
+    "China",
+    "France",
+    "Germany",
+    "India",
+    "Japan",
+    "Kenya",
+    "Mexico",
+    "Norway",
+    "South Africa",
+    "United States",
+)
+DATA_TYPES = ("in situ", "flask", "remote sensing", "model")
+FIRST_SAMPLING_DATE = date(1990, 1, 1)
+SAMPLING_DAYS = 35 * 365
+BATCH_SIZE = 5_000
+
+
+def _batches(rows: list[dict]):
+    iterator = iter(rows)
+    while batch := list(islice(iterator, BATCH_SIZE)):
+        yield batch
+
+
+def _insert(connection: Connection, model, rows: list[dict]) -> list[int]:
+    ids = []
+    for batch in _batches(rows):
+        ids.extend(
+            connection.execute(
+                insert(model).returning(model.id), batch
+            ).scalars()
+        )
+    return ids
+
+
+def _link(connection: Connection, model, rows: list[dict]) -> None:
+    for batch in _batches(rows):
+        connection.execute(insert(model), batch)
+
+
+def _random_location(rng: random.Random) -> str:
+    # uniform on the sphere, instead of crowding the poles
+    lat = math.degrees(math.asin(rng.uniform(-1, 1)))
+    lon = rng.uniform(-180, 180)
+    return f"SRID=4326;POINT({lon} {lat})"
+
+
+def _random_sampling_period(rng: random.Random) -> tuple[date, date]:
+    begin = FIRST_SAMPLING_DATE + timedelta(days=rng.randrange(SAMPLING_DAYS))
+    return begin, begin + timedelta(days=rng.randint(1, 5 * 365))
+
+
+def reset_catalogue(connection: Connection) -> None:
+    """
+    Remove all rows of the catalogue and restart their IDs.
+
+    :param connection: The connection to execute the statement on.
+    :type connection: sqlalchemy.Connection
+    """
+
+    connection.execute(
+        text(f"TRUNCATE {', '.join(CATALOGUE_TABLES)} RESTART IDENTITY")
+    )
+
+
+def generate_voc_subclasses(
+    connection: Connection, depth: int, fanout: int
+) -> list[list[int]]:
+    """
+    Add a VOC subclass tree and compute its closure rows.
+
+    :param connection: The connection to execute the statements on.
+    :type connection: sqlalchemy.Connection
+    :param depth: The number of levels of the tree.
+    :type depth: int
+    :param fanout: The number of roots and of children per subclass.
+    :type fanout: int
+    :return: The IDs of the subclasses per level, the roots first.
+    :rtype: list[list[int]]
+    """
+
+    # continue the numbering of earlier runs, the names are unique
+    first_index = connection.execute(
+        select(func.count()).select_from(VocSubclass)
+    ).scalar_one()
+
+    levels = []
+    parent_ids = [None]
+    for level in range(depth):
+        rows = [
+            {
+                "name": f"subclass-{level}-{first_index + index}",
+                "parent_voc_category_id": parent_id,
+            }
+            for index, parent_id in enumerate(
+                parent_id for parent_id in parent_ids for _ in range(fanout)
+            )
+        ]
+        parent_ids = _insert(connection, VocSubclass, rows)
+        levels.append(parent_ids)
+
+    refresh_voc_subclass_closure(connection)
+    bump_version(connection, TAXONOMY_VERSION)
+    return levels
+
+
+def generate_catalogue(
+    connection: Connection, args: argparse.Namespace
+) -> dict:
+    """
+    Add a synthetic catalogue with the given volumes.
+
+    VOCs belong to the leaves of the subclass tree. Datasets link to
+    random VOCs, subclasses, contacts and publications, each with the
+    given number of links per dataset.
+
+    :param connection: The connection to execute the statements on.
+    :type connection: sqlalchemy.Connection
+    :param args: The volumes and seed of the catalogue.
+    :type args: argparse.Namespace
+    :return: The number of rows added per table.
+    :rtype: dict
+    """
+
+    rng = random.Random(args.seed)
+
+    site_ids = _insert(
+        connection,
+        Site,
+        [
+            {
+                "name": f"site-{index}",
+                "country": rng.choice(COUNTRIES),
+                "geo_location": _random_location(rng),
+            }
+            for index in range(args.sites)
+        ],
+    )
+
+    levels = generate_voc_subclasses(
+        connection, args.subclass_depth, args.subclass_fanout
+    )
+    subclass_ids = [subclass_id for level in levels for subclass_id in level]
+    voc_ids = _insert(
+        connection,
+        Voc,
+        [
+            {
+                "name": f"voc-{subclass_id}-{index}",
+                "voc_subclass_id": subclass_id,
+            }
+            for subclass_id in levels[-1]
+            for index in range(args.vocs_per_subclass)
+        ],
+    )
+    bump_version(connection, TAXONOMY_VERSION)
+    synonym_ids = _insert(
+        connection,
+        VocSynonym,
+        [
+            {"name": f"synonym-{voc_id}-{index}", "voc_id": voc_id}
+            for voc_id in voc_ids
+            for index in range(args.synonyms_per_voc)
+        ],
+    )
+
+    contact_ids = _insert(
+        connection,
+        Contact,
+        [
+            {
+                "name": f"contact-{index}",
+                "email": f"contact-{index}@example.org",
+            }
+            for index in range(args.contacts)
+        ],
+    )
+    publication_ids = _insert(
+        connection,
+        Publication,
+        [
+            {"link": f"https://example.org/publication/{index}"}
+            for index in range(args.publications)
+        ],
+    )
+
+    dataset_rows = []
+    for _ in range(args.datasets):
+        begin, end = _random_sampling_period(rng)
+        dataset_rows.append(
+            {
+                "site_id": rng.choice(site_ids),
+                "sampling_period_begin": begin,
+                "sampling_period_end": end,
+                "time_resolution_unit": rng.choice(
+                    list(TimeResolutionUnitEnum)
+                ),
+                "time_resolution_interval": rng.randint(1, 24),
+                "data_type": rng.choice(DATA_TYPES),
+            }
+        )
+    dataset_ids = _insert(connection, Dataset, dataset_rows)
+    bump_version(connection, SITE_TILES_VERSION)
+
+    # link tables, with the number of links per dataset and the linked IDs
+    links = (
+        (DatasetVocLink, "voc_id", args.vocs_per_dataset, voc_ids),
+        (
+            DatasetVocSubclassLink,
+            "voc_subclass_id",
+            args.subclasses_per_dataset,
+            subclass_ids,
+        ),
+        (
+            DatasetContactLink,
+            "contact_id",
+            args.contacts_per_dataset,
+            contact_ids,
+        ),
+        (
+            DatasetPublicationLink,
+            "publication_id",
+            args.publications_per_dataset,
+            publication_ids,
+        ),
+    )
+    counts = {
+        "site": len(site_ids),
+        "vocsubclass": len(subclass_ids),
+        "voc": len(voc_ids),
+        "vocsynonym": len(synonym_ids),
+        "contact": len(contact_ids),
+        "publication": len(publication_ids),
+        "dataset": len(dataset_ids),
+    }
+    for model, column, per_dataset, linked_ids in links:
+        rows = [
+            {"dataset_id": dataset_id, column: linked_id}
+            for dataset_id in dataset_ids
+            for linked_id in rng.sample(
+                linked_ids, min(per_dataset, len(linked_ids))
+            )
+        ]
+        _link(connection, model, rows)
+        counts[model.__tablename__] = len(rows)
+
+    return counts
+
+
+def main(args: argparse.Namespace) -> None:
+    settings = get_settings()
+    engine = create_engine(DATABASE_URL)
+
+    start = time.perf_counter()
+    upgrade_database()
+    with engine.begin() as connection:
+        if args.reset:
+            reset_catalogue(connection)
+
+        counts = generate_catalogue(connection, args)
+
+        if settings.coverage_materialized:
+            refresh_coverage_views(connection)
+
+    # refresh the planner statistics, so benchmarks start from fresh plans
+    with engine.connect().execution_options(
+        isolation_level="AUTOCOMMIT"
+    ) as connection:
+        connection.execute(text("ANALYZE"))
+
+    for table_name, count in counts.items():
+        print(f"{table_name:>24} {count:>10}")
+    print(f"generated in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true")
+    parser.add_argument("--sites", type=int, default=2_000)
+    parser.add_argument("--subclass-depth", type=int, default=3)
+    parser.add_argument("--subclass-fanout", type=int, default=4)
+    parser.add_argument("--vocs-per-subclass", type=int, default=5)
+    parser.add_argument("--synonyms-per-voc", type=int, default=1)
+    parser.add_argument("--contacts", type=int, default=500)
+    parser.add_argument("--publications", type=int, default=1_000)
+    parser.add_argument("--datasets", type=int, default=20_000)
+    parser.add_argument("--vocs-per-dataset", type=int, default=3)
+    parser.add_argument("--subclasses-per-dataset", type=int, default=1)
+    parser.add_argument("--contacts-per-dataset", type=int, default=1)
+    parser.add_argument("--publications-per-dataset", type=int, default=1)
+    main(parser.parse_args())
@@ -0,0 +1,125 @@
+"""
+Benchmark request throughput of a running backend under parallel clients.
+
+Sends a fixed number of requests per concurrency level to the given paths
+and reports throughput and latency percentiles. Run it against a build
+before and after a change to compare them::
+
+    $ python -m backend.benchmarks.concurrency --base-url http://localhost:80
+"""
+
+import argparse
+import asyncio
+import re
+import statistics
+import time
+
+import httpx
+
+DEFAULT_PATHS = ("/datasets/", "/sites/", "/vocs/", "/voc-subclasses/")
+# the statement count reported by the backend in the Server-Timing header
+STATEMENTS_PATTERN = re.compile(r'db;[^,]*desc="(\d+) statements')
+
+
+def get_statement_count(response: httpx.Response) -> int | None:
+    """
+    Read the number of SQL statements a request ran from its response.
+
+    :param response: The response of the backend.
+    :type response: httpx.Response
+    :return: The number of statements, None if the backend did not report
+        them.
+    :rtype: int | None
+    """
+
+    match = STATEMENTS_PATTERN.search(response.headers.get("server-timing", ""))
+    return int(match.group(1)) if match else None
+
+
+async def run_level(
+    client: httpx.AsyncClient, paths: list[str], concurrency: int, total: int
+) -> dict:
+    """
+    Send requests with a fixed number of parallel clients.
+
+    :param client: The HTTP client bound to the backend.
+    :type client: httpx.AsyncClient
+    :param paths: The paths to request, cycled through.
+    :type paths: list[str]
+    :param concurrency: The number of parallel clients.
+    :type concurrency: int
+    :param total: The total number of requests to send.
+    :type total: int
+    :return: Throughput, latency percentiles, statements per request and
+        error count.
+    :rtype: dict
+    """
+
+    queue = asyncio.Queue()
+    for index in range(total):
+        queue.put_nowait(paths[index % len(paths)])
+
+    timings = []
+    statement_counts = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        while not queue.empty():
+            path = queue.get_nowait()
+            start = time.perf_counter()
+            response = await client.get(path)
+            timings.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+            statement_count = get_statement_count(response)
+            if statement_count is not None:
+                statement_counts.append(statement_count)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    timings.sort()
+    return {
+        "concurrency": concurrency,
+        "requests_per_second": total / elapsed,
+        "p50_ms": statistics.median(timings),
+        "p99_ms": timings[max(int(len(timings) * 0.99) - 1, 0)],
+        "queries_per_request": (
+            statistics.mean(statement_counts) if statement_counts else None
+        ),
+        "errors": errors,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=60
+    ) as client:
+        print(
+            f"{'clients':>8} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10}"
+            f" {'errors':>8}"
+        )
+        for concurrency in args.concurrency:
+            result = await run_level(
+                client, args.paths, concurrency, args.requests
+            )
+            print(
+                f"{result['concurrency']:>8}"
+                f" {result['requests_per_second']:>10.1f}"
+                f" {result['p50_ms']:>10.1f} {result['p99_ms']:>10.1f}"
+                f" {result['errors']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:80")
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 8, 32, 64]
+    )
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--paths", nargs="+", default=list(DEFAULT_PATHS))
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,108 @@
+"""
+Benchmark GET /datasets/by-subclass/{subclass_name} against dataset count.
+
+Seeds a small VOC subclass hierarchy and an increasing number of datasets
+into the configured database and reports the endpoint latency per step.
+Run it against a scratch database only, seeded rows are not removed::
+
+    $ python -m backend.benchmarks.datasets_by_subclass
+"""
+
+import statistics
+import time
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, create_engine
+
+from backend.app.main import app
+from backend.app.models.associations import DatasetVocSubclassLink
+from backend.app.models.dataset import Dataset
+from backend.app.models.voc import Voc
+from backend.app.models.voc_subclass import VocSubclass
+from backend.database import DATABASE_URL
+
+DATASET_COUNTS = (100, 1_000, 10_000)
+REPETITIONS = 20
+
+
+def seed_hierarchy(session: Session) -> tuple[VocSubclass, VocSubclass, Voc]:
+    """
+    Create a root subclass with one child and a VOC linked to the child.
+
+    :param session: The database session.
+    :type session: Session
+    :return: The root subclass, the child subclass and the VOC.
+    :rtype: tuple[VocSubclass, VocSubclass, Voc]
+    """
+
+    root = VocSubclass(name=f"benchmark-root-{time.time_ns()}")
+    child = VocSubclass(name=f"benchmark-child-{time.time_ns()}")
+    child.parent_voc_category = root
+    voc = Voc(name="benchmark-voc", voc_subclass=child)
+    session.add_all([root, child, voc])
+    session.commit()
+    return root, child, voc
+
+
+def seed_datasets(
+    session: Session, count: int, child: VocSubclass, voc: Voc
+) -> None:
+    """
+    Add datasets, alternately linked to the child subclass and the VOC.
+
+    :param session: The database session.
+    :type session: Session
+    :param count: The number of datasets to add.
+    :type count: int
+    :param child: The subclass to link every second dataset to.
+    :type child: VocSubclass
+    :param voc: The VOC to link the remaining datasets to.
+    :type voc: Voc
+    """
+
+    for index in range(count):
+        dataset = Dataset(data_type="benchmark")
+        if index % 2:
+            dataset.vocs = [voc]
+        session.add(dataset)
+        session.flush()
+        if not index % 2:
+            session.add(
+                DatasetVocSubclassLink(
+                    dataset_id=dataset.id, voc_subclass_id=child.id
+                )
+            )
+    session.commit()
+
+
+def main() -> None:
+    # seed through a synchronous engine, the app itself runs async
+    engine = create_engine(DATABASE_URL)
+
+    with TestClient(app) as client, Session(engine) as session:
+        root, child, voc = seed_hierarchy(session)
+        root_name = root.name
+
+        seeded = 0
+        print(f"{'datasets':>10} {'median ms':>10} {'p95 ms':>10}")
+        for count in DATASET_COUNTS:
+            seed_datasets(session, count - seeded, child, voc)
+            seeded = count
+
+            timings = []
+            for _ in range(REPETITIONS):
+                start = time.perf_counter()
+                response = client.get(f"/datasets/by-subclass/{root_name}")
+                timings.append((time.perf_counter() - start) * 1000)
+                response.raise_for_status()
+
+            timings.sort()
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            print(
+                f"{count:>10} {statistics.median(timings):>10.1f}"
+                f" {p95:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
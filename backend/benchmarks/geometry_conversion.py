@@ -0,0 +1,116 @@
+"""
+Benchmark the conversion of site locations between PostGIS and GeoJSON.
+
+Compares the per row cost of the former shapely round trips with the
+current conversions, for loading and for inserting sites. Runs in memory
+and needs no database::
+
+    $ python -m backend.benchmarks.geometry_conversion
+"""
+
+import random
+import time
+
+import shapely
+from geoalchemy2 import WKBElement
+from geoalchemy2.shape import to_shape
+from geojson_pydantic import Point
+from shapely import wkt
+from shapely.geometry import shape
+
+from backend.app.utils.geometry_utils import (  # noqa: E501
+    geojson_to_geometry,
+    geometry_to_geojson,
+)
+
+SITE_COUNT = 100_000
+
+
+def shapely_geometry_to_geojson(geometry: WKBElement) -> Point:
+    """
+    Former load conversion, parsing every row through a shapely geometry.
+    """
+
+    return Point(**to_shape(geometry).__geo_interface__)
+
+
+def shapely_geojson_to_geometry(geo_location: Point) -> str:
+    """
+    Former insert conversion, formatting every row through shapely.
+    """
+
+    return wkt.dumps(shape(geo_location))
+
+
+def measure(name: str, convert, count: int) -> None:
+    """
+    Run a conversion and print its cost per row.
+
+    :param name: The name of the conversion.
+    :type name: str
+    :param convert: A callable converting all rows.
+    :type convert: Callable
+    :param count: The number of rows converted per call.
+    :type count: int
+    """
+
+    start = time.perf_counter()
+    convert()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:<32} {elapsed * 1000:>9.1f} ms {elapsed / count * 1e6:>7.2f} us"
+    )
+
+
+def main() -> None:
+    # locations as returned by the database, extended WKB with SRID
+    points = shapely.set_srid(
+        shapely.points(
+            [random.uniform(-180, 180) for _ in range(SITE_COUNT)],
+            [random.uniform(-90, 90) for _ in range(SITE_COUNT)],
+        ),
+        4326,
+    )
+    geometries = [
+        WKBElement(wkb, srid=4326, extended=True)
+        for wkb in shapely.to_wkb(points, include_srid=True)
+    ]
+    geo_locations = [geometry_to_geojson(g) for g in geometries]
+
+    print(f"{'conversion':<32} {'total':>12} {'per row':>10}")
+    measure(
+        "load, shapely per row",
+        lambda: [shapely_geometry_to_geojson(g) for g in geometries],
+        SITE_COUNT,
+    )
+    measure(
+        "load, WKB decoding per row",
+        lambda: [geometry_to_geojson(g) for g in geometries],
+        SITE_COUNT,
+    )
+    # reference: parsing all rows with one vectorised shapely call costs
+    #   about as much as decoding them, building the Points dominates
+    measure(
+        "load, vectorised shapely batch",
+        lambda: [
+            Point(type="Point", coordinates=position)
+            for position in shapely.get_coordinates(
+                shapely.from_wkb([g.data for g in geometries])
+            ).tolist()
+        ],
+        SITE_COUNT,
+    )
+    measure(
+        "insert, shapely per row",
+        lambda: [shapely_geojson_to_geometry(p) for p in geo_locations],
+        SITE_COUNT,
+    )
+    measure(
+        "insert, WKT formatting per row",
+        lambda: [geojson_to_geometry(p) for p in geo_locations],
+        SITE_COUNT,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Load test every read endpoint of a running backend and report it as JSON.
+
+Picks a site, dataset, VOC and VOC subclass from the catalogue through the
+API, then sends a fixed number of requests to each endpoint per
+concurrency level. Latency percentiles, throughput, SQL statements per
+request and errors are written as JSON together with the current commit,
+so reports of different commits can be compared. Fill the database with
+``backend.benchmarks.catalogue_generator`` first::
+
+    $ python -m backend.benchmarks.load_test --output before.json
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+from datetime import datetime, timezone
+
+import httpx
+
+from backend.benchmarks.concurrency import run_level
+
+# the read endpoints and the paths requesting them, filled in with the
+#   sample values of the catalogue. Routes whose path parameters are named
+#   with hyphens read them from the query, so they are passed twice
+ENDPOINTS = {
+    "/contacts/": "/contacts/",
+    "/contacts/by-dataset/{dataset_id}": "/contacts/by-dataset/{dataset_id}",
+    "/coverage/by-country": "/coverage/by-country",
+    "/coverage/by-grid": "/coverage/by-grid",
+    "/coverage/by-voc-subclass": "/coverage/by-voc-subclass",
+    "/coverage/by-year": "/coverage/by-year",
+    "/datasets/": "/datasets/",
+    "/datasets/?include": "/datasets/?include=site,vocs,voc_subclasses",
+    "/datasets/export": "/datasets/export",
+    "/datasets/near": "/datasets/near?lon={lon}&lat={lat}&radius_km=500",
+    "/datasets/search": (
+        "/datasets/search?country={country}"
+        "&voc_subclass_name={voc_subclass_name}"
+        "&sampled_from=2000-01-01&sampled_to=2010-12-31"
+    ),
+    "/datasets/by-site/{site_id}": "/datasets/by-site/{site_id}",
+    "/datasets/by-country/{country}": "/datasets/by-country/{country}",
+    "/datasets/by-subclass/{subclass_name}": (
+        "/datasets/by-subclass/{voc_subclass_name}"
+    ),
+    "/datasets/by-area/{min_lon}/{min_lat}/{max_lon}/{max_lat}/": (
+        "/datasets/by-area/{min_lon}/{min_lat}/{max_lon}/{max_lat}/"
+    ),
+    "/metrics": "/metrics",
+    "/publications/": "/publications/",
+    "/search/": "/search/?q={voc_subclass_name}",
+    "/sites/": "/sites/",
+    "/sites/near": "/sites/near?lon={lon}&lat={lat}&radius_km=500",
+    "/sites/tiles/{z}/{x}/{y}.mvt": "/sites/tiles/2/2/1.mvt",
+    "/sites/{site-id}": "/sites/{site_id}?site_id={site_id}",
+    "/sites/by-area/{min_lon}/{min_lat}/{max_lon}/{max_lat}/": (
+        "/sites/by-area/{min_lon}/{min_lat}/{max_lon}/{max_lat}/"
+    ),
+    "/voc-subclasses/": "/voc-subclasses/",
+    "/voc-subclasses/by-voc-id/{voc-id}": (
+        "/voc-subclasses/by-voc-id/{voc_id}?voc_id={voc_id}"
+    ),
+    "/vocs/": "/vocs/",
+    "/vocs/by-subclass/{subclass-name}": (
+        "/vocs/by-subclass/{voc_subclass_name}"
+        "?subclass_name={voc_subclass_name}"
+    ),
+}
+# half the edge length of the bounding box around the sample site, degrees
+AREA_SIZE = 10
+
+
+async def _first_item(client: httpx.AsyncClient, path: str) -> dict:
+    response = await client.get(path, params={"limit": 1})
+    response.raise_for_status()
+    items = response.json()["items"]
+    if not items:
+        raise SystemExit(f"{path} is empty, generate a catalogue first")
+    return items[0]
+
+
+async def get_samples(client: httpx.AsyncClient) -> dict:
+    """
+    Pick the values the endpoint paths are filled in with.
+
+    :param client: The HTTP client bound to the backend.
+    :type client: httpx.AsyncClient
+    :return: The sample values by name.
+    :rtype: dict
+    """
+
+    site = await _first_item(client, "/sites/")
+    dataset = await _first_item(client, "/datasets/")
+    voc = await _first_item(client, "/vocs/")
+    voc_subclass = await _first_item(client, "/voc-subclasses/")
+
+    lon, lat = site["geo_location"]["coordinates"]
+    return {
+        "site_id": site["id"],
+        "country": site["country"],
+        "lon": lon,
+        "lat": lat,
+        "min_lon": max(lon - AREA_SIZE, -180),
+        "min_lat": max(lat - AREA_SIZE, -90),
+        "max_lon": min(lon + AREA_SIZE, 180),
+        "max_lat": min(lat + AREA_SIZE, 90),
+        "dataset_id": dataset["id"],
+        "voc_id": voc["id"],
+        "voc_subclass_name": voc_subclass["name"],
+    }
+
+
+def get_commit() -> str | None:
+    """
+    Get the commit of the working tree, marked if it has local changes.
+
+    :return: The commit hash, None outside of a git checkout.
+    :rtype: str | None
+    """
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+        changes = subprocess.run(
+            ["git", "status", "--porcelain"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-dirty" if changes else commit
+
+
+async def main(args: argparse.Namespace) -> None:
+    # bypass the response cache unless asked for, to measure the queries
+    headers = {} if args.cached else {"Cache-Control": "no-cache"}
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    async with httpx.AsyncClient(
+        base_url=args.base_url, headers=headers, limits=limits, timeout=120
+    ) as client:
+        samples = await get_samples(client)
+        results = {}
+        for name, path in ENDPOINTS.items():
+            if args.endpoints and name not in args.endpoints:
+                continue
+            results[name] = []
+            for concurrency in args.concurrency:
+                result = await run_level(
+                    client, [path.format(**samples)], concurrency, args.requests
+                )
+                results[name].append(result)
+                print(
+                    f"{name:<60} {concurrency:>4}"
+                    f" {result['requests_per_second']:>8.1f} req/s"
+                    f" p50 {result['p50_ms']:>8.1f} ms"
+                    f" p99 {result['p99_ms']:>8.1f} ms"
+                    f" {result['errors']:>4} errors"
+                )
+
+    report = {
+        "commit": get_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "base_url": args.base_url,
+        "cached": args.cached,
+        "requests": args.requests,
+        "samples": samples,
+        "results": results,
+    }
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"report written to {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:80")
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 8, 32]
+    )
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument(
+        "--endpoints",
+        nargs="+",
+        choices=list(ENDPOINTS),
+        help="only test these endpoints",
+    )
+    parser.add_argument(
+        "--cached",
+        action="store_true",
+        help="let the backend answer from its response cache",
+    )
+    parser.add_argument("--output", default="load_test.json")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,22 @@
+"""
+Helper to prepare the configured database for the benchmarks.
+"""
+
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+
+ALEMBIC_INI = Path(__file__).parents[1] / "alembic.ini"
+
+
+def upgrade_database() -> None:
+    """
+    Apply the migrations to the configured database.
+
+    The benchmarks get the same schema as the backend, including the
+    triggers and views the models do not describe. Databases already at
+    the latest revision are left as they are.
+    """
+
+    command.upgrade(Config(str(ALEMBIC_INI)), "head")
@@ -0,0 +1,216 @@
+"""
+Check the latency of the name search on a catalogue of a million names.
+
+Seeds sites, contacts, VOC subclasses, VOCs and VOC synonyms with random
+pronounceable names into the configured database, then runs the query
+behind GET /search for misspelled names, name prefixes and synonyms. Fails
+if the slowest queries exceed the latency target or if the query does not
+scan the trigram indexes. Run it against a scratch database only, seeded
+rows are not removed::
+
+    $ python -m backend.benchmarks.name_search_latency
+"""
+
+import random
+import statistics
+import sys
+import time
+from itertools import islice
+
+from sqlalchemy import insert, text
+from sqlmodel import Session, create_engine
+
+from backend.app.enums.search_type_enum import SearchTypeEnum
+from backend.app.models.contact import Contact
+from backend.app.models.site import Site
+from backend.app.models.voc import Voc
+from backend.app.models.voc_subclass import VocSubclass
+from backend.app.models.voc_synonym import VocSynonym
+from backend.app.utils.name_search_utils import get_name_search_query
+from backend.app.utils.plan_utils import explain, uses_index
+from backend.benchmarks.migration_utils import upgrade_database
+from backend.database import DATABASE_URL
+
+SITE_COUNT = 700_000
+CONTACT_COUNT = 200_000
+VOC_SUBCLASS_COUNT = 5_000
+VOC_COUNT = 50_000
+QUERY_COUNT = 50
+REPETITIONS = 5
+RESULT_LIMIT = 20
+LATENCY_TARGET_MS = 100
+BATCH_SIZE = 10_000
+SYLLABLES = (
+    "ba be bi bo bu da de di do du ka ke ki ko ku la le li lo lu ma me mi"
+    " mo mu na ne ni no nu ra re ri ro ru sa se si so su ta te ti to tu"
+    " zan ben tol mer vik hex eth pro but chlor"
+).split()
+COUNTRIES = ("Austria", "Brazil", "Canada", "Germany", "Japan", "Kenya")
+TRIGRAM_INDEXES = (
+    "idx_contact_name_trgm",
+    "idx_site_country_trgm",
+    "idx_site_name_trgm",
+    "idx_site_region_trgm",
+    "idx_voc_name_trgm",
+    "idx_vocsubclass_name_trgm",
+    "idx_vocsynonym_name_trgm",
+)
+
+
+def make_word(rng: random.Random) -> str:
+    """
+    Build a random pronounceable word.
+
+    :param rng: The random number generator.
+    :type rng: random.Random
+    :return: The capitalized word.
+    :rtype: str
+    """
+
+    syllables = rng.choices(SYLLABLES, k=rng.randint(2, 4))
+    return "".join(syllables).capitalize()
+
+
+def misspell(rng: random.Random, name: str) -> str:
+    """
+    Swap two adjacent characters of a name.
+
+    :param rng: The random number generator.
+    :type rng: random.Random
+    :param name: The name to misspell.
+    :type name: str
+    :return: The misspelled name.
+    :rtype: str
+    """
+
+    characters = list(name)
+    index = rng.randrange(1, len(characters) - 1)
+    characters[index], characters[index + 1] = (
+        characters[index + 1],
+        characters[index],
+    )
+    return "".join(characters)
+
+
+def _insert(session: Session, model, rows: list[dict]) -> list[int]:
+    ids = []
+    iterator = iter(rows)
+    while batch := list(islice(iterator, BATCH_SIZE)):
+        ids.extend(
+            session.execute(insert(model).returning(model.id), batch).scalars()
+        )
+    return ids
+
+
+def seed_names(session: Session, rng: random.Random) -> list[str]:
+    """
+    Add objects of every searched type with random names.
+
+    :param session: The database session.
+    :type session: Session
+    :param rng: The random number generator.
+    :type rng: random.Random
+    :return: The queries to time, misspelled names, prefixes and synonyms.
+    :rtype: list[str]
+    """
+
+    site_names = [
+        f"{make_word(rng)} {make_word(rng)}" for _ in range(SITE_COUNT)
+    ]
+    _insert(
+        session,
+        Site,
+        [
+            {
+                "name": name,
+                "region": make_word(rng),
+                "country": rng.choice(COUNTRIES),
+                "geo_location": "SRID=4326;POINT(0 0)",
+            }
+            for name in site_names
+        ],
+    )
+    contact_names = [
+        f"{make_word(rng)} {make_word(rng)}" for _ in range(CONTACT_COUNT)
+    ]
+    _insert(session, Contact, [{"name": name} for name in contact_names])
+    # VOC subclass names are unique
+    voc_subclass_names = set()
+    while len(voc_subclass_names) < VOC_SUBCLASS_COUNT:
+        voc_subclass_names.add(make_word(rng))
+    voc_subclass_ids = _insert(
+        session,
+        VocSubclass,
+        [{"name": name} for name in sorted(voc_subclass_names)],
+    )
+    voc_ids = _insert(
+        session,
+        Voc,
+        [
+            {"name": make_word(rng), "voc_subclass_id": voc_subclass_id}
+            for voc_subclass_id in rng.choices(voc_subclass_ids, k=VOC_COUNT)
+        ],
+    )
+    synonyms = [make_word(rng) for _ in voc_ids]
+    _insert(
+        session,
+        VocSynonym,
+        [
+            {"name": name, "voc_id": voc_id}
+            for name, voc_id in zip(synonyms, voc_ids)
+        ],
+    )
+    for table_name in ("site", "contact", "vocsubclass", "voc", "vocsynonym"):
+        session.execute(text(f"ANALYZE {table_name}"))
+    session.commit()
+
+    queries = []
+    for _ in range(QUERY_COUNT // 3):
+        queries.append(misspell(rng, rng.choice(site_names)))
+        queries.append(rng.choice(contact_names)[:4])
+        queries.append(rng.choice(synonyms))
+    return queries
+
+
+def main() -> None:
+    upgrade_database()
+    engine = create_engine(DATABASE_URL)
+    rng = random.Random(42)
+
+    with Session(engine) as session:
+        queries = seed_names(session, rng)
+
+        failed = False
+        plan = explain(
+            session,
+            get_name_search_query(queries[0], SearchTypeEnum, RESULT_LIMIT),
+        )
+        for index_name in TRIGRAM_INDEXES:
+            used = uses_index(plan, index_name)
+            failed = failed or not used
+            print(f"{'ok' if used else 'FAIL':<5} {index_name}")
+
+        timings = []
+        for query in queries:
+            statement = get_name_search_query(
+                query, SearchTypeEnum, RESULT_LIMIT
+            )
+            for _ in range(REPETITIONS):
+                start = time.perf_counter()
+                session.execute(statement).all()
+                timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    p99 = timings[max(int(len(timings) * 0.99) - 1, 0)]
+    ok = p99 <= LATENCY_TARGET_MS
+    failed = failed or not ok
+    print(
+        f"{'ok' if ok else 'FAIL':<5} p50 {statistics.median(timings):.1f} ms,"
+        f" p99 {p99:.1f} ms, target {LATENCY_TARGET_MS} ms"
+    )
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark sampling period filters against naive begin and end comparisons.
+
+Seeds datasets with random sampling periods into the configured database,
+then times the range filter behind GET /datasets/search, which is answered
+from the range index of the dataset search table, against the equivalent
+comparisons of the begin and end dates of the dataset table. Fails if the
+range filter does not scan the index. Run it against a scratch database
+only, seeded rows are not removed::
+
+    $ python -m backend.benchmarks.sampling_period_plan
+"""
+
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import insert, or_, text
+from sqlmodel import Session, col, create_engine, select
+
+from backend.app.models.dataset import Dataset
+from backend.app.models.dataset_search import DatasetSearch
+from backend.app.utils.plan_utils import explain, uses_index
+from backend.app.utils.search_utils import sampled_within
+from backend.benchmarks.migration_utils import upgrade_database
+from backend.database import DATABASE_URL
+
+DATASET_COUNT = 200_000
+REPETITIONS = 20
+INDEX_NAME = "idx_dataset_search_sampling_period"
+FIRST_DAY = date(1990, 1, 1)
+LAST_DAY = date(2024, 12, 31)
+# length of the searched periods in days
+WINDOWS = (7, 30, 365)
+
+
+def seed_datasets(session: Session, count: int) -> None:
+    """
+    Add datasets sampled for up to a year, some of them still ongoing.
+
+    :param session: The database session.
+    :type session: Session
+    :param count: The number of datasets to add.
+    :type count: int
+    """
+
+    span = (LAST_DAY - FIRST_DAY).days
+    rows = []
+    for _ in range(count):
+        begin = FIRST_DAY + timedelta(days=random.randrange(span))
+        end = begin + timedelta(days=random.randint(1, 365))
+        rows.append(
+            {
+                "data_type": "benchmark",
+                "sampling_period_begin": begin,
+                "sampling_period_end": end if random.random() > 0.01 else None,
+            }
+        )
+    session.execute(insert(Dataset), rows)
+    session.execute(text("ANALYZE dataset"))
+    session.execute(text("ANALYZE dataset_search"))
+    session.commit()
+
+
+def naive_filter(sampled_from: date, sampled_to: date):
+    """
+    Build the overlap filter as comparisons of the begin and end dates.
+
+    :param sampled_from: The first day of the period.
+    :type sampled_from: date
+    :param sampled_to: The last day of the period.
+    :type sampled_to: date
+    :return: The filter clauses.
+    :rtype: list[ColumnElement[bool]]
+    """
+
+    return [
+        or_(
+            col(Dataset.sampling_period_end).is_(None),
+            col(Dataset.sampling_period_end) >= sampled_from,
+        ),
+        or_(
+            col(Dataset.sampling_period_begin).is_(None),
+            col(Dataset.sampling_period_begin) <= sampled_to,
+        ),
+    ]
+
+
+def time_statement(session: Session, statement) -> float:
+    """
+    Measure the median execution time of a statement.
+
+    :param session: The database session.
+    :type session: Session
+    :param statement: The statement to execute.
+    :type statement: Executable
+    :return: The median time in milliseconds.
+    :rtype: float
+    """
+
+    timings = []
+    for _ in range(REPETITIONS):
+        start = time.perf_counter()
+        session.execute(statement).all()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    upgrade_database()
+    engine = create_engine(DATABASE_URL)
+
+    with Session(engine) as session:
+        seed_datasets(session, DATASET_COUNT)
+
+        failed = False
+        print(f"{'days':>6} {'range ms':>10} {'naive ms':>10} {'index':>6}")
+        for days in WINDOWS:
+            sampled_from = date(2010, 6, 1)
+            sampled_to = sampled_from + timedelta(days=days - 1)
+
+            ranged = select(DatasetSearch.dataset_id).where(
+                sampled_within(sampled_from, sampled_to)
+            )
+            naive = select(Dataset.id).where(
+                *naive_filter(sampled_from, sampled_to)
+            )
+
+            used = uses_index(explain(session, ranged), INDEX_NAME)
+            failed = failed or not used
+            print(
+                f"{days:>6} {time_statement(session, ranged):>10.1f}"
+                f" {time_statement(session, naive):>10.1f}"
+                f" {'yes' if used else 'NO':>6}"
+            )
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark the serialisation of large list responses.
+
+Compares the default FastAPI serialisation, through ``jsonable_encoder``
+or the response model, with the orjson based response of the list
+endpoints, for pages of datasets and sites. Runs in memory and needs no
+database::
+
+    $ python -m backend.benchmarks.serialization
+"""
+
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from geojson_pydantic import Point
+
+from backend.app.enums.time_resolution_unit_enum import TimeResolutionUnitEnum
+from backend.app.models.dataset import Dataset
+from backend.app.models.dataset_read import DatasetRead
+from backend.app.models.site import Site
+from backend.app.utils.serialization_utils import FastJSONResponse
+
+ITEM_COUNT = 10_000
+REPETITIONS = 5
+
+
+def build_sites(count: int) -> list[Site]:
+    """
+    Build sites at random locations.
+
+    :param count: The number of sites.
+    :type count: int
+    :return: The sites.
+    :rtype: list[Site]
+    """
+
+    return [
+        Site(
+            id=index,
+            name=f"site {index}",
+            country="benchmark",
+            geo_location=Point(
+                type="Point",
+                coordinates=(
+                    random.uniform(-180, 180),
+                    random.uniform(-90, 90),
+                ),
+            ),
+        )
+        for index in range(count)
+    ]
+
+
+def build_datasets(sites: list[Site]) -> list[DatasetRead]:
+    """
+    Build one dataset per site, embedding the site.
+
+    :param sites: The sites of the datasets.
+    :type sites: list[Site]
+    :return: The datasets as returned with ``include=site``.
+    :rtype: list[DatasetRead]
+    """
+
+    datasets = []
+    for site in sites:
+        begin = date(2000, 1, 1) + timedelta(days=random.randrange(7000))
+        dataset = Dataset(
+            id=site.id,
+            site_id=site.id,
+            sampling_period_begin=begin,
+            sampling_period_end=begin + timedelta(days=365),
+            time_resolution_unit=TimeResolutionUnitEnum.HOUR,
+            time_resolution_interval=1,
+            data_type="benchmark",
+        )
+        datasets.append(DatasetRead(**dataset.model_dump(), site=site))
+    return datasets
+
+
+def measure(name: str, serialise, count: int) -> None:
+    """
+    Run a serialisation repeatedly and print its throughput.
+
+    :param name: The name of the serialisation.
+    :type name: str
+    :param serialise: A callable serialising all items once.
+    :type serialise: Callable
+    :param count: The number of items serialised per call.
+    :type count: int
+    """
+
+    timings = []
+    for _ in range(REPETITIONS):
+        start = time.perf_counter()
+        serialise()
+        timings.append(time.perf_counter() - start)
+    elapsed = min(timings)
+    print(
+        f"{name:<40} {elapsed * 1000:>9.1f} ms"
+        f" {count / elapsed:>12,.0f} items/s"
+    )
+
+
+def main() -> None:
+    sites = build_sites(ITEM_COUNT)
+    datasets = build_datasets(sites)
+    site_page = {"items": sites, "next_cursor": None}
+    dataset_field = create_response_field("response", list[DatasetRead])
+
+    def serialise_with_response_model():
+        content = asyncio.run(
+            serialize_response(field=dataset_field, response_content=datasets)
+        )
+        return JSONResponse(content).body
+
+    print(f"{'serialisation':<40} {'total':>12} {'throughput':>18}")
+    measure(
+        "sites page, jsonable_encoder",
+        lambda: JSONResponse(jsonable_encoder(site_page)).body,
+        ITEM_COUNT,
+    )
+    measure(
+        "sites page, orjson",
+        lambda: FastJSONResponse(site_page).body,
+        ITEM_COUNT,
+    )
+    measure(
+        "datasets with site, response model",
+        serialise_with_response_model,
+        ITEM_COUNT,
+    )
+    measure(
+        "datasets with site, orjson",
+        lambda: FastJSONResponse(datasets).body,
+        ITEM_COUNT,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,107 @@
-import os
-
-from dotenv import load_dotenv
-from sqlmodel import Session, SQLModel, create_engine
-
-from backend.app.models.associations import DatasetContactLink  # noqa: F401
-from backend.app.models.associations import DatasetPublicationLink  # noqa: F401
-from backend.app.models.associations import DatasetVocLink  # noqa: F401
-from backend.app.models.associations import DatasetVocSubclassLink  # noqa: F401
-from backend.app.models.contact import Contact  # noqa: F401
-from backend.app.models.dataset import Dataset  # noqa: F401
-from backend.app.models.publication import Publication  # noqa: F401
-from backend.app.models.site import Site  # noqa: F401
-from backend.app.models.voc import Voc  # noqa: F401
-from backend.app.models.voc_subclass import VocSubclass  # noqa: F401
-
-# load env variables from env file
-load_dotenv(dotenv_path="../database.env")
-
-# retrieve the environment variables for the database connection
-ENV_POSTGRES_USER = os.getenv("POSTGRES_USER", "postgres")
-ENV_POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
-ENV_POSTGRES_DB = os.getenv("POSTGRES_DB", "postgres")
-ENV_POSTGRES_SERVER = os.getenv("POSTGRES_SERVER", "db")
-ENV_POSTGRES_PORT = os.getenv("POSTGRES_PORT", "5432")
-
-# create the database URL
+import time
+
+from sqlalchemy.ext.asyncio import (  # noqa: E501
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.utils.metrics_utils import (
+    POOL_CHECKOUT_WAIT_SECONDS,
+    register_pool_metrics,
+    register_statement_metrics,
+)
+from backend.settings import get_settings
+
+# retrieve the settings for the database connection
+settings = get_settings()
+
+# create the database URLs, the app uses the asyncpg driver,
+#   synchronous tooling (e.g. migrations, benchmarks) can use psycopg2
 DATABASE_URL = (
-    f"postgresql://{ENV_POSTGRES_USER}:{ENV_POSTGRES_PASSWORD}"
-    f"@{ENV_POSTGRES_SERVER}:{ENV_POSTGRES_PORT}/{ENV_POSTGRES_DB}"
+    f"postgresql://{settings.postgres_user}:{settings.postgres_password}"
+    f"@{settings.postgres_server}:{settings.postgres_port}"
+    f"/{settings.postgres_db}"
 )
+ASYNC_DATABASE_URL = DATABASE_URL.replace(
+    "postgresql://", "postgresql+asyncpg://", 1
+)
+
+# created per worker by the lifespan of the app, see init_engine. The
+#   schema is managed by the migrations, the app never creates tables
+engine: AsyncEngine | None = None
+async_session: async_sessionmaker[AsyncSession] | None = None
+
+
+def init_engine() -> AsyncEngine:
+    """
+    Create the engine and session factory of this worker.
+
+    No connection is opened yet.
+
+    :return: The created engine.
+    :rtype: AsyncEngine
+    """
+
+    global engine, async_session
+
+    server_settings = {}
+    if settings.db_statement_timeout_ms:
+        server_settings["statement_timeout"] = str(
+            settings.db_statement_timeout_ms
+        )
+
+    engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        echo=settings.db_echo,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_recycle=settings.db_pool_recycle,
+        connect_args={"server_settings": server_settings},
+    )
+    register_pool_metrics(engine)
+    register_statement_metrics(engine, settings.slow_statement_ms)
+
+    # objects stay usable after commit, async sessions can not lazy load them
+    async_session = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    return engine
+
+
+async def dispose_engine() -> None:
+    """
+    Close all connections of the engine of this worker.
+    """
+
+    global engine, async_session
+
+    if engine is not None:
+        await engine.dispose()
+    engine = None
+    async_session = None
+
+
+def open_session() -> AsyncSession:
+    """
+    Open a session that is not bound to a request, e.g. for streaming.
 
-engine = create_engine(DATABASE_URL, echo=True)
+    The caller has to close the session.
 
+    :return: The new session.
+    :rtype: AsyncSession
+    """
 
-# create the database
-def init_db() -> None:
-    SQLModel.metadata.create_all(engine)
+    return async_session()
 
 
-def get_db():
-    with Session(engine) as session:
+async def get_db():
+    async with async_session() as session:
+        # check out the connection upfront to measure the wait for it
+        start = time.perf_counter()
+        await session.connection()
+        POOL_CHECKOUT_WAIT_SECONDS.observe(time.perf_counter() - start)
         yield session
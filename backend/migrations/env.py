@@ -0,0 +1,82 @@
+from logging.config import fileConfig
+
+from alembic import context
+from geoalchemy2 import alembic_helpers
+from sqlmodel import SQLModel, create_engine
+
+from backend.app.models.associations import DatasetContactLink  # noqa: F401
+from backend.app.models.associations import DatasetPublicationLink  # noqa: F401
+from backend.app.models.associations import DatasetVocLink  # noqa: F401
+from backend.app.models.associations import DatasetVocSubclassLink  # noqa: F401
+from backend.app.models.contact import Contact  # noqa: F401
+from backend.app.models.dataset import Dataset  # noqa: F401
+from backend.app.models.dataset_search import DatasetSearch  # noqa: F401
+from backend.app.models.publication import Publication  # noqa: F401
+from backend.app.models.site import Site  # noqa: F401
+from backend.app.models.version_counter import VersionCounter  # noqa: F401
+from backend.app.models.voc import Voc  # noqa: F401
+from backend.app.models.voc_subclass import VocSubclass  # noqa: F401
+from backend.app.models.voc_subclass_closure import (  # noqa: F401, E501
+    VocSubclassClosure,
+)
+from backend.app.models.voc_synonym import VocSynonym  # noqa: F401
+from backend.app.utils.coverage_utils import COVERAGE_VIEWS
+from backend.database import DATABASE_URL
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# the models, compared against the database by --autogenerate
+target_metadata = SQLModel.metadata
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    # materialized views are managed by the migrations by hand
+    if type_ == "table" and name in COVERAGE_VIEWS:
+        return False
+    return alembic_helpers.include_object(
+        object, name, type_, reflected, compare_to
+    )
+
+
+def configure(**kwargs) -> None:
+    context.configure(
+        target_metadata=target_metadata,
+        include_object=include_object,
+        process_revision_directives=alembic_helpers.writer,
+        render_item=alembic_helpers.render_item,
+        **kwargs,
+    )
+
+
+def run_migrations_offline() -> None:
+    # render the SQL of the migrations instead of running them
+    configure(url=DATABASE_URL, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations(connection) -> None:
+    configure(connection=connection)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    # the tests migrate their database on a connection of their own
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        run_migrations(connection)
+        return
+
+    engine = create_engine(DATABASE_URL)
+    with engine.connect() as connection:
+        run_migrations(connection)
+    engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,149 @@
+"""
+Initial schema
+
+Creates the tables the backend used to create on startup before the
+schema was managed by migrations. Databases created back then already
+hold them and are left as they are, later migrations add what they lack.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import context, op
+from geoalchemy2 import Geometry
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+time_resolution_unit = postgresql.ENUM(
+    "SECOND",
+    "HOUR",
+    "DAILY",
+    "WEEKLY",
+    name="timeresolutionunitenum",
+    create_type=False,
+)
+
+
+def _point() -> Geometry:
+    return Geometry(geometry_type="POINT", srid=4326, spatial_index=False)
+
+
+def upgrade() -> None:
+    # the SQL rendered by --sql always creates the tables
+    if not context.is_offline_mode() and sa.inspect(op.get_bind()).has_table(
+        "dataset"
+    ):
+        return
+
+    time_resolution_unit.create(op.get_bind())
+
+    op.create_table(
+        "contact",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("email", sa.String()),
+        sa.Column("phone", sa.String()),
+    )
+    op.create_table(
+        "publication",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("link", sa.String(), nullable=False),
+    )
+    op.create_table(
+        "site",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String()),
+        sa.Column("region", sa.String()),
+        sa.Column("country", sa.String(), nullable=False),
+        sa.Column("typology", sa.String()),
+        sa.Column("geo_location", _point()),
+    )
+    op.create_index(
+        "idx_site_geo_location",
+        "site",
+        ["geo_location"],
+        postgresql_using="gist",
+    )
+    op.create_table(
+        "vocsubclass",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "parent_voc_category_id",
+            sa.Integer(),
+            sa.ForeignKey("vocsubclass.id"),
+        ),
+        sa.Column("name", sa.String(), nullable=False),
+    )
+    op.create_table(
+        "dataset",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("site_id", sa.Integer(), sa.ForeignKey("site.id")),
+        sa.Column("sampling_period_begin", sa.Date()),
+        sa.Column("sampling_period_end", sa.Date()),
+        sa.Column("time_resolution_unit", time_resolution_unit),
+        sa.Column("time_resolution_interval", sa.Integer()),
+        sa.Column("data_type", sa.String()),
+        sa.Column("link_to_dataset", sa.String()),
+        sa.CheckConstraint(
+            "sampling_period_end > sampling_period_begin",
+            name="check_end_date_after_start_date",
+        ),
+    )
+    op.create_table(
+        "voc",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "voc_subclass_id", sa.Integer(), sa.ForeignKey("vocsubclass.id")
+        ),
+        sa.Column("name", sa.String()),
+    )
+
+    # link tables, with the column and referenced table of the linked rows
+    for table_name, column_name, linked_table_name in (
+        ("datasetcontactlink", "contact_id", "contact"),
+        ("datasetpublicationlink", "publication_id", "publication"),
+        ("datasetvoclink", "voc_id", "voc"),
+        ("datasetvocsubclasslink", "voc_subclass_id", "vocsubclass"),
+    ):
+        columns = [
+            sa.Column(
+                "dataset_id",
+                sa.Integer(),
+                sa.ForeignKey("dataset.id"),
+                primary_key=True,
+            ),
+            sa.Column(
+                column_name,
+                sa.Integer(),
+                sa.ForeignKey(f"{linked_table_name}.id"),
+                primary_key=True,
+            ),
+        ]
+        if table_name == "datasetvoclink":
+            columns.append(sa.Column("instrument", sa.String()))
+        op.create_table(table_name, *columns)
+
+
+def downgrade() -> None:
+    for table_name in (
+        "datasetvocsubclasslink",
+        "datasetvoclink",
+        "datasetpublicationlink",
+        "datasetcontactlink",
+        "voc",
+        "dataset",
+        "vocsubclass",
+        "site",
+        "publication",
+        "contact",
+    ):
+        op.drop_table(table_name)
+
+    time_resolution_unit.drop(op.get_bind())
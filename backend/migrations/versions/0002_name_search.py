@@ -0,0 +1,65 @@
+"""
+Name search
+
+Adds VOC synonyms and trigram indexes on the names searched by
+GET /search. Building the indexes blocks writes to the indexed tables
+until they are done.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# the trigram indexes by name, with their table and column
+TRIGRAM_INDEXES = {
+    "idx_contact_name_trgm": ("contact", "name"),
+    "idx_site_country_trgm": ("site", "country"),
+    "idx_site_name_trgm": ("site", "name"),
+    "idx_site_region_trgm": ("site", "region"),
+    "idx_voc_name_trgm": ("voc", "name"),
+    "idx_vocsubclass_name_trgm": ("vocsubclass", "name"),
+    "idx_vocsynonym_name_trgm": ("vocsynonym", "name"),
+}
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.create_table(
+        "vocsynonym",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "voc_id",
+            sa.Integer(),
+            sa.ForeignKey("voc.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("name", sa.String(), nullable=False),
+    )
+    op.create_index("ix_vocsynonym_voc_id", "vocsynonym", ["voc_id"])
+
+    for index_name, (table_name, column_name) in TRIGRAM_INDEXES.items():
+        op.create_index(
+            index_name,
+            table_name,
+            [column_name],
+            postgresql_using="gin",
+            postgresql_ops={column_name: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    for index_name, (table_name, _) in TRIGRAM_INDEXES.items():
+        if table_name != "vocsynonym":
+            op.drop_index(index_name, table_name=table_name)
+    op.drop_table("vocsynonym")
+    # the extension is kept, other objects of the database may use it
@@ -0,0 +1,58 @@
+"""
+Foreign key indexes
+
+Adds B-tree indexes on the foreign keys and filter columns looked up by the
+endpoints and relationships, on the second column of the link tables, whose
+primary keys only serve lookups by dataset, and a unique constraint on the
+VOC subclass names. Merge VOC subclasses of the same name before upgrading,
+the constraint cannot be added otherwise. Building the indexes blocks
+writes to the indexed tables until they are done.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# the indexes by name, with their table and column
+INDEXES = {
+    "ix_dataset_site_id": ("dataset", "site_id"),
+    "ix_datasetcontactlink_contact_id": ("datasetcontactlink", "contact_id"),
+    "ix_datasetpublicationlink_publication_id": (
+        "datasetpublicationlink",
+        "publication_id",
+    ),
+    "ix_datasetvoclink_voc_id": ("datasetvoclink", "voc_id"),
+    "ix_datasetvocsubclasslink_voc_subclass_id": (
+        "datasetvocsubclasslink",
+        "voc_subclass_id",
+    ),
+    "ix_site_country": ("site", "country"),
+    "ix_voc_voc_subclass_id": ("voc", "voc_subclass_id"),
+    "ix_vocsubclass_parent_voc_category_id": (
+        "vocsubclass",
+        "parent_voc_category_id",
+    ),
+}
+
+
+def upgrade() -> None:
+    for index_name, (table_name, column_name) in INDEXES.items():
+        op.create_index(index_name, table_name, [column_name])
+
+    # named like Postgres names the unique constraints of the models
+    op.create_unique_constraint("vocsubclass_name_key", "vocsubclass", ["name"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("vocsubclass_name_key", "vocsubclass", type_="unique")
+
+    for index_name, (table_name, _) in INDEXES.items():
+        op.drop_index(index_name, table_name=table_name)
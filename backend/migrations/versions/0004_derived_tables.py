@@ -0,0 +1,403 @@
+"""
+Hierarchy, search and coverage tables
+
+Adds the tables and views derived from the catalogue: the VOC subclass
+closure, the version counters of the worker caches with the taxonomy
+version, the dataset search table with its triggers and the coverage
+materialized views, and fills them in from the existing rows. Databases
+created before the schema was managed by migrations lack all of them, so
+they are upgraded in place. Filling in large catalogues takes a while and
+blocks writes to them until done.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from geoalchemy2 import Geometry
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+time_resolution_unit = postgresql.ENUM(
+    "SECOND",
+    "HOUR",
+    "DAILY",
+    "WEEKLY",
+    name="timeresolutionunitenum",
+    create_type=False,
+)
+
+# the SQL as of this revision, later changes go into new revisions
+
+# recomputes the search rows of the given datasets, or of all datasets
+REFRESH_FUNCTION = """
+CREATE OR REPLACE FUNCTION dataset_search_refresh(dataset_ids integer[])
+RETURNS void AS $$
+BEGIN
+    -- serialise refreshes of the same datasets, the statement below then
+    --   sees the changes of the transaction that held the lock before
+    PERFORM 1 FROM dataset
+    WHERE dataset_ids IS NULL OR dataset.id = ANY(dataset_ids)
+    ORDER BY dataset.id
+    FOR NO KEY UPDATE;
+
+    INSERT INTO dataset_search (
+        dataset_id, site_id, country, geo_location,
+        sampling_period_begin, sampling_period_end,
+        time_resolution_unit, data_type, voc_ids, voc_subclass_ids
+    )
+    SELECT
+        dataset.id, dataset.site_id, site.country, site.geo_location,
+        dataset.sampling_period_begin, dataset.sampling_period_end,
+        dataset.time_resolution_unit, dataset.data_type,
+        ARRAY(
+            SELECT DISTINCT datasetvoclink.voc_id
+            FROM datasetvoclink
+            WHERE datasetvoclink.dataset_id = dataset.id
+            ORDER BY 1
+        ),
+        ARRAY(
+            SELECT DISTINCT vocsubclassclosure.ancestor_id
+            FROM vocsubclassclosure
+            WHERE vocsubclassclosure.descendant_id IN (
+                SELECT datasetvocsubclasslink.voc_subclass_id
+                FROM datasetvocsubclasslink
+                WHERE datasetvocsubclasslink.dataset_id = dataset.id
+                UNION
+                SELECT voc.voc_subclass_id
+                FROM datasetvoclink
+                JOIN voc ON voc.id = datasetvoclink.voc_id
+                WHERE datasetvoclink.dataset_id = dataset.id
+            )
+            ORDER BY 1
+        )
+    FROM dataset
+    LEFT JOIN site ON site.id = dataset.site_id
+    WHERE dataset_ids IS NULL OR dataset.id = ANY(dataset_ids)
+    ON CONFLICT (dataset_id) DO UPDATE SET
+        site_id = EXCLUDED.site_id,
+        country = EXCLUDED.country,
+        geo_location = EXCLUDED.geo_location,
+        sampling_period_begin = EXCLUDED.sampling_period_begin,
+        sampling_period_end = EXCLUDED.sampling_period_end,
+        time_resolution_unit = EXCLUDED.time_resolution_unit,
+        data_type = EXCLUDED.data_type,
+        voc_ids = EXCLUDED.voc_ids,
+        voc_subclass_ids = EXCLUDED.voc_subclass_ids;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# per watched table: the events to watch and a query for the IDs of the
+#   datasets affected by the changed rows, which are read from {rows}
+WATCHED_TABLES = {
+    "dataset": (("INSERT", "UPDATE"), "SELECT id FROM {rows}"),
+    "datasetvoclink": (
+        ("INSERT", "UPDATE", "DELETE"),
+        "SELECT dataset_id FROM {rows}",
+    ),
+    "datasetvocsubclasslink": (
+        ("INSERT", "UPDATE", "DELETE"),
+        "SELECT dataset_id FROM {rows}",
+    ),
+    "site": (
+        ("UPDATE",),
+        "SELECT dataset.id FROM dataset"
+        " JOIN {rows} AS changed ON changed.id = dataset.site_id",
+    ),
+    "voc": (
+        ("UPDATE",),
+        "SELECT datasetvoclink.dataset_id FROM datasetvoclink"
+        " JOIN {rows} AS changed ON changed.id = datasetvoclink.voc_id",
+    ),
+    "vocsubclassclosure": (
+        ("INSERT", "DELETE"),
+        "SELECT datasetvocsubclasslink.dataset_id FROM datasetvocsubclasslink"
+        " JOIN {rows} AS changed"
+        " ON changed.descendant_id = datasetvocsubclasslink.voc_subclass_id"
+        " UNION SELECT datasetvoclink.dataset_id FROM datasetvoclink"
+        " JOIN voc ON voc.id = datasetvoclink.voc_id"
+        " JOIN {rows} AS changed"
+        " ON changed.descendant_id = voc.voc_subclass_id",
+    ),
+}
+
+TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION dataset_search_on_{table}()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM dataset_search_refresh(ARRAY({new_rows_query}));
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM dataset_search_refresh(ARRAY({old_rows_query}));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# transition tables available to statement level triggers per event
+TRANSITION_TABLES = {
+    "INSERT": "NEW TABLE AS new_rows",
+    "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "DELETE": "OLD TABLE AS old_rows",
+}
+
+# one row for every pair of a VOC subclass and one of its ancestors,
+#   including the subclass itself at depth 0
+FILL_CLOSURE = """
+INSERT INTO vocsubclassclosure (ancestor_id, descendant_id, depth)
+WITH RECURSIVE closure_walk (ancestor_id, descendant_id, parent_id, depth) AS (
+    SELECT id, id, parent_voc_category_id, 0
+    FROM vocsubclass
+    UNION ALL
+    SELECT
+        vocsubclass.id, closure_walk.descendant_id,
+        vocsubclass.parent_voc_category_id, closure_walk.depth + 1
+    FROM vocsubclass
+    JOIN closure_walk ON vocsubclass.id = closure_walk.parent_id
+)
+SELECT ancestor_id, descendant_id, depth FROM closure_walk
+"""
+
+# the coverage materialized views by name, with their query and the
+#   columns identifying a row, which are required to refresh concurrently
+COVERAGE_VIEWS = {
+    "coverage_by_country": (
+        """
+        SELECT
+            site.country AS country,
+            count(DISTINCT site.id) AS site_count,
+            count(dataset.id) AS dataset_count
+        FROM site
+        LEFT OUTER JOIN dataset ON dataset.site_id = site.id
+        GROUP BY site.country
+        ORDER BY site.country
+        """,
+        ("country",),
+    ),
+    "coverage_by_grid": (
+        """
+        SELECT
+            ST_X(anon_1.cell) AS lon,
+            ST_Y(anon_1.cell) AS lat,
+            count(DISTINCT anon_1.site_id) AS site_count,
+            count(anon_1.dataset_id) AS dataset_count
+        FROM (
+            SELECT
+                ST_SnapToGrid(site.geo_location, 1.0) AS cell,
+                site.id AS site_id,
+                dataset.id AS dataset_id
+            FROM site
+            LEFT OUTER JOIN dataset ON dataset.site_id = site.id
+            WHERE site.geo_location IS NOT NULL
+        ) AS anon_1
+        GROUP BY anon_1.cell
+        ORDER BY lon, lat
+        """,
+        ("lon", "lat"),
+    ),
+    "coverage_by_voc_subclass": (
+        """
+        SELECT
+            vocsubclass.id AS voc_subclass_id,
+            vocsubclass.name AS name,
+            count(DISTINCT anon_1.dataset_id)
+                FILTER (WHERE vocsubclassclosure.depth = 0)
+                AS direct_dataset_count,
+            count(DISTINCT anon_1.dataset_id) AS dataset_count
+        FROM vocsubclass
+        JOIN vocsubclassclosure
+            ON vocsubclassclosure.ancestor_id = vocsubclass.id
+        LEFT OUTER JOIN (
+            SELECT
+                datasetvocsubclasslink.dataset_id AS dataset_id,
+                datasetvocsubclasslink.voc_subclass_id AS voc_subclass_id
+            FROM datasetvocsubclasslink
+            UNION
+            SELECT
+                datasetvoclink.dataset_id AS dataset_id,
+                voc.voc_subclass_id AS voc_subclass_id
+            FROM datasetvoclink
+            JOIN voc ON voc.id = datasetvoclink.voc_id
+        ) AS anon_1
+            ON anon_1.voc_subclass_id = vocsubclassclosure.descendant_id
+        GROUP BY vocsubclass.id, vocsubclass.name
+        ORDER BY vocsubclass.id
+        """,
+        ("voc_subclass_id",),
+    ),
+    "coverage_by_year": (
+        """
+        SELECT anon_1.year, count(*) AS dataset_count
+        FROM dataset
+        JOIN generate_series(
+            CAST(EXTRACT(year FROM dataset.sampling_period_begin) AS INTEGER),
+            coalesce(
+                CAST(EXTRACT(year FROM dataset.sampling_period_end) AS INTEGER),
+                CAST(
+                    EXTRACT(year FROM dataset.sampling_period_begin) AS INTEGER
+                )
+            )
+        ) AS anon_1(year) ON true
+        WHERE dataset.sampling_period_begin IS NOT NULL
+        GROUP BY anon_1.year
+        ORDER BY anon_1.year
+        """,
+        ("year",),
+    ),
+}
+
+
+def _point() -> Geometry:
+    return Geometry(geometry_type="POINT", srid=4326, spatial_index=False)
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_site_geo_location_geography",
+        "site",
+        [sa.text("CAST(geo_location AS geography)")],
+        postgresql_using="gist",
+    )
+    op.create_table(
+        "versioncounter",
+        sa.Column("name", sa.String(), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        "vocsubclassclosure",
+        sa.Column(
+            "ancestor_id",
+            sa.Integer(),
+            sa.ForeignKey("vocsubclass.id"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "descendant_id",
+            sa.Integer(),
+            sa.ForeignKey("vocsubclass.id"),
+            primary_key=True,
+        ),
+        sa.Column("depth", sa.Integer(), nullable=False),
+    )
+    op.create_index(
+        "ix_vocsubclassclosure_descendant_id",
+        "vocsubclassclosure",
+        ["descendant_id"],
+    )
+    op.create_table(
+        "dataset_search",
+        sa.Column(
+            "dataset_id",
+            sa.Integer(),
+            sa.ForeignKey("dataset.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("site_id", sa.Integer()),
+        sa.Column("country", sa.String()),
+        sa.Column("geo_location", _point()),
+        sa.Column("sampling_period_begin", sa.Date()),
+        sa.Column("sampling_period_end", sa.Date()),
+        sa.Column("time_resolution_unit", time_resolution_unit),
+        sa.Column("data_type", sa.String()),
+        sa.Column("voc_ids", postgresql.ARRAY(sa.Integer()), nullable=False),
+        sa.Column(
+            "voc_subclass_ids", postgresql.ARRAY(sa.Integer()), nullable=False
+        ),
+    )
+    op.create_index("ix_dataset_search_site_id", "dataset_search", ["site_id"])
+    op.create_index("ix_dataset_search_country", "dataset_search", ["country"])
+    op.create_index(
+        "idx_dataset_search_geo_location",
+        "dataset_search",
+        ["geo_location"],
+        postgresql_using="gist",
+    )
+    op.create_index(
+        "idx_dataset_search_voc_ids",
+        "dataset_search",
+        ["voc_ids"],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "idx_dataset_search_voc_subclass_ids",
+        "dataset_search",
+        ["voc_subclass_ids"],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "idx_dataset_search_sampling_period",
+        "dataset_search",
+        [
+            sa.text(
+                "daterange(sampling_period_begin, sampling_period_end, '[]')"
+            )
+        ],
+        postgresql_using="gist",
+    )
+
+    # fill in the closure before the triggers are installed, the dataset
+    #   search rows are then computed once for all datasets
+    op.execute(FILL_CLOSURE)
+    op.execute(REFRESH_FUNCTION)
+    for table_name, (events, dataset_ids_query) in WATCHED_TABLES.items():
+        op.execute(
+            TRIGGER_FUNCTION.format(
+                table=table_name,
+                new_rows_query=dataset_ids_query.format(rows="new_rows"),
+                old_rows_query=dataset_ids_query.format(rows="old_rows"),
+            )
+        )
+        for trigger_event in events:
+            op.execute(
+                f"CREATE TRIGGER dataset_search_{table_name}"
+                f"_{trigger_event.lower()}"
+                f" AFTER {trigger_event} ON {table_name}"
+                f" REFERENCING {TRANSITION_TABLES[trigger_event]}"
+                " FOR EACH STATEMENT"
+                f" EXECUTE FUNCTION dataset_search_on_{table_name}()"
+            )
+    op.execute("SELECT dataset_search_refresh(NULL)")
+    op.execute(
+        "INSERT INTO versioncounter (name, version) VALUES ('taxonomy', 0)"
+    )
+
+    # created even if the coverage is computed live, so enabling the
+    #   materialized views needs no migration
+    for view_name, (query, key_columns) in COVERAGE_VIEWS.items():
+        op.execute(f"CREATE MATERIALIZED VIEW {view_name} AS {query}")
+        op.execute(
+            f"CREATE UNIQUE INDEX {view_name}_key"
+            f" ON {view_name} ({', '.join(key_columns)})"
+        )
+
+
+def downgrade() -> None:
+    for view_name in COVERAGE_VIEWS:
+        op.execute(f"DROP MATERIALIZED VIEW IF EXISTS {view_name}")
+
+    for table_name, (events, _) in WATCHED_TABLES.items():
+        for trigger_event in events:
+            op.execute(
+                f"DROP TRIGGER IF EXISTS dataset_search_{table_name}"
+                f"_{trigger_event.lower()} ON {table_name}"
+            )
+        op.execute(f"DROP FUNCTION IF EXISTS dataset_search_on_{table_name}()")
+    op.execute("DROP FUNCTION IF EXISTS dataset_search_refresh(integer[])")
+
+    for table_name in (
+        "dataset_search",
+        "vocsubclassclosure",
+        "versioncounter",
+    ):
+        op.drop_table(table_name)
+    op.drop_index("idx_site_geo_location_geography", table_name="site")
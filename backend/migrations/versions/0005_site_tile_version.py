@@ -0,0 +1,27 @@
+"""
+Site tile version
+
+Adds the version counter the site tile caches of all workers are keyed on.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "INSERT INTO versioncounter (name, version) VALUES ('site_tiles', 0)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM versioncounter WHERE name = 'site_tiles'")
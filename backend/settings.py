@@ -0,0 +1,161 @@
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+
+def _get_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Runtime settings of the backend, read from environment variables.
+
+    Every worker process holds its own connection pool, so Postgres has to
+    accept up to ``workers * (db_pool_size + db_max_overflow)`` connections
+    from the backend. Size the pool with the worker count in mind.
+
+    :param postgres_user: Database user, env ``POSTGRES_USER``.
+    :type postgres_user: str
+    :param postgres_password: Database password, env ``POSTGRES_PASSWORD``.
+    :type postgres_password: str
+    :param postgres_db: Database name, env ``POSTGRES_DB``.
+    :type postgres_db: str
+    :param postgres_server: Database host, env ``POSTGRES_SERVER``.
+    :type postgres_server: str
+    :param postgres_port: Database port, env ``POSTGRES_PORT``.
+    :type postgres_port: str
+    :param db_echo: Log every SQL statement, env ``DB_ECHO``.
+        Meant for local development only.
+    :type db_echo: bool
+    :param db_pool_size: Connections kept open per worker,
+        env ``DB_POOL_SIZE``.
+    :type db_pool_size: int
+    :param db_max_overflow: Additional connections opened per worker under
+        load, env ``DB_MAX_OVERFLOW``.
+    :type db_max_overflow: int
+    :param db_pool_timeout: Seconds to wait for a free connection before
+        failing, env ``DB_POOL_TIMEOUT``.
+    :type db_pool_timeout: float
+    :param db_pool_pre_ping: Test connections before handing them out,
+        env ``DB_POOL_PRE_PING``.
+    :type db_pool_pre_ping: bool
+    :param db_pool_recycle: Seconds after which connections are replaced,
+        -1 to keep them forever, env ``DB_POOL_RECYCLE``.
+    :type db_pool_recycle: int
+    :param db_statement_timeout_ms: Milliseconds after which Postgres
+        cancels a statement, 0 to disable, env ``DB_STATEMENT_TIMEOUT_MS``.
+    :type db_statement_timeout_ms: int
+    :param coverage_materialized: Serve the coverage analytics from
+        materialized views, which are recomputed on request only,
+        env ``COVERAGE_MATERIALIZED``.
+    :type coverage_materialized: bool
+    :param response_cache: Backend of the response cache, ``memory`` for
+        a cache per worker, ``redis`` for a cache shared by all workers
+        or ``none`` to disable it, env ``RESPONSE_CACHE``.
+    :type response_cache: str
+    :param response_cache_ttl: Seconds after which cached responses expire,
+        env ``RESPONSE_CACHE_TTL``.
+    :type response_cache_ttl: int
+    :param redis_url: URL of the Redis server of the ``redis`` response
+        cache, env ``REDIS_URL``.
+    :type redis_url: str
+    :param slow_statement_ms: Milliseconds after which a statement is logged
+        with its plan, 0 to disable, env ``SLOW_STATEMENT_MS``.
+    :type slow_statement_ms: int
+    """
+
+    postgres_user: str = "postgres"
+    postgres_password: str = "postgres"
+    postgres_db: str = "postgres"
+    postgres_server: str = "db"
+    postgres_port: str = "5432"
+    db_echo: bool = False
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_pre_ping: bool = True
+    db_pool_recycle: int = 1800
+    db_statement_timeout_ms: int = 30_000
+    coverage_materialized: bool = False
+    response_cache: str = "memory"
+    response_cache_ttl: int = 60
+    redis_url: str = "redis://localhost:6379/0"
+    slow_statement_ms: int = 500
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """
+        Create the settings from the environment, using defaults for
+        unset variables.
+
+        :return: The settings.
+        :rtype: Settings
+        """
+
+        defaults = cls()
+        return cls(
+            postgres_user=os.getenv("POSTGRES_USER", defaults.postgres_user),
+            postgres_password=os.getenv(
+                "POSTGRES_PASSWORD", defaults.postgres_password
+            ),
+            postgres_db=os.getenv("POSTGRES_DB", defaults.postgres_db),
+            postgres_server=os.getenv(
+                "POSTGRES_SERVER", defaults.postgres_server
+            ),
+            postgres_port=os.getenv("POSTGRES_PORT", defaults.postgres_port),
+            db_echo=_get_bool("DB_ECHO", defaults.db_echo),
+            db_pool_size=int(os.getenv("DB_POOL_SIZE", defaults.db_pool_size)),
+            db_max_overflow=int(
+                os.getenv("DB_MAX_OVERFLOW", defaults.db_max_overflow)
+            ),
+            db_pool_timeout=float(
+                os.getenv("DB_POOL_TIMEOUT", defaults.db_pool_timeout)
+            ),
+            db_pool_pre_ping=_get_bool(
+                "DB_POOL_PRE_PING", defaults.db_pool_pre_ping
+            ),
+            db_pool_recycle=int(
+                os.getenv("DB_POOL_RECYCLE", defaults.db_pool_recycle)
+            ),
+            db_statement_timeout_ms=int(
+                os.getenv(
+                    "DB_STATEMENT_TIMEOUT_MS", defaults.db_statement_timeout_ms
+                )
+            ),
+            coverage_materialized=_get_bool(
+                "COVERAGE_MATERIALIZED", defaults.coverage_materialized
+            ),
+            response_cache=os.getenv(
+                "RESPONSE_CACHE", defaults.response_cache
+            ).lower(),
+            response_cache_ttl=int(
+                os.getenv("RESPONSE_CACHE_TTL", defaults.response_cache_ttl)
+            ),
+            redis_url=os.getenv("REDIS_URL", defaults.redis_url),
+            slow_statement_ms=int(
+                os.getenv("SLOW_STATEMENT_MS", defaults.slow_statement_ms)
+            ),
+        )
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """
+    Get the settings of this process, read once from the environment.
+
+    Variables of the ``database.env`` file are loaded into the environment
+    first, without overriding variables which are already set.
+
+    :return: The settings.
+    :rtype: Settings
+    """
+
+    load_dotenv(dotenv_path="../database.env")
+    return Settings.from_env()
@@ -0,0 +1,143 @@
+"""
+Tests of the indexes on the foreign keys and on the VOC subclass names.
+"""
+
+import pytest
+from alembic.script import ScriptDirectory
+from fastapi.testclient import TestClient
+from sqlalchemy import Connection, Engine, func, inspect, select, text
+
+from backend.app.models.associations import DatasetContactLink
+from backend.app.models.dataset import Dataset
+from backend.app.utils.plan_utils import get_seq_scans
+
+ALL_RELATIONSHIPS = "site,vocs,voc_subclasses,contacts,publications"
+SITE_COUNT = 20_000
+DATASETS_PER_SITE = 10
+# as many rows as sites, the planner then prefers the indexes over
+#   sequential scans of the looked up tables
+ROW_COUNT = 20_000
+
+
+def test_migration_creates_indexes(
+    engine: Engine, migration_script: ScriptDirectory
+):
+    inspector = inspect(engine)
+    migration = migration_script.get_revision("0003").module
+
+    for index_name, (table_name, column_name) in migration.INDEXES.items():
+        indexes = {
+            index["name"]: index["column_names"]
+            for index in inspector.get_indexes(table_name)
+        }
+        assert indexes.get(index_name) == [column_name]
+
+
+def test_migration_makes_voc_subclass_names_unique(engine: Engine):
+    constraints = inspect(engine).get_unique_constraints("vocsubclass")
+
+    assert {"name": "vocsubclass_name_key", "column_names": ["name"]} in [
+        {key: constraint[key] for key in ("name", "column_names")}
+        for constraint in constraints
+    ]
+
+
+def link_datasets(link_table: str, column: str, table: str) -> str:
+    """
+    Build the statement linking every dataset to one row of a table.
+
+    :param link_table: The name of the link table.
+    :type link_table: str
+    :param column: The column of the link table referencing the table.
+    :type column: str
+    :param table: The name of the linked table, its rows are assigned to
+        the datasets in turn.
+    :type table: str
+    :return: The SQL of the statement.
+    :rtype: str
+    """
+
+    return (
+        f"INSERT INTO {link_table} (dataset_id, {column})"
+        " SELECT dataset.id, target.first_id + dataset.id % target.count"
+        " FROM dataset, (SELECT min(id) AS first_id, count(*) AS count"
+        f" FROM {table}) AS target"
+    )
+
+
+SEED_STATEMENTS = (
+    "INSERT INTO site (country, geo_location) SELECT 'test',"
+    " ST_SetSRID(ST_MakePoint(random() * 360 - 180, random() * 180 - 90),"
+    f" 4326) FROM generate_series(1, {SITE_COUNT})",
+    "INSERT INTO dataset (data_type, site_id) SELECT 'test', site.id"
+    f" FROM site, generate_series(1, {DATASETS_PER_SITE})",
+    "INSERT INTO vocsubclass (name) SELECT 'subclass-' || number"
+    f" FROM generate_series(1, {ROW_COUNT}) AS number",
+    "INSERT INTO voc (name, voc_subclass_id) SELECT 'voc-' || id, id"
+    " FROM vocsubclass",
+    "INSERT INTO contact (name) SELECT 'contact-' || number"
+    f" FROM generate_series(1, {ROW_COUNT}) AS number",
+    "INSERT INTO publication (link) SELECT 'publication-' || number"
+    f" FROM generate_series(1, {ROW_COUNT}) AS number",
+    link_datasets("datasetvoclink", "voc_id", "voc"),
+    link_datasets("datasetvocsubclasslink", "voc_subclass_id", "vocsubclass"),
+    link_datasets("datasetcontactlink", "contact_id", "contact"),
+    link_datasets("datasetpublicationlink", "publication_id", "publication"),
+    "ANALYZE",
+)
+
+
+def get_sample(connection: Connection, column) -> int:
+    """
+    Pick an ID of a foreign key column to look up.
+
+    :param connection: The connection to execute the statement on.
+    :type connection: sqlalchemy.Connection
+    :param column: The foreign key column.
+    :type column: sqlalchemy.Column
+    :return: The highest ID referenced by the column.
+    :rtype: int
+    """
+
+    return connection.execute(select(func.max(column))).scalar_one()
+
+
+@pytest.fixture(scope="module")
+def catalogue(committed_engine: Engine) -> dict:
+    """
+    A synthetic catalogue, every dataset linked to objects of every type.
+
+    :return: The IDs of a site and of a dataset to look up.
+    :rtype: dict
+    """
+
+    with committed_engine.begin() as connection:
+        for statement in SEED_STATEMENTS:
+            connection.execute(text(statement))
+
+        return {
+            "site_id": get_sample(connection, Dataset.site_id),
+            "dataset_id": get_sample(connection, DatasetContactLink.dataset_id),
+        }
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/datasets/by-site/{site_id}",
+        f"/datasets/by-site/{{site_id}}?include={ALL_RELATIONSHIPS}",
+        "/contacts/by-dataset/{dataset_id}",
+    ],
+)
+def test_lookups_use_indexes(
+    client: TestClient,
+    statements: list,
+    catalogue: dict,
+    path: str,
+):
+    client.get(path.format(**catalogue)).raise_for_status()
+
+    assert statements
+    assert {
+        statement.sql: get_seq_scans(statement.plan) for statement in statements
+    } == {statement.sql: [] for statement in statements}
@@ -0,0 +1,134 @@
+"""
+Tests of the bounding box and proximity filters and of their indexes.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, text
+from sqlalchemy.dialects import postgresql
+
+from backend.app.models.site import Site
+from backend.app.utils.geometry_utils import within_bounding_box
+from backend.app.utils.plan_utils import uses_index
+from backend.app.utils.proximity_utils import NearParams
+from backend.app.utils.search_utils import within_area
+
+SITE_COUNT = 20_000
+# a box small enough to select only a fraction of the seeded sites
+BOUNDING_BOX = (8.0, 47.0, 9.0, 48.0)
+AREA_PATH = "/".join(str(coordinate) for coordinate in BOUNDING_BOX)
+ENVELOPE = "ST_MakeEnvelope(8.0, 47.0, 9.0, 48.0, 4326)"
+NEAR = NearParams(lon=8.5, lat=47.5, radius_km=50, limit=10)
+NEAR_QUERY = "lon=8.5&lat=47.5&radius_km=50&limit=10"
+POINT = "CAST(ST_SetSRID(ST_MakePoint(8.5, 47.5), 4326) AS geography)"
+SEED_STATEMENTS = (
+    "INSERT INTO site (country, geo_location) SELECT 'test',"
+    " ST_SetSRID(ST_MakePoint(random() * 360 - 180, random() * 180 - 90),"
+    f" 4326) FROM generate_series(1, {SITE_COUNT})",
+    "INSERT INTO site (country, geo_location) SELECT 'test',"
+    " ST_SetSRID(ST_MakePoint(8 + random(), 47 + random()), 4326)"
+    " FROM generate_series(1, 10)",
+    "INSERT INTO dataset (data_type, site_id) SELECT 'test', id FROM site",
+    "ANALYZE",
+)
+
+
+def compile_sql(clause) -> str:
+    return str(
+        clause.compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={"literal_binds": True},
+        )
+    )
+
+
+def test_within_bounding_box_checks_the_index_operator_first():
+    clause = within_bounding_box(Site.geo_location, *BOUNDING_BOX)
+
+    assert compile_sql(clause) == (
+        f"(site.geo_location && {ENVELOPE})"
+        f" AND ST_Intersects(site.geo_location, {ENVELOPE})"
+    )
+
+
+def test_within_area_filters_search_rows():
+    assert compile_sql(within_area(*BOUNDING_BOX)) == (
+        f"(dataset_search.geo_location && {ENVELOPE})"
+        f" AND ST_Intersects(dataset_search.geo_location, {ENVELOPE})"
+    )
+
+
+def test_near_filters_by_radius_on_geographies():
+    filters = [compile_sql(clause) for clause in NEAR.site_filters()]
+
+    assert filters == [
+        "site.geo_location IS NOT NULL",
+        f"ST_DWithin(CAST(site.geo_location AS geography), {POINT}, 50000)",
+    ]
+
+
+def test_near_without_radius_only_skips_sites_without_location():
+    near = NearParams(lon=8.5, lat=47.5)
+
+    assert [compile_sql(clause) for clause in near.site_filters()] == [
+        "site.geo_location IS NOT NULL"
+    ]
+
+
+def test_near_orders_by_the_knn_operator():
+    assert compile_sql(NEAR.order) == (
+        f"CAST(site.geo_location AS geography) <-> {POINT}"
+    )
+
+
+@pytest.fixture(scope="module")
+def sites(committed_engine: Engine) -> None:
+    """
+    Sites at random locations, a few of them within the bounding box,
+    each with one dataset.
+    """
+
+    with committed_engine.begin() as connection:
+        # the same locations on every run
+        connection.execute(text("SELECT setseed(0.42)"))
+        for statement in SEED_STATEMENTS:
+            connection.execute(text(statement))
+
+
+@pytest.mark.parametrize(
+    ("path", "index_name"),
+    [
+        pytest.param(
+            f"/sites/by-area/{AREA_PATH}/",
+            "idx_site_geo_location",
+            id="sites by area",
+        ),
+        pytest.param(
+            f"/datasets/by-area/{AREA_PATH}/",
+            "idx_dataset_search_geo_location",
+            id="datasets by area",
+        ),
+        pytest.param(
+            f"/sites/near?{NEAR_QUERY}",
+            "idx_site_geo_location_geography",
+            id="sites near",
+        ),
+        pytest.param(
+            f"/datasets/near?{NEAR_QUERY}",
+            "idx_site_geo_location_geography",
+            id="datasets near",
+        ),
+    ],
+)
+def test_spatial_filters_use_index(
+    client: TestClient,
+    statements: list,
+    sites: None,
+    path: str,
+    index_name: str,
+):
+    client.get(path).raise_for_status()
+
+    assert [
+        uses_index(statement.plan, index_name) for statement in statements
+    ] == [True]
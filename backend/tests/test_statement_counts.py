@@ -0,0 +1,84 @@
+"""
+Tests of the number of SQL statements issued by the dataset endpoints.
+
+With eager loading, the count does not depend on the number of returned
+datasets.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine
+from sqlmodel import Session
+
+from backend.app.models.contact import Contact
+from backend.app.models.dataset import Dataset
+from backend.app.models.publication import Publication
+from backend.app.models.site import Site
+from backend.app.models.voc import Voc
+from backend.app.models.voc_subclass import VocSubclass
+
+DATASET_COUNT = 50
+ALL_RELATIONSHIPS = "site,vocs,voc_subclasses,contacts,publications"
+VOC_SUBCLASS_NAME = "statement-counts"
+
+
+@pytest.fixture(scope="module")
+def seeded(committed_engine: Engine) -> dict:
+    """
+    A site with datasets, each linked to objects of every type.
+
+    :return: The IDs of the site and of one dataset.
+    :rtype: dict
+    """
+
+    voc_subclass = VocSubclass(name=VOC_SUBCLASS_NAME)
+    site = Site(
+        country="test",
+        geo_location={"type": "Point", "coordinates": [8.5, 47.5]},
+    )
+    datasets = [
+        Dataset(
+            data_type="test",
+            site=site,
+            vocs=[Voc(name=f"voc-{index}", voc_subclass=voc_subclass)],
+            voc_subclasses=[voc_subclass],
+            contacts=[Contact(name=f"contact-{index}")],
+            publications=[Publication(link=f"publication-{index}")],
+        )
+        for index in range(DATASET_COUNT)
+    ]
+    with Session(committed_engine) as session:
+        session.add_all(datasets)
+        session.commit()
+        return {"site_id": site.id, "dataset_id": datasets[0].id}
+
+
+# number of statements per request path
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        ("/datasets/", 1),
+        (f"/datasets/?include={ALL_RELATIONSHIPS}", 5),
+        ("/datasets/by-site/{site_id}", 1),
+        (f"/datasets/by-site/{{site_id}}?include={ALL_RELATIONSHIPS}", 5),
+        (f"/datasets/by-subclass/{VOC_SUBCLASS_NAME}", 1),
+        (
+            f"/datasets/by-subclass/{VOC_SUBCLASS_NAME}"
+            f"?include={ALL_RELATIONSHIPS}",
+            5,
+        ),
+        ("/datasets/by-area/8/47/9/48/", 1),
+        (f"/datasets/by-area/8/47/9/48/?include={ALL_RELATIONSHIPS}", 5),
+        ("/contacts/by-dataset/{dataset_id}", 1),
+    ],
+)
+def test_statement_count(
+    client: TestClient,
+    statements: list,
+    seeded: dict,
+    path: str,
+    expected: int,
+):
+    client.get(path.format(**seeded)).raise_for_status()
+
+    assert len(statements) == expected